@@ -12,6 +12,17 @@ export default async function handler(req, res) {
   }
 
   try {
+    // ?page=<n> / ?category=<slug>: pre-sorted listings the bot maintains
+    const { page, category } = req.query || {};
+    if (page !== undefined || category !== undefined) {
+      const valid = page !== undefined ? /^[1-9]\d*$/.test(page) : /^[a-z0-9-]+$/.test(category);
+      if (!valid) return res.status(400).json({ error: 'Invalid page or category' });
+      const file = page !== undefined
+        ? join(process.cwd(), 'articles', 'pages', `page-${page}.json`)
+        : join(process.cwd(), 'articles', 'category', `${category}.json`);
+      return res.status(200).json(JSON.parse(await readFile(file, 'utf8')));
+    }
+
     const indexPath = join(process.cwd(), 'articles', 'index.json');
     const raw = await readFile(indexPath, 'utf8');
     const articles = JSON.parse(raw);
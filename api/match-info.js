@@ -45,6 +45,17 @@ function reshapeH2H(summary, evHome, evAway) {
     });
 }
 
+// One small per-match document (written by the bot); the full events.json
+// only for matches that don't have one yet.
+async function loadEvent(slug) {
+    const docRes = await fetch(`https://footholics.in/data/events/by-slug/${encodeURIComponent(slug)}.json`);
+    if (docRes.ok) return docRes.json();
+    const evRes = await fetch('https://footholics.in/data/events.json');
+    if (!evRes.ok) throw new Error('events.json unavailable');
+    const events = await evRes.json();
+    return events.find(e => e.slug === slug) || null;
+}
+
 export default async function handler(req, res) {
     res.setHeader('Access-Control-Allow-Origin', '*');
     res.setHeader('Access-Control-Allow-Methods', 'GET, OPTIONS');
@@ -59,10 +70,7 @@ export default async function handler(req, res) {
     };
 
     try {
-        const evRes = await fetch('https://footholics.in/data/events.json');
-        if (!evRes.ok) throw new Error('events.json unavailable');
-        const events = await evRes.json();
-        const event = events.find(e => e.slug === slug);
+        const event = await loadEvent(slug);
         if (!event) return res.status(404).json({ error: 'Match not found' });
 
         const candidates = ESPN_LEAGUES[event.leagueSlug] || FALLBACK_SLUGS;
@@ -292,6 +292,61 @@
       };
     });
 
+    // ── Search index (data/search-index.json, built by the bot) ─────────────
+    // { docs: [[kind, title, meta, url], ...], terms: { token: [id, gap, ...] } }
+    var _indexCache = null, _indexFetchPromise = null;
+    function getSearchIndex() {
+      if (_indexCache)        return Promise.resolve(_indexCache);
+      if (_indexFetchPromise) return _indexFetchPromise;
+      _indexFetchPromise = fetch('/data/search-index.json')
+        .then(function (r) { return r.ok ? r.json() : null; })
+        .then(function (d) { _indexCache = d && d.terms ? d : null; return _indexCache; })
+        .catch(function () { return null; });
+      return _indexFetchPromise;
+    }
+
+    var STOPWORDS = ['the','and','vs','of','in','at','to','for','on','an','is','a'];
+    function queryTokens(q) {
+      return q.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+        .split(/[^\p{L}\p{N}]+/u)
+        .filter(function (t) { return t.length > 1 && STOPWORDS.indexOf(t) === -1; });
+    }
+    function postings(index, token) {
+      var ids = [], id = 0, gaps = index.terms[token] || [];
+      for (var i = 0; i < gaps.length; i++) { id += gaps[i]; ids.push(id); }
+      return ids;
+    }
+    // Terms sorted once per loaded index; the ones starting with `prefix` are
+    // a contiguous run found by binary search
+    function prefixTerms(index, prefix) {
+      var sorted = index.sortedTerms || (index.sortedTerms = Object.keys(index.terms).sort());
+      var lo = 0, hi = sorted.length;
+      while (lo < hi) {
+        var mid = (lo + hi) >>> 1;
+        if (sorted[mid] < prefix) lo = mid + 1; else hi = mid;
+      }
+      var out = [];
+      for (; lo < sorted.length && sorted[lo].lastIndexOf(prefix, 0) === 0; lo++) out.push(sorted[lo]);
+      return out;
+    }
+    // Docs containing every token; the last one may still be being typed, so it
+    // matches any term it is a prefix of
+    function searchIndex(index, q) {
+      var tokens = queryTokens(q);
+      if (!tokens.length) return [];
+      var last = tokens.pop(), prefixIds = {};
+      prefixTerms(index, last).forEach(function (term) {
+        postings(index, term).forEach(function (id) { prefixIds[id] = true; });
+      });
+      var ids = Object.keys(prefixIds).map(Number).sort(function (a, b) { return a - b; });
+      tokens.forEach(function (t) {
+        var set = {};
+        postings(index, t).forEach(function (id) { set[id] = true; });
+        ids = ids.filter(function (id) { return set[id]; });
+      });
+      return ids.map(function (id) { return index.docs[id]; }).filter(Boolean);
+    }
+
     // ── News cache ─────────────────────────────────────────────────────────
     var _newsCache = null, _newsFetchPromise = null;
     function getNews() {
@@ -304,6 +359,7 @@
       return _newsFetchPromise;
     }
     setTimeout(getNews, 2000); // warm cache silently
+    setTimeout(getSearchIndex, 2000);
 
     // ── Helpers ────────────────────────────────────────────────────────────
     function esc(s) {
@@ -369,16 +425,29 @@
         }).join('');
       }
 
-      // 3. DOM match cards
-      var matchHits = MATCH_INDEX.filter(function (m) {
-        return contains(m.title, q) || contains(m.league, q) || contains(m.date, q);
-      }).slice(0, 4);
+      // 3. Matches and articles from the search index (DOM match cards if it is unavailable)
+      var index = await getSearchIndex();
+      if (token !== _searchToken) return;  // newer query is in flight
+      var docHits = index ? searchIndex(index, q) : [];
+      var matchHits = index
+        ? docHits.filter(function (d) { return d[0] === 'e'; }).slice(0, 4)
+            .map(function (d) { return { title: d[1], league: d[2], url: d[3] }; })
+        : MATCH_INDEX.filter(function (m) {
+            return contains(m.title, q) || contains(m.league, q) || contains(m.date, q);
+          }).slice(0, 4);
       if (matchHits.length) {
         html += '<div class="search-result-group-label">Matches</div>';
         html += matchHits.map(function (m) {
           return resultItem(m.url, null, '⚽', m.title, m.league, 'Match', false);
         }).join('');
       }
+      var articleHits = docHits.filter(function (d) { return d[0] === 'a'; }).slice(0, 4);
+      if (articleHits.length) {
+        html += '<div class="search-result-group-label">Articles</div>';
+        html += articleHits.map(function (d) {
+          return resultItem(d[3], null, '📝', d[1], d[2], 'Article', false);
+        }).join('');
+      }
 
       // 4. News articles (async — guard against stale results)
       try {
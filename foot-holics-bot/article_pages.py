@@ -0,0 +1,113 @@
+"""
+Pre-sorted, paginated slices of articles/index.json.
+
+/api/articles used to read the whole index and re-sort it on every request.
+The bot now keeps static, cacheable listing files next to the index:
+
+    articles/pages/page-<n>.json        ARTICLES_PAGE_SIZE entries, newest first (n from 1)
+    articles/category/<slug>.json       every article in one category, newest first
+    articles/pages/index.json           {"pageSize", "pages", "total", "categories": {slug: count}}
+
+ArticlePages.sync(articles) is called after each publish / edit / delete. It
+remembers what it last wrote and rewrites only the pages and categories whose
+contents differ: editing an article touches its own page (and category);
+publishing or deleting one shifts the pages from its position onwards, and
+leaves the ones before it alone. Pages and categories that no longer exist
+are deleted.
+"""
+
+import os
+import re
+
+from safe_io import atomic_write_json, remove_file
+
+DEFAULT_PAGE_SIZE = 12
+
+
+def category_slug(name: str) -> str:
+    """"Champions League" → "champions-league"."""
+    return re.sub(r"[^a-z0-9]+", "-", (name or "").lower()).strip("-")
+
+
+def newest_first(articles: list) -> list:
+    # Stable: same-day articles keep their index order (newest published first)
+    return sorted(articles, key=lambda a: a.get("date") or "", reverse=True)
+
+
+class ArticlePages:
+    """articles/pages/ and articles/category/ for one articles directory."""
+
+    def __init__(self, articles_dir: str, page_size: int = DEFAULT_PAGE_SIZE):
+        self.pages_dir = os.path.join(articles_dir, "pages")
+        self.category_dir = os.path.join(articles_dir, "category")
+        self.page_size = max(1, page_size)
+        self._pages = None          # last written: list of pages (lists of entries)
+        self._categories = None     # last written: {slug: entries}
+        self._summary = None
+
+    def page_path(self, number: int) -> str:
+        return os.path.join(self.pages_dir, f"page-{number}.json")
+
+    def category_path(self, slug: str) -> str:
+        return os.path.join(self.category_dir, f"{slug}.json")
+
+    def sync(self, articles: list) -> list:
+        """Bring the listing files in line with `articles`. Returns the paths written."""
+        ordered = newest_first(articles)
+        pages = [ordered[i:i + self.page_size] for i in range(0, len(ordered), self.page_size)]
+        categories = {}
+        for entry in ordered:
+            slug = category_slug(entry.get("category"))
+            if slug:
+                categories.setdefault(slug, []).append(entry)
+
+        written = []
+        old_pages = self._pages
+        for number, page in enumerate(pages, 1):
+            if old_pages is None or number > len(old_pages) or old_pages[number - 1] != page:
+                if atomic_write_json(self.page_path(number), page):
+                    written.append(self.page_path(number))
+        for number in range(len(pages) + 1, self._last_page(old_pages) + 1):
+            remove_file(self.page_path(number))
+
+        old_categories = self._categories
+        for slug, entries in categories.items():
+            if old_categories is None or old_categories.get(slug) != entries:
+                if atomic_write_json(self.category_path(slug), entries):
+                    written.append(self.category_path(slug))
+        for slug in self._category_files(old_categories) - set(categories):
+            remove_file(self.category_path(slug))
+
+        summary = {
+            "pageSize": self.page_size,
+            "pages": len(pages),
+            "total": len(ordered),
+            "categories": {slug: len(entries) for slug, entries in sorted(categories.items())},
+        }
+        if summary != self._summary:
+            path = os.path.join(self.pages_dir, "index.json")
+            if atomic_write_json(path, summary):
+                written.append(path)
+
+        # Copies, so later in-place edits of the callers' dicts still show up as changes
+        self._pages = [[dict(entry) for entry in page] for page in pages]
+        self._categories = {slug: [dict(e) for e in entries] for slug, entries in categories.items()}
+        self._summary = summary
+        return written
+
+    def _last_page(self, old_pages) -> int:
+        if old_pages is not None:
+            return len(old_pages)
+        # First sync in this process: look at what is on disk
+        numbers = [int(m.group(1)) for name in self._listdir(self.pages_dir)
+                   for m in [re.fullmatch(r"page-(\d+)\.json", name)] if m]
+        return max(numbers, default=0)
+
+    def _category_files(self, old_categories) -> set:
+        if old_categories is not None:
+            return set(old_categories)
+        return {name[:-5] for name in self._listdir(self.category_dir) if name.endswith(".json")}
+
+    @staticmethod
+    def _listdir(path: str) -> list:
+        return os.listdir(path) if os.path.isdir(path) else []
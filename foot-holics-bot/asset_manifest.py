@@ -0,0 +1,194 @@
+"""
+Content-hash manifest of everything the site publishes, plus CDN cache rules.
+
+Nothing recorded which version of a published file the site was serving, so
+the CDN could only revalidate by date and nothing could be cached for long.
+AssetManifest keeps, per repo:
+
+    data/manifest.json      {"files": {relpath: {"sha256", "size", "mtime"}}}
+                            for live pages, article pages, JSON shards,
+                            events.json, sitemap.xml, posters, ...
+    vercel.json "headers"   `Cache-Control: immutable` for every file whose
+                            name carries a content hash (`app.3f2a9c1d.js`)
+
+The manifest is seeded from the repo's tracked files when the bot starts
+(entries whose content is unchanged keep their recorded mtime); after that it
+subscribes to safe_io (add_write_listener) and only the entry of the file that
+changed is updated (removed files drop out). Both outputs are rewritten by
+flush(), which git_auto_push calls so a commit always carries a manifest
+matching its files. Both are sorted, so an unchanged set of files gives
+byte-identical output and no commit.
+
+Hashed names can never change under the same URL, so they are cached for a
+year. Everything else keeps Vercel's default `must-revalidate` with the strong
+content-hash ETag Vercel computes itself, so a repeat visit costs one 304; per
+file rules for those would only repeat that, and run into Vercel's limit on
+header rules. Hand-written rules in vercel.json are left as they are. A
+_headers file from older versions (Netlify / Cloudflare Pages format, which
+Vercel ignores) is removed.
+.gz/.br siblings (precompress.py) share their source's entry and are skipped.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import threading
+from datetime import datetime, timezone
+
+from safe_io import atomic_write_json, atomic_write_text, file_digest, remove_file
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = os.path.join("data", "manifest.json")
+VERCEL_CONFIG = "vercel.json"
+LEGACY_HEADERS = "_headers"
+HEADERS_BANNER = "# Generated by foot-holics-bot/asset_manifest.py"
+
+SKIP_SUFFIXES = (".gz", ".br", ".tmp", ".lock", ".journal")
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,64}\.[a-z0-9]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+IMMUTABLE_HEADERS = [{"key": "Cache-Control", "value": IMMUTABLE}]
+# vercel.json header objects on one line, as the hand-written file has them
+_HEADER_OBJECT = re.compile(r'\{\n\s*"key": ("(?:[^"\\]|\\.)*"),\n\s*"value": ("(?:[^"\\]|\\.)*")\n\s*\}')
+
+
+def _mtime(mtime_ns: int) -> str:
+    return datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _entry(info) -> dict:
+    digest, size, mtime_ns = info
+    return {"sha256": digest.hex(), "size": size, "mtime": _mtime(mtime_ns)}
+
+
+def _managed(rule) -> bool:
+    """A vercel.json header rule flush() wrote (and may drop again)."""
+    return (isinstance(rule, dict) and set(rule) == {"source", "headers"}
+            and bool(HASHED_NAME.search(rule["source"])) and rule["headers"] == IMMUTABLE_HEADERS)
+
+
+def format_vercel_config(config: dict) -> str:
+    return _HEADER_OBJECT.sub(r'{ "key": \1, "value": \2 }', json.dumps(config, indent=2, ensure_ascii=False)) + "\n"
+
+
+class AssetManifest:
+    """safe_io write listener maintaining data/manifest.json and vercel.json headers for one repo."""
+
+    def __init__(self, root_dir: str, exclude: list = ()):
+        self.root = os.path.join(os.path.abspath(root_dir), "")
+        self.exclude = [os.path.join(os.path.abspath(x), "") for x in exclude if x]
+        self.manifest_path = os.path.join(self.root, MANIFEST)
+        self.config_path = os.path.join(self.root, VERCEL_CONFIG)
+        self.legacy_headers_path = os.path.join(self.root, LEGACY_HEADERS)
+        self._lock = threading.Lock()
+        self._files = self._load()
+        self._dirty = False
+
+    def _load(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return dict(json.load(f).get("files") or {})
+        except FileNotFoundError:
+            return {}
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable {self.manifest_path}: {e}")
+            return {}
+
+    def wants(self, path: str) -> bool:
+        return (path.startswith(self.root)
+                and path not in (self.manifest_path, self.config_path, self.legacy_headers_path)
+                and not path.endswith(SKIP_SUFFIXES)
+                and not os.path.basename(path).startswith(".")
+                and not any(path.startswith(x) for x in self.exclude))
+
+    def __call__(self, path: str, removed: bool) -> None:
+        if not self.wants(path):
+            return
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        info = None if removed else file_digest(path)
+        with self._lock:
+            if removed:
+                self._dirty |= self._files.pop(rel, None) is not None
+            elif info is not None:      # None: replaced again meanwhile, that write reports itself
+                self._files[rel] = _entry(info)
+                self._dirty = True
+
+    def seed(self) -> None:
+        """Rebuild the entries from the repo's tracked files (call before listening).
+
+        Only what git tracks is published (the bot commits everything it
+        writes), so local venvs and stray files stay out. An entry whose
+        content is unchanged keeps its recorded mtime: a fresh clone, pull or
+        touch must not rewrite the manifest.
+        """
+        try:
+            r = subprocess.run(["git", "-c", f"safe.directory={self.root}", "-C", self.root,
+                                "ls-files", "-z", "--cached"],
+                               capture_output=True, text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Not seeding {self.manifest_path}: git ls-files failed: {e}")
+            return
+        if r.returncode != 0:
+            logger.warning(f"Not seeding {self.manifest_path}: {r.stderr.strip()[:200]}")
+            return
+        with self._lock:
+            old = dict(self._files)
+        files = {}
+        for rel in sorted(set(r.stdout.split("\0")) - {""}):
+            path = os.path.join(self.root, *rel.split("/"))
+            info = file_digest(path) if self.wants(path) else None
+            if info is None:
+                continue
+            entry = _entry(info)
+            kept = old.get(rel)
+            if kept and kept.get("sha256") == entry["sha256"] and kept.get("size") == entry["size"]:
+                entry = kept
+            files[rel] = entry
+        with self._lock:
+            self._files = files
+            self._dirty = True          # the next flush() also brings vercel.json in line
+
+    def header_rules(self, files: dict) -> list:
+        """vercel.json rules for the content-hashed files in `files`."""
+        return [{"source": f"/{rel}", "headers": IMMUTABLE_HEADERS}
+                for rel in files if HASHED_NAME.search(rel)]
+
+    def _write_config(self, files: dict) -> bool:
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            config = {}
+        except ValueError as e:
+            logger.warning(f"Not updating unreadable {self.config_path}: {e}")
+            return False
+        rules = [r for r in config.get("headers", []) if not _managed(r)] + self.header_rules(files)
+        if not config and not rules:
+            return False                # no vercel.json, and nothing to put in one
+        if rules:
+            config["headers"] = rules
+        else:
+            config.pop("headers", None)
+        return atomic_write_text(self.config_path, format_vercel_config(config))
+
+    def _remove_legacy_headers(self) -> bool:
+        try:
+            with open(self.legacy_headers_path, "r", encoding="utf-8") as f:
+                generated = f.readline().startswith(HEADERS_BANNER)
+        except (FileNotFoundError, UnicodeDecodeError):
+            return False
+        return generated and remove_file(self.legacy_headers_path)
+
+    def flush(self) -> bool:
+        """Write manifest.json and the vercel.json rules if any entry changed. True if a file changed."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            files = dict(sorted(self._files.items()))
+            self._dirty = False
+        changed = atomic_write_json(self.manifest_path, {"files": files})
+        changed |= self._remove_legacy_headers()
+        return self._write_config(files) or changed
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the live stream-links page renderer.
+
+Renders a 15-link match N times and reports pages/sec for
+
+  * generate_live_html   — the whole page: player URLs, logo lookup, template
+  * LIVE_PAGE.render     — the precompiled template alone, from ready slot values
+
+and the bytes per page the minified template saves, raw and gzipped.
+
+Usage:
+    python bench_live_html.py              # 2000 pages
+    python bench_live_html.py -n 10000
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "bench")    # bot.py only needs it to run the bot
+
+import bot
+from live_template import LIVE_PAGE, LIVE_PAGE_SOURCE, Template
+
+
+def sample_match() -> dict:
+    links = bot.MAX_STREAM_LINKS
+    return {
+        "match_name": "Arsenal vs Chelsea",
+        "home_team": "Arsenal",
+        "away_team": "Chelsea",
+        "league": "Premier League",
+        "league_slug": "premier-league",
+        "date": "2026-08-22",
+        "time": "20:00",
+        "datetime_obj": datetime(2026, 8, 22, 20, 0),
+        "stadium": "Emirates Stadium",
+        "preview": "A London derby with the title race on the line. " * 6,
+        "thumbnail": "https://footholics.in/assets/img/2026-08-22-arsenal-vs-chelsea-poster.jpg",
+        "stream_urls": [f"https://cdn{i}.example.com/live/arsenal-chelsea/index.m3u8" for i in range(links)],
+        "stream_labels": ["English HD", "Hindi", "Spanish"] + [""] * (links - 3),
+    }
+
+
+def timed(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="pages to render per measurement")
+    args = parser.parse_args()
+
+    data = sample_match()
+    page = bot.generate_live_html(data).encode("utf-8")
+    unminified = Template(LIVE_PAGE_SOURCE).render(bot.live_page_values(data)).encode("utf-8")
+    slots = {name: "x" for name in LIVE_PAGE.names}
+    print(f"🧪 {len(data['stream_urls'])}-link match, {args.n} pages\n")
+    for label, before, after in (("bytes/page", len(unminified), len(page)),
+                                 ("gzipped", len(gzip.compress(unminified, 9)), len(gzip.compress(page, 9)))):
+        print(f"   {label:<20} {before:>10,} → {after:,} minified  (−{before - after:,}, "
+              f"{(before - after) / before:.0%})")
+    print()
+    for label, fn in (("generate_live_html", lambda: bot.generate_live_html(data)),
+                      ("LIVE_PAGE.render", lambda: LIVE_PAGE.render(slots))):
+        fn()                        # warm up caches
+        elapsed = timed(fn, args.n)
+        print(f"   {label:<20} {args.n / elapsed:>10,.0f} pages/sec   {elapsed / args.n * 1e6:>8.1f} µs/page")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
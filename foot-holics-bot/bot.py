@@ -11,8 +11,10 @@ import glob
 import subprocess
 import asyncio
 import base64
+import hashlib
+import heapq
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Dict, Any
 from urllib.parse import quote, unquote
 from dotenv import load_dotenv
@@ -30,6 +32,28 @@ from telegram.ext import (
     filters,
 )
 
+from event_store import file_slug, get_event_store
+from event_views import MembershipShards, SlugDocuments
+from article_pages import ArticlePages
+from search_index import SearchIndex
+from feeds import Feeds
+from live_template import LIVE_PAGE, STREAM_BUTTON, with_live_css
+from live_assets import LIVE_ASSETS, LiveAssets
+from render_cache import RenderCache, fingerprint
+from models import IST, Broadcast, Event
+from event_shards import ShardedBackend
+from events_journal import JournalBackend
+from sqlite_store import SqliteEventBackend, database_from_env
+from safe_io import (
+    add_write_listener, artifact_lock, atomic_write_bytes, atomic_write_json, atomic_write_text,
+    pop_changed, remove_file,
+)
+from precompress import Precompressor, site_excludes
+from asset_manifest import AssetManifest
+from site_transaction import SiteTransaction
+import live_rebuild
+import retention
+
 # Load environment variables
 load_dotenv()
 
@@ -58,8 +82,36 @@ def is_authorized(user_id: int) -> bool:
     """Return True if the user is allowed to use the bot."""
     return not ALLOWED_USER_IDS or user_id in ALLOWED_USER_IDS
 
-# India Standard Time (UTC+5:30)
-IST = timezone(timedelta(hours=5, minutes=30))
+# ── Storage ──────────────────────────────────────────────────────────────────
+# EVENTS_JOURNAL=1 appends event edits to data/events.journal instead of
+# rewriting events.json; the journal is folded back every
+# JOURNAL_COMPACT_INTERVAL seconds and before every git push.
+EVENTS_JOURNAL = os.getenv("EVENTS_JOURNAL", "").strip().lower() in ("1", "true", "yes")
+JOURNAL_COMPACT_INTERVAL = int(os.getenv("JOURNAL_COMPACT_INTERVAL", "300") or 300)
+# EVENTS_SHARDED=1 keeps events in data/events/YYYY-MM.json month shards; matches
+# older than ARCHIVE_AFTER_DAYS move to data/events/archive/ (same interval).
+EVENTS_SHARDED = os.getenv("EVENTS_SHARDED", "").strip().lower() in ("1", "true", "yes")
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30") or 30)
+# PRECOMPRESS=1 writes .gz/.br siblings of every published text file, for origins
+# that serve them (Vercel compresses on its own, so it is off by default)
+PRECOMPRESS = os.getenv("PRECOMPRESS", "0").strip().lower() in ("1", "true", "yes")
+# ASSET_MANIFEST=1 (default) keeps data/manifest.json and vercel.json cache rules (asset_manifest.py)
+ASSET_MANIFEST = os.getenv("ASSET_MANIFEST", "1").strip().lower() in ("1", "true", "yes")
+# Items in feeds/articles.xml, feeds/matches.xml and feed.json (see feeds.py)
+FEED_ITEMS = int(os.getenv("FEED_ITEMS", "50") or 50)
+# Entries per articles/pages/page-<n>.json (see article_pages.py)
+ARTICLES_PAGE_SIZE = int(os.getenv("ARTICLES_PAGE_SIZE", "12") or 12)
+
+# ── Match status engine ──────────────────────────────────────────────────────
+# Matches are written as "upcoming"; a JobQueue job flips them to "live" at
+# kickoff and to "finished" MATCH_LIVE_MINUTES later (opt-in: STATUS_ENGINE=1).
+STATUS_ENGINE = os.getenv("STATUS_ENGINE", "0").strip().lower() in ("1", "true", "yes")
+MATCH_LIVE_MINUTES = int(os.getenv("MATCH_LIVE_MINUTES", "120") or 120)
+STATUS_TICK_SECONDS = int(os.getenv("STATUS_TICK_SECONDS", "60") or 60)
+# Dedicated git credentials for commits no user triggered (status ticks). Without
+# them those commits stay local and go out with the next push a user makes.
+BACKGROUND_GIT_USERNAME = os.getenv("GIT_USERNAME", "").strip()
+BACKGROUND_GIT_TOKEN = os.getenv("GIT_TOKEN", "").strip()
 
 # Maximum number of streaming links supported per match.
 MAX_STREAM_LINKS = 15
@@ -450,7 +502,7 @@ def decode_player_url(player_url: str) -> str:
 def build_broadcast(stream_urls: list, stream_labels: list = None) -> list:
     """Build the events.json `broadcast` array from raw stream URLs.
 
-    Produces one {"name": ..., "url": ...} entry per slot, wrapping each live URL
+    Produces one Broadcast(name, url) per slot, wrapping each live URL
     with the branded player. `name` holds the operator's custom label if set,
     otherwise the auto "Stream N" default (which the live page turns into a preset
     description). Trailing empty ("#") slots are trimmed so we don't persist a long
@@ -464,10 +516,10 @@ def build_broadcast(stream_urls: list, stream_labels: list = None) -> list:
     broadcast = []
     for i, url in enumerate(trimmed):
         label = stream_labels[i].strip() if i < len(stream_labels) and stream_labels[i] else ""
-        broadcast.append({
-            "name": label or f"Stream {i + 1}",
-            "url": wrap_m3u8_with_proxy(url) if (url and url != "#") else "#",
-        })
+        broadcast.append(Broadcast(
+            label or f"Stream {i + 1}",
+            wrap_m3u8_with_proxy(url) if (url and url != "#") else "#",
+        ))
     return broadcast
 
 
@@ -565,6 +617,175 @@ def get_project_root() -> str:
     return os.path.dirname(bot_dir)
 
 
+def storage_db():
+    """The SQLite database when STORAGE_BACKEND=sqlite, else None (plain JSON files)."""
+    return database_from_env(get_project_root())
+
+
+def _event_backend(path: str, include_archive: bool = False):
+    db = storage_db()
+    if db:
+        return SqliteEventBackend(db)
+    if EVENTS_SHARDED:
+        return ShardedBackend(path, include_archive, ARCHIVE_AFTER_DAYS)
+    if EVENTS_JOURNAL:
+        return JournalBackend(path)
+    return None
+
+
+def events_store(include_archive: bool = False):
+    """Shared, indexed cache of data/events.json (reloads only when the file changes).
+
+    With EVENTS_SHARDED only the hot shards are loaded unless `include_archive`.
+    """
+    path = os.path.join(get_project_root(), "data", "events.json")
+    if include_archive and EVENTS_SHARDED and not storage_db():
+        return get_event_store(path, lambda p: _event_backend(p, True), view="archive")
+    store = get_event_store(path, _event_backend)
+    for view in event_views():
+        store.add_listener(view)
+    return store
+
+
+_event_views = {}
+
+
+def event_views() -> list:
+    """Derived files the website reads instead of all of events.json (event_views.py)."""
+    data_dir = os.path.join(get_project_root(), "data")
+    views = _event_views.get(data_dir)
+    if views is None:
+        views = _event_views[data_dir] = [MembershipShards(data_dir), SlugDocuments(data_dir),
+                                          search_index(), site_feeds()]
+    return views
+
+
+_search_indexes = {}
+
+
+def search_index() -> SearchIndex:
+    """data/search-index.json — fed by the events store and sync_article_pages()."""
+    data_dir = os.path.join(get_project_root(), "data")
+    index = _search_indexes.get(data_dir)
+    if index is None:
+        index = _search_indexes[data_dir] = SearchIndex(data_dir)
+    return index
+
+
+_feeds = {}
+
+
+def site_feeds() -> Feeds:
+    """feeds/articles.xml, feeds/matches.xml, feed.json — fed like search_index()."""
+    root = get_project_root()
+    feeds = _feeds.get(root)
+    if feeds is None:
+        feeds = _feeds[root] = Feeds(root, FEED_ITEMS)
+    return feeds
+
+
+def rebuild_event_views() -> None:
+    """Regenerate every derived view from the current events (startup, after a pull)."""
+    with artifact_lock():
+        events = events_store().all()
+        for view in event_views():
+            view(events, None)
+
+
+def _stores_for(include_archive: bool) -> list:
+    """Hot store first, then the archive view when it exists and is wanted."""
+    stores = [events_store()]
+    if include_archive and EVENTS_SHARDED and not storage_db():
+        stores.append(events_store(include_archive=True))
+    return stores
+
+
+# ── articles/index.json ───────────────────────────────────────────────────────
+
+def articles_index_path() -> str:
+    return os.path.join(get_project_root(), "articles", "index.json")
+
+
+def load_articles_index():
+    """All article index entries (newest first), or None if there is no index yet."""
+    db = storage_db()
+    if db:
+        return db.articles()
+    path = articles_index_path()
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+_article_pages = {}
+
+
+def sync_article_pages() -> None:
+    """Refresh articles/pages/, articles/category/, the search index and feeds after an index change."""
+    articles_dir = os.path.dirname(articles_index_path())
+    pages = _article_pages.get(articles_dir)
+    if pages is None:
+        pages = _article_pages[articles_dir] = ArticlePages(articles_dir, ARTICLES_PAGE_SIZE)
+    try:
+        with artifact_lock():
+            articles = load_articles_index() or []
+            pages.sync(articles)
+            search_index().sync_articles(articles)
+            site_feeds().sync_articles(articles)
+    except Exception as e:
+        logger.error(f"Error updating article pages: {e}", exc_info=True)
+
+
+def add_article_entry(entry: dict) -> None:
+    """Insert an index entry at the top of articles/index.json."""
+    db = storage_db()
+    if db:
+        db.insert_article(entry, 0)
+    else:
+        with artifact_lock():
+            articles = load_articles_index() or []
+            articles.insert(0, entry)
+            atomic_write_json(articles_index_path(), articles)
+    sync_article_pages()
+
+
+def update_article_entry(slug: str, fields: dict) -> None:
+    """Apply `fields` to the index entry for `slug` (no-op if it isn't listed)."""
+    db = storage_db()
+    if db:
+        db.update_article(slug, fields)
+    else:
+        with artifact_lock():
+            articles = load_articles_index()
+            if articles is None:
+                return
+            for entry in articles:
+                if entry["slug"] == slug:
+                    entry.update(fields)
+                    break
+            atomic_write_json(articles_index_path(), articles)
+    sync_article_pages()
+
+
+def remove_article_entry(slug: str) -> bool:
+    """Drop `slug` from the articles index. Returns False if it wasn't listed (or there is no index)."""
+    db = storage_db()
+    if db:
+        removed = db.delete_article(slug)
+    else:
+        with artifact_lock():
+            articles = load_articles_index()
+            if articles is None:
+                return False
+            kept = [a for a in articles if a["slug"] != slug]
+            removed = len(kept) != len(articles)
+            if removed:
+                atomic_write_json(articles_index_path(), kept)
+    if removed:
+        sync_article_pages()
+    return removed
+
 
 def get_live_project_root() -> str:
     """Return path to foot-holics-live/ project folder, or empty string if not found."""
@@ -585,6 +806,56 @@ def get_live_project_root() -> str:
     return ""
 
 
+_precompressor = None
+
+
+def start_precompressor() -> None:
+    """Keep .gz/.br siblings of everything published (precompress.py) from now on,
+    after bringing the ones on disk up to date in the background."""
+    global _precompressor
+    if _precompressor is None:
+        bot_dir = os.path.dirname(os.path.abspath(__file__))
+        roots = [get_project_root(), get_live_project_root()]
+        _precompressor = Precompressor(roots, exclude=site_excludes(roots, bot_dir))
+        add_write_listener(_precompressor)
+        _precompressor.reconcile()
+
+
+_asset_manifests = {}           # repo root -> AssetManifest
+
+
+def start_asset_manifests() -> None:
+    """Track every published file in data/manifest.json + vercel.json of its repo,
+    starting from a scan of what is on disk now."""
+    bot_dir = os.path.dirname(os.path.abspath(__file__))
+    for root in (get_project_root(), get_live_project_root()):
+        if root and os.path.abspath(root) not in _asset_manifests:
+            manifest = AssetManifest(root, exclude=[bot_dir])
+            manifest.seed()
+            _asset_manifests[os.path.abspath(root)] = manifest
+            add_write_listener(manifest)
+
+
+async def save_telegram_file(tg_file, path: str) -> bool:
+    """Download a Telegram photo/document to `path` through safe_io.
+
+    Unlike download_to_drive this is atomic, skips identical re-uploads and
+    shows up in pop_changed / the write listeners (precompression, manifest).
+    """
+    data = await tg_file.download_as_bytearray()
+    return await asyncio.to_thread(atomic_write_bytes, path, bytes(data))
+
+
+def settle_generated_files(repo_path: str) -> None:
+    """Let pending .gz/.br siblings and the asset manifest of repo_path land on disk."""
+    if _precompressor is not None:
+        _precompressor.flush()
+    # ...then the manifest describing them (and its own siblings)
+    manifest = _asset_manifests.get(os.path.abspath(repo_path))
+    if manifest is not None and manifest.flush() and _precompressor is not None:
+        _precompressor.flush()
+
+
 def git_auto_push(repo_path: str, commit_message: str, username: str = "", token: str = "") -> tuple:
     """Run git add/commit/push in repo_path. Returns (success: bool, status: str).
     If username+token provided, injects them into the HTTPS remote URL so no
@@ -592,15 +863,49 @@ def git_auto_push(repo_path: str, commit_message: str, username: str = "", token
 
     Files are always staged+committed locally even if push credentials are missing,
     so they are never left as untracked on disk.
+
+    When no write since the last push changed a byte under repo_path (safe_io
+    skips identical writes) and the work tree is clean with nothing unpushed,
+    this is a no-op: no add/commit/pull/push round-trips.
     """
     if not repo_path or not os.path.isdir(repo_path):
         return False, "repo path not found"
 
+    # Fold the events journal / rotate the archive so the push carries final files
+    if os.path.abspath(repo_path) == get_project_root():
+        try:
+            events_store().compact()
+        except Exception as e:
+            return False, f"event storage compaction failed: {e}"
+
+    # Drop hashed live asset copies the pushed pages no longer link
+    if os.path.abspath(repo_path) == os.path.abspath(get_live_project_root() or ""):
+        prune_live_assets(repo_path)
+
     # Pass safe.directory so git works correctly inside Docker regardless of
     # file ownership differences between the container user and the host.
     safe_flags = ["-c", f"safe.directory={repo_path}"]
 
+    # Pending .gz/.br siblings and the manifest ship in the same commit
+    settle_generated_files(repo_path)
+
     try:
+        changed = pop_changed(repo_path)
+        if not changed:
+            # Nothing we wrote differs — still check for edits made outside
+            # safe_io and for local commits a previous push never delivered
+            r = subprocess.run(
+                ["git"] + safe_flags + ["status", "--porcelain", "--branch"],
+                cwd=repo_path, capture_output=True, text=True, timeout=30
+            )
+            lines = r.stdout.splitlines()
+            # "## main...origin/main" alone: clean, tracking, not ahead
+            if (r.returncode == 0 and len(lines) == 1
+                    and "..." in lines[0] and "[ahead" not in lines[0]):
+                return True, "nothing changed — push skipped"
+        else:
+            logger.info(f"git_auto_push: {len(changed)} changed file(s) under {repo_path}")
+
         # Stage all changes (always, regardless of push credentials)
         r = subprocess.run(
             ["git"] + safe_flags + ["add", "."],
@@ -709,6 +1014,62 @@ def set_pending_push(context, jobs: list, results: list) -> None:
         context.user_data.pop('pending_push', None)
 
 
+_live_css_synced = set()
+
+
+def sync_live_css(live_root: str) -> bool:
+    """Make sure live.css in `live_root` carries the current lp-* classes (LIVE_CSS).
+
+    Checked once per process and live folder. Returns True if live.css changed.
+    """
+    if live_root in _live_css_synced:
+        return False
+    path = os.path.join(live_root, "assets", "css", "live.css")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            current = f.read()
+    except FileNotFoundError:
+        logger.warning(f"{path} not found — creating it with the live page classes only")
+        current = ""
+    changed = atomic_write_text(path, with_live_css(current))
+    _live_css_synced.add(live_root)
+    return changed
+
+
+_live_assets = {}               # live root -> LiveAssets
+
+
+def live_asset_urls() -> dict:
+    """Content-hashed URLs of live.css, live-match.js and live-core.js (live_assets.py).
+
+    Plain URLs when there is no live folder.
+    """
+    live_root = get_live_project_root()
+    if not live_root:
+        return dict(LIVE_ASSETS)
+    return _live_assets_for(live_root).urls()
+
+
+def _live_assets_for(live_root: str) -> LiveAssets:
+    sync_live_css(live_root)        # the lp-* block is part of live.css's hash
+    assets = _live_assets.get(live_root)
+    if assets is None:
+        assets = _live_assets[live_root] = LiveAssets(live_root)
+    return assets
+
+
+def prune_live_assets(live_root: str) -> list:
+    """Delete hashed live.css / live-match.js / live-core.js copies no live page links any more."""
+    try:
+        removed = _live_assets_for(live_root).prune()
+    except OSError as e:
+        logger.warning(f"Pruning old live asset copies failed: {e}")
+        return []
+    if removed:
+        logger.info(f"Removed {len(removed)} unused live asset copies")
+    return removed
+
+
 def copy_html_to_live(filename: str, html_code: str) -> bool:
     """Copy generated HTML to foot-holics-live/ folder."""
     live_root = get_live_project_root()
@@ -716,15 +1077,181 @@ def copy_html_to_live(filename: str, html_code: str) -> bool:
         logger.warning("foot-holics-live/ folder not found — live page not written")
         return False
     try:
+        sync_live_css(live_root)
         dest = os.path.join(live_root, filename)
-        with open(dest, "w", encoding="utf-8") as f:
-            f.write(html_code)
+        atomic_write_text(dest, html_code)
         return True
     except Exception as e:
         logger.error(f"Error writing live page: {e}", exc_info=True)
         return False
 
 
+# What generate_live_html reads from its `data` dict (datetime_obj is derived
+# from date + time); a live page is re-rendered only when one of these changes
+# or the renderer does (live_renderer_version)
+LIVE_PAGE_INPUTS = (
+    "match_name", "home_team", "away_team", "league", "league_slug", "date", "time",
+    "stadium", "preview", "thumbnail", "image_file", "stream_urls", "stream_labels",
+)
+
+_render_cache = None
+_live_code_version = None
+
+
+def render_cache() -> RenderCache:
+    """Input fingerprints of the live pages, kept in foot-holics-bot/.render-cache.json."""
+    global _render_cache
+    if _render_cache is None:
+        bot_dir = os.path.dirname(os.path.abspath(__file__))
+        _render_cache = RenderCache(os.path.join(bot_dir, ".render-cache.json"))
+    return _render_cache
+
+
+def _team_logo_stamp() -> list:
+    """mtimes of the team logo folders: adding or removing a logo changes one."""
+    logos_dir = os.path.join(get_project_root(), "assets", "img", "logos", "teams")
+    stamp = []
+    try:
+        with os.scandir(logos_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stamp.append((entry.name, entry.stat().st_mtime_ns))
+    except FileNotFoundError:
+        return []
+    return sorted(stamp)
+
+
+def _code_digest(code, h=None) -> str:
+    """Hash of what a function does — bytecode, constants, names — but not where
+    it sits in the file, so edits elsewhere in bot.py don't invalidate pages."""
+    h = h or hashlib.sha256()
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _code_digest(const, h)
+        else:
+            h.update(repr(const).encode())
+    return h.hexdigest()
+
+
+def live_renderer_version() -> str:
+    """Everything besides the match data that a live page depends on.
+
+    The template, broadcaster table and the code that turns match data into
+    slot values (player URLs, stream buttons, logo lookup) are hashed once per
+    process; the hashed asset URLs and the logo folder stamp are a few stat()
+    calls each time.
+    """
+    global _live_code_version
+    if _live_code_version is None:
+        code = [_code_digest(fn.__code__) for fn in (
+            live_page_values, find_team_logo, stream_link_meta, get_broadcaster_table_compact,
+            parse_stream_key, unwrap_stream_url, get_type_param, _obf_encode)]
+        _live_code_version = fingerprint(LIVE_PAGE.statics, STREAM_BUTTON.statics, BROADCASTER_MAP,
+                                         MAX_STREAM_LINKS, _LINK_KEY, code)
+    return fingerprint(_live_code_version, live_asset_urls(), _team_logo_stamp())
+
+
+def live_page_fingerprint(data: dict, version: str = None) -> str:
+    """Hash of the live page inputs in `data` plus live_renderer_version().
+
+    Cheap next to rendering: a cache hit builds no slot values at all. Pass
+    `version` when fingerprinting many pages at once.
+    """
+    return fingerprint({key: data.get(key) for key in LIVE_PAGE_INPUTS},
+                       version or live_renderer_version())
+
+
+def write_live_page(filename: str, data: dict, force: bool = False) -> bool:
+    """Render `data` into foot-holics-live/<filename> unless the render cache says it's current.
+
+    Returns True if the page was rendered and written, False on a cache hit
+    or when there is no live folder.
+    """
+    live_root = get_live_project_root()
+    if not live_root:
+        logger.warning("foot-holics-live/ folder not found — live page not written")
+        return False
+    digest = live_page_fingerprint(data)
+    if not force and render_cache().fresh(filename, digest, os.path.join(live_root, filename)):
+        logger.info(f"Live page {filename} is up to date — not re-rendered")
+        return False
+    if not copy_html_to_live(filename, generate_live_html(data)):
+        return False
+    render_cache().store(filename, digest)
+    return True
+
+
+def live_page_data(ev) -> dict:
+    """The generate_live_html input for an events.json entry.
+
+    Broadcast URLs are decoded back to raw stream URLs (DRM key included, see
+    decode_player_url) and auto "Stream N" names become empty labels.
+    """
+    stream_urls, stream_labels = [], []
+    for bc in ev.broadcast or []:
+        if not bc.url or bc.url == "#":
+            stream_urls.append("#")
+        elif "player.html?get=" in bc.url:
+            stream_urls.append(decode_player_url(bc.url) or "#")
+        else:
+            stream_urls.append(bc.url)
+        stream_labels.append("" if _DEFAULT_STREAM_NAME.match(bc.name or "") else bc.name)
+    date_str = ev.date or ""
+    time_str = ev.time or "00:00"
+    try:
+        dt_obj = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        dt_obj = datetime.now()
+    home = ev.home_team or ""
+    away = ev.away_team or ""
+    return {
+        "datetime_obj": dt_obj,
+        "home_team": home,
+        "away_team": away,
+        "league": ev.league or "Football",
+        "league_slug": ev.league_slug or "others",
+        "date": date_str,
+        "time": time_str,
+        "stadium": ev.stadium or "",
+        "match_name": ev.title or f"{home} vs {away}",
+        "thumbnail": ev.poster or "",
+        "stream_urls": stream_urls,
+        "stream_labels": stream_labels,
+        "image_file": "og-image.jpg",
+        "preview": ev.excerpt or "",
+    }
+
+
+def rebuild_live_pages(force: bool = False, workers: int = None):
+    """Re-render the live page of every match, archive included (live_rebuild.py).
+
+    Returns a live_rebuild.RebuildResult, or None when there is no live folder.
+    """
+    live_root = get_live_project_root()
+    if not live_root:
+        return None
+    sync_live_css(live_root)
+    jobs, seen = [], set()
+    for store in _stores_for(include_archive=True):
+        for ev in store.all():
+            slug = file_slug(ev.slug)
+            if slug is None:
+                if ev.slug:
+                    logger.warning(f"Live page not rebuilt: slug {ev.slug!r} can't be a file name")
+                continue
+            if slug not in seen:
+                seen.add(slug)
+                jobs.append((f"{slug}.html", live_page_data(ev)))
+    version = live_renderer_version()
+    result = live_rebuild.rebuild(jobs, live_root, generate_live_html,
+                                  lambda data: live_page_fingerprint(data, version),
+                                  render_cache(), force=force, workers=workers)
+    prune_live_assets(live_root)        # pages now link the current copies
+    return result
+
+
 BROADCASTER_MAP = {
     "premier-league":    {"uk": "Sky Sports", "us": "NBC Sports / Peacock", "in": "Star Sports / Hotstar"},
     "laliga":            {"uk": "DAZN",        "us": "ESPN+",               "in": "Star Sports"},
@@ -746,12 +1273,17 @@ def get_broadcaster_table_compact(league_slug: str) -> str:
     ]
     html = ""
     for region, channel in rows:
-        html += f'<tr style="border-bottom:1px solid var(--glass-border);"><td style="padding:0.4rem 0;color:var(--text);">{region}</td><td style="padding:0.4rem 0;color:var(--muted);">{channel}</td></tr>\n'
+        html += f'<tr><td>{region}</td><td>{channel}</td></tr>\n'     # styled by .lp-table (LIVE_CSS)
     return html
 
 
 def generate_live_html(data: dict) -> str:
     """Generate the live subdomain stream-links page."""
+    return LIVE_PAGE.render(live_page_values(data))
+
+
+def live_page_values(data: dict) -> dict:
+    """The LIVE_PAGE slot values for a match (see generate_live_html)."""
     from urllib.parse import quote
     import base64
 
@@ -802,312 +1334,90 @@ def generate_live_html(data: dict) -> str:
         else:
             player_urls.append(None)
 
-    # Build stream link buttons HTML (supports up to MAX_STREAM_LINKS links)
-    stream_buttons_html = ""
+    # Stream link buttons (supports up to MAX_STREAM_LINKS links)
+    buttons = []
     for i, pu in enumerate(player_urls):
         if pu:
             custom_label = stream_labels[i] if i < len(stream_labels) else ""
             sub, qual = stream_link_meta(i, custom_label)
-            sub = _html.escape(sub)  # operator-supplied text → safe for HTML
-            stream_buttons_html += f"""
-            <a href="{pu}" class="stream-link-btn">
-                <div class="stream-play-icon">
-                    <i class="fa-solid fa-play"></i>
-                </div>
-                <div class="stream-link-info">
-                    <span class="stream-link-label">Link {i+1}</span>
-                    <span class="stream-link-sub">{sub}</span>
-                </div>
-                <span class="stream-quality-badge">{qual}</span>
-            </a>"""
+            buttons.append(STREAM_BUTTON.render({"URL": pu, "NUMBER": i + 1, "SUB": sub, "QUALITY": qual}))
 
-    # 24-hour time for the live badge script
-    time_24h = date_obj.strftime("%H:%M")
     poster_url = data.get("thumbnail", "") or f"https://footholics.in/assets/img/{data.get('image_file', 'og-image.jpg')}"
-
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta name="monetag" content="4d7372eaeef870ded80928fe202a33e8">
-    <script src="https://quge5.com/88/tag.min.js" data-zone="248733" async data-cfasync="false" onerror="window.__fhAdScriptFailed=1"></script>
-    <script src="/assets/js/live-core.js" defer></script>
-    <meta name="robots" content="noindex, nofollow">
-    <meta name="description" content="Watch {data['home_team']} vs {data['away_team']} live — {data['league']} on {date_obj.strftime('%B %d, %Y')}. Multiple stream links available.">
-    <meta property="og:title" content="{data['match_name']} — Watch Live Stream">
-    <meta property="og:description" content="Watch {data['match_name']} live online. {data['league']} — {date_obj.strftime('%B %d, %Y')}.">
-    <meta property="og:type" content="website">
-    <meta property="og:image" content="{poster_url}">
-    <meta name="twitter:card" content="summary_large_image">
-    <title>{data['match_name']} Live Stream — {data['league']} | Foot Holics</title>
-    <link rel="canonical" href="https://live.footholics.in/{match_slug}">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css" integrity="sha512-DTOQO9RWCH3ppGqcWaEA1BIZOC6xxalwEsw9c2QQeAIftl+Vegovlnee1c9QX4TctnWMn13TZye+giMm8e2LwA==" crossorigin="anonymous" referrerpolicy="no-referrer" />
-    <link rel="stylesheet" href="assets/css/live.css">
-    <link rel="icon" type="image/png" href="https://footholics.in/assets/img/logos/site/logo.png">
-    <script src="assets/js/live-match.js" defer></script>
-</head>
-<body>
-    <header class="live-header">
-        <div class="container">
-            <div class="live-header-inner">
-                <a href="https://footholics.in" class="live-logo">
-                    <img src="https://footholics.in/assets/img/logos/site/logo.png" alt="Foot Holics" onerror="this.style.display=\'none\'">
-                    Foot Holics
-                </a>
-                <a href="/detail?slug={match_slug}" class="back-link">
-                    <i class="fa-solid fa-arrow-left" style="font-size:0.75rem;"></i>
-                    Match Preview
-                </a>
-            </div>
-        </div>
-    </header>
-
-    <div class="container">
-        <div class="match-hero">
-            <div style="display: flex; justify-content: center; gap: 0.75rem; margin-bottom: 1rem; flex-wrap: wrap;">
-                <span class="live-badge-pill" id="liveBadge" style="display:none;">
-                    <span class="live-dot"></span>
-                    LIVE NOW
-                </span>
-                <span class="league-tag">{data['league']}</span>
-            </div>
-            <div class="teams-row">
-                <div class="team-block">
-                    <img src="{home_logo}" alt="{data['home_team']}" onerror="this.outerHTML=\'<div class=&quot;team-logo-placeholder&quot;>⚽</div>\'">
-                    <span class="team-name-text">{data['home_team']}</span>
-                </div>
-                <div class="vs-text">vs</div>
-                <div class="team-block">
-                    <img src="{away_logo}" alt="{data['away_team']}" onerror="this.outerHTML=\'<div class=&quot;team-logo-placeholder&quot;>⚽</div>\'">
-                    <span class="team-name-text">{data['away_team']}</span>
-                </div>
-            </div>
-            <div class="match-meta-row">
-                <span><i class="fa-regular fa-calendar" style="color:var(--accent);"></i> {date_obj.strftime('%B %d, %Y')}</span>
-                <span><i class="fa-regular fa-clock" style="color:var(--accent);"></i> {data['time']} IST</span>
-                <span><i class="fa-solid fa-location-dot" style="color:var(--accent);"></i> {data['stadium']}</span>
-            </div>
-        </div>
-
-        <!-- ── LIVE SCORE WIDGET ──────────────────────────────────────────── -->
-        <div id="liveScoreWidget" style="display:none;background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1rem 1.5rem;margin-bottom:1.25rem;text-align:center;">
-            <div id="liveScoreStatus" style="font-size:0.72rem;font-weight:700;text-transform:uppercase;letter-spacing:1px;margin-bottom:0.5rem;"></div>
-            <div id="liveScoreValue" style="font-size:2.2rem;font-weight:700;letter-spacing:4px;line-height:1;"></div>
-        </div>
-
-        <!-- ── MATCH DATA WIDGET (Timeline + Tabs) ───────────────────────── -->
-        <div id="matchDataSection" style="display:none;margin-bottom:1.25rem;">
-            <div id="mdTimeline" class="md-timeline" style="display:none;">
-                <div class="tl-header">Match Timeline</div>
-                <div class="tl-track">
-                    <div class="tl-line"></div>
-                    <div class="tl-ht" style="left:50%"></div>
-                </div>
-                <div class="tl-minute-labels"><span>0'</span><span>45'</span><span>90'</span></div>
-            </div>
-            <div class="md-panel">
-                <div class="md-tabs">
-                    <button class="md-tab active" onclick="mdTab(this,'mdStats')">Stats</button>
-                    <button class="md-tab" onclick="mdTab(this,'mdLineups')">Lineups</button>
-                    <button class="md-tab" onclick="mdTab(this,'mdFormation')">Formation</button>
-                    <button class="md-tab" onclick="mdTab(this,'mdCommentary')">Commentary</button>
-                </div>
-                <div id="mdStats" class="md-pane"></div>
-                <div id="mdLineups" class="md-pane" style="display:none;"></div>
-                <div id="mdFormation" class="md-pane" style="display:none;"></div>
-                <div id="mdCommentary" class="md-pane" style="display:none;"></div>
-            </div>
-        </div>
-
-        <p class="stream-section-title">Watch {data['home_team']} vs {data['away_team']} Live</p>
-
-        <div class="stream-links-list">
-{stream_buttons_html}
-        </div>
-
-        <p class="stream-note">
-            <i class="fa-solid fa-circle-info" style="color:var(--accent);"></i>
-            If one stream is down, try the next link. Streams go live ~15 minutes before kickoff.
-        </p>
-
-        <div class="community-row" style="margin-top: 1.5rem;">
-            <a href="https://t.me/+XyKdBR9chQpjM2I9" target="_blank" rel="noopener noreferrer" class="community-btn btn-telegram">
-                <i class="fa-brands fa-telegram"></i> Join Telegram for Updates
-            </a>
-            <a href="https://chat.whatsapp.com/KG7DBpC0BKv6bFtlzfOr2T" target="_blank" rel="noopener noreferrer" class="community-btn btn-whatsapp">
-                <i class="fa-brands fa-whatsapp"></i> WhatsApp Channel
-            </a>
-        </div>
-
-        <!-- ── MATCH INFO SECTION ────────────────────────────────────────── -->
-        <div style="background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1.25rem;margin:1.5rem 0;">
-            <h2 style="color:var(--accent);font-size:1rem;margin-bottom:0.9rem;">Match Information</h2>
-            <div style="display:grid;grid-template-columns:1fr 1fr;gap:0.65rem 1.25rem;font-size:0.84rem;">
-                <div><span style="color:var(--muted);display:block;margin-bottom:0.15rem;">Competition</span><strong style="color:var(--text);">{data['league']}</strong></div>
-                <div><span style="color:var(--muted);display:block;margin-bottom:0.15rem;">Kickoff (IST)</span><strong style="color:var(--text);">{data['time']} IST</strong></div>
-                <div><span style="color:var(--muted);display:block;margin-bottom:0.15rem;">Date</span><strong style="color:var(--text);">{date_obj.strftime('%B %d, %Y')}</strong></div>
-                <div><span style="color:var(--muted);display:block;margin-bottom:0.15rem;">Venue</span><strong style="color:var(--text);">{data['stadium']}</strong></div>
-            </div>
-        </div>
-
-        <!-- ── OFFICIAL BROADCAST ────────────────────────────────────────── -->
-        <div style="background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1.25rem;margin-bottom:1.5rem;">
-            <h2 style="color:var(--accent);font-size:1rem;margin-bottom:0.9rem;">Official Broadcast</h2>
-            <table style="width:100%;border-collapse:collapse;font-size:0.82rem;">
-                <thead><tr style="border-bottom:1px solid var(--glass-border);">
-                    <th style="text-align:left;padding:0.35rem 0;color:var(--muted);font-weight:600;">Region</th>
-                    <th style="text-align:left;padding:0.35rem 0;color:var(--muted);font-weight:600;">Channel / Platform</th>
-                </tr></thead>
-                <tbody>{get_broadcaster_table_compact(data['league_slug'])}</tbody>
-            </table>
-        </div>
-
-        <!-- ── MATCH PREVIEW ─────────────────────────────────────────────── -->
-        <div style="background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1.25rem;margin-bottom:1.5rem;">
-            <h2 style="color:var(--accent);font-size:1rem;margin-bottom:0.75rem;">Match Preview</h2>
-            <p style="color:var(--muted);font-size:0.86rem;line-height:1.7;">{data.get('preview', f"Stay tuned for the latest updates on this {data['league']} clash.")[:350]}</p>
-            <p style="margin-top:0.75rem;"><a href="/detail?slug={match_slug}" style="color:var(--accent);font-size:0.84rem;font-weight:600;">Full preview &amp; analysis &rarr;</a></p>
-        </div>
-
-        <div class="live-disclaimer">
-            <strong>Disclaimer:</strong> Foot Holics does not host any streaming content. All links point to third-party sources found publicly on the internet. We have no control over the availability or content of these streams. For takedown requests contact <a href="mailto:footholicsin@gmail.com" style="color:var(--accent);">footholicsin@gmail.com</a>.
-        </div>
-    </div>
-
-    <footer class="live-footer">
-        <div class="container">
-            <nav class="footer-nav">
-                <a href="https://footholics.in">Home</a>
-                <a href="https://footholics.in/news.html">News</a>
-                <a href="https://footholics.in/fixtures.html">Fixtures</a>
-                <a href="https://footholics.in/standings.html">Standings</a>
-                <a href="https://footholics.in/contact.html">Contact</a>
-            </nav>
-            <p>&copy; 2026 Foot Holics. All rights reserved.</p>
-        </div>
-    </footer>
-
-    <div id="cookieBar" class="cookie-bar" style="display:none;">
-        <span>This site uses cookies. <a href="https://footholics.in/privacy.html" style="color:var(--accent);">Privacy Policy</a></span>
-        <button onclick="document.getElementById(\'cookieBar\').style.display=\'none\';localStorage.setItem(\'lhCookieOk\',\'1\');">OK</button>
-    </div>
-
-    <script>
-    (function () {{
-        // ── Live badge ───────────────────────────────────────────────────
-        var kickoffIST = new Date('{data['date']}T{time_24h}:00+05:30');
-        function checkLive() {{
-            var now = new Date();
-            var diff = (now - kickoffIST) / 60000;
-            var badge = document.getElementById('liveBadge');
-            if (!badge) return;
-            if (diff >= -15 && diff <= 120) badge.style.display = 'inline-flex';
-            else badge.style.display = 'none';
-        }}
-        checkLive();
-        setInterval(checkLive, 60000);
-
-        // ── Live score widget ────────────────────────────────────────────
-        var scoreSlug = window.location.pathname.replace(/^\//, '').replace(/\/$/, '');
-        if (scoreSlug) {{
-            function fetchScore() {{
-                fetch('https://footholics.in/api/match-info?slug=' + encodeURIComponent(scoreSlug))
-                    .then(function(r) {{ return r.ok ? r.json() : null; }})
-                    .then(function(info) {{
-                        if (!info || !info.fixtureId) return null;
-                        return fetch('https://footholics.in/api/match-live?id=' + info.fixtureId)
-                            .then(function(r) {{ return r.ok ? r.json() : null; }});
-                    }})
-                    .then(function(d) {{
-                        if (!d || !d.fixture) return;
-                        var gs = d.fixture.goals;
-                        var fs = d.fixture.fixture.status;
-                        renderMatchData(d);
-                        if (fs.short === 'NS' || fs.short === 'TBD') return;
-                        var widget = document.getElementById('liveScoreWidget');
-                        var statusEl = document.getElementById('liveScoreStatus');
-                        var scoreEl = document.getElementById('liveScoreValue');
-                        if (!widget) return;
-                        widget.style.display = 'block';
-                        scoreEl.textContent = (gs.home !== null ? gs.home : 0) + ' \u2013 ' + (gs.away !== null ? gs.away : 0);
-                        if (fs.short === 'FT' || fs.short === 'AET' || fs.short === 'PEN') {{
-                            statusEl.innerHTML = '<span style="color:var(--muted)">Full Time</span>';
-                        }} else if (fs.short === 'HT') {{
-                            statusEl.innerHTML = '<span style="color:var(--accent)">Half Time</span>';
-                        }} else {{
-                            var min = fs.elapsed ? fs.elapsed + "\'" : '';
-                            statusEl.innerHTML = '<span style="display:inline-flex;align-items:center;gap:5px;color:#f87171"><span style="width:7px;height:7px;background:#f87171;border-radius:50%;display:inline-block;animation:live-pulse 1.3s ease-in-out infinite"></span>LIVE ' + min + '</span>';
-                        }}
-                    }})
-                    .catch(function() {{}});
-            }}
-            fetchScore();
-            setInterval(fetchScore, 10 * 60 * 1000); // refresh every 10 min
-        }}
-
-        if (!localStorage.getItem('lhCookieOk')) {{
-            document.getElementById('cookieBar').style.display = 'flex';
-        }}
-    }})();
-    </script>
-</body>
-</html>"""
+    # The player pages show the poster (thumb=), so warm the cache for the next click
+    poster_hint = (f'\n<link rel="prefetch" href="{_html.escape(thumb_src, quote=True)}" as="image">'
+                   if thumb_src else "")
+    preview = data.get("preview", f"Stay tuned for the latest updates on this {data['league']} clash.")
+
+    return {
+        "HOME_TEAM": data["home_team"],
+        "AWAY_TEAM": data["away_team"],
+        "MATCH_NAME": data["match_name"],
+        "LEAGUE": data["league"],
+        "DATE": data["date"],
+        "DATE_LONG": date_obj.strftime("%B %d, %Y"),
+        "TIME": data["time"],
+        "TIME_24H": date_obj.strftime("%H:%M"),   # for the live badge script
+        "STADIUM": data["stadium"],
+        "PREVIEW": preview[:350],
+        "SLUG": match_slug,
+        "POSTER_URL": poster_url,
+        "HOME_LOGO": home_logo,
+        "AWAY_LOGO": away_logo,
+        "STREAM_LINKS": "".join(buttons),
+        "BROADCAST_ROWS": get_broadcaster_table_compact(data["league_slug"]),
+        "POSTER_HINT": poster_hint,
+        **live_asset_urls(),
+    }
 
 
 
-def list_match_files() -> list:
+def list_match_files(include_archive: bool = False) -> list:
     """List all matches from events.json (matches live on live subdomain only)."""
-    root_dir = get_project_root()
-    events_path = os.path.join(root_dir, "data", "events.json")
-    if not os.path.exists(events_path):
+    store = events_store(include_archive)
+    if not store.exists():
         return []
     try:
-        with open(events_path, "r", encoding="utf-8") as f:
-            events = json.load(f)
         return [
-            f"{e['slug']}.html"
-            for e in sorted(events, key=lambda x: x.get("date", ""), reverse=True)
-            if "slug" in e
+            f"{e.slug}.html"
+            for e in sorted(store.all(), key=lambda x: x.date or "", reverse=True)
+            if e.slug
         ]
     except Exception:
         return []
 
 
-def remove_match_from_events_json(filename: str) -> bool:
-    """Remove match entry from events.json."""
-    try:
-        root_dir = get_project_root()
-        events_path = os.path.join(root_dir, "data", "events.json")
+def find_event_for_file(filename: str):
+    """Look up the events.json entry for a match page filename.
 
-        if not os.path.exists(events_path):
-            return False
+    Exact O(1) match on the canonical slug (".html", leading "/" and Unicode
+    form don't matter); a partial slug only resolves if it is unambiguous.
+    Archived matches (EVENTS_SHARDED) are found too, after the hot shards.
+    """
+    for store in _stores_for(include_archive=True):
+        event = store.resolve(filename)
+        if event is not None:
+            return event
+    return None
 
-        with open(events_path, "r", encoding="utf-8") as f:
-            events = json.load(f)
 
-        # Find and remove matching event
-        # The slug in events.json might have or not have leading slash
-        filename_without_ext = filename.replace(".html", "")
+def site_transaction() -> SiteTransaction:
+    """Batch edits to events, sitemap.xml and generated files; each written once on commit."""
+    return SiteTransaction(_stores_for(include_archive=True), get_project_root())
 
-        original_length = len(events)
-        events = [
-            event for event in events
-            if not (
-                event.get("slug", "").strip("/").endswith(filename_without_ext) or
-                event.get("slug", "") == filename or
-                event.get("slug", "") == filename_without_ext
-            )
-        ]
 
-        if len(events) == original_length:
+def remove_match_from_events_json(filename: str) -> bool:
+    """Remove match entry from events.json."""
+    try:
+        store = events_store()
+        if not store.exists():
             return False
 
-        # Write back
-        with open(events_path, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
-
-        return True
+        event = find_event_for_file(filename)
+        if event is None:
+            return False
+        with site_transaction() as tx:
+            tx.remove_event(event.slug)
+        return bool(tx.events_removed)
     except Exception as e:
         logger.error(f"Error removing from events.json: {e}", exc_info=True)
         return False
@@ -1116,26 +1426,9 @@ def remove_match_from_events_json(filename: str) -> bool:
 def add_to_events_json(json_entry: str) -> bool:
     """Add new match entry to the top of events.json."""
     try:
-        root_dir = get_project_root()
-        events_path = os.path.join(root_dir, "data", "events.json")
-
-        # Parse the new entry
+        # Parse the new entry and add it at the top
         new_event = json.loads(json_entry)
-
-        # Read existing events
-        if os.path.exists(events_path):
-            with open(events_path, "r", encoding="utf-8") as f:
-                events = json.load(f)
-        else:
-            events = []
-
-        # Add new event at the top
-        events.insert(0, new_event)
-
-        # Write back
-        with open(events_path, "w", encoding="utf-8") as f:
-            json.dump(events, f, indent=2, ensure_ascii=False)
-
+        events_store().insert(new_event, 0)
         return True
     except Exception as e:
         logger.error(f"Error adding to events.json: {e}", exc_info=True)
@@ -1145,30 +1438,9 @@ def add_to_events_json(json_entry: str) -> bool:
 def remove_from_sitemap(filename: str) -> bool:
     """Remove a match from sitemap.xml."""
     try:
-        root_dir = get_project_root()
-        sitemap_path = os.path.join(root_dir, "sitemap.xml")
-
-        if not os.path.exists(sitemap_path):
-            return False
-
-        with open(sitemap_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Pattern to match the entire URL block for this file
-        pattern = rf'    <url>\s*<loc>https://footholics\.in/{re.escape(filename)}</loc>.*?</url>\s*\n'
-
-        # Check if match exists
-        if not re.search(pattern, content, re.DOTALL):
-            return False
-
-        # Remove the URL block
-        new_content = re.sub(pattern, '', content, flags=re.DOTALL)
-
-        # Write back
-        with open(sitemap_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
-
-        return True
+        with site_transaction() as tx:
+            tx.remove_sitemap_url(f"https://footholics.in/{filename}")
+        return bool(tx.sitemap_removed)
 
     except Exception as e:
         logger.error(f"Error removing from sitemap.xml: {e}", exc_info=True)
@@ -1205,6 +1477,7 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, edi
         ],
         [
             InlineKeyboardButton("📊 Match Stats", callback_data="menu_stats"),
+            InlineKeyboardButton("🧹 Retention Sweep", callback_data="menu_retention"),
         ],
         [
             InlineKeyboardButton("✍️ Publish Article", callback_data="menu_article"),
@@ -1212,6 +1485,7 @@ async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE, edi
         ],
         [
             InlineKeyboardButton("🗑️ Delete Article", callback_data="menu_delete_article"),
+            InlineKeyboardButton("♻️ Rebuild Live Pages", callback_data="menu_rebuild_live"),
         ],
         [
             InlineKeyboardButton(creds_label, callback_data="menu_git_creds"),
@@ -1310,8 +1584,9 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await show_main_menu(update, context, edit_message=False)
         return MAIN_MENU
 
-    elif action == "delete":
-        matches = list_match_files()
+    elif action in ("delete", "delete_archive"):
+        include_archive = action == "delete_archive"
+        matches = list_match_files(include_archive)
         if not matches:
             await query.edit_message_text(
                 "🗑️ **No matches to delete!**\n\n"
@@ -1325,6 +1600,8 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         keyboard = []
         for match in matches[:10]:
             keyboard.append([InlineKeyboardButton(f"🗑️ {match}", callback_data=f"delete_{match}")])
+        if EVENTS_SHARDED and not include_archive:
+            keyboard.append([InlineKeyboardButton("🗄️ Include archived matches", callback_data="menu_delete_archive")])
         keyboard.append([InlineKeyboardButton("« Back to Menu", callback_data="menu_back")])
 
         await query.edit_message_text(
@@ -1340,8 +1617,9 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return DELETE_SELECT
 
-    elif action == "update":
-        matches = list_match_files()
+    elif action in ("update", "update_archive"):
+        include_archive = action == "update_archive"
+        matches = list_match_files(include_archive)
         if not matches:
             await query.edit_message_text(
                 "✏️ **No matches to update!**\n\n"
@@ -1355,6 +1633,8 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         keyboard = []
         for match in matches[:10]:
             keyboard.append([InlineKeyboardButton(f"✏️ {match}", callback_data=f"update_{match}")])
+        if EVENTS_SHARDED and not include_archive:
+            keyboard.append([InlineKeyboardButton("🗄️ Include archived matches", callback_data="menu_update_archive")])
         keyboard.append([InlineKeyboardButton("« Back to Menu", callback_data="menu_back")])
 
         await query.edit_message_text(
@@ -1372,18 +1652,12 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     elif action == "stats":
         matches = list_match_files()
-        root_dir = get_project_root()
 
         # Count leagues from events.json (accurate) with fallback to filename heuristics
-        league_counts = {}
-        events_path = os.path.join(root_dir, "data", "events.json")
-        if os.path.exists(events_path):
+        store = events_store()
+        if store.exists():
             try:
-                with open(events_path, "r", encoding="utf-8") as f:
-                    events_data = json.load(f)
-                for event in events_data:
-                    league_name = event.get("league", "Others")
-                    league_counts[league_name] = league_counts.get(league_name, 0) + 1
+                league_counts = store.league_counts()
             except Exception:
                 league_counts = {"All": len(matches)}
         else:
@@ -1410,6 +1684,12 @@ async def main_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await show_main_menu(update, context, edit_message=False)
         return MAIN_MENU
 
+    elif action.startswith("retention"):
+        return await retention_handler(update, context, action)
+
+    elif action.startswith("rebuild_live"):
+        return await rebuild_live_handler(update, context, action)
+
     elif action == "article":
         await query.edit_message_text(
             "✍️ *Publish Article*\n\n"
@@ -1646,7 +1926,7 @@ async def confirm_delete_handler(update: Update, context: ContextTypes.DEFAULT_T
     main_file = os.path.join(root_dir, filename)
     if os.path.exists(main_file):
         try:
-            os.remove(main_file)
+            remove_file(main_file)
             deleted_files.append(f"✓ {filename} (main site)")
         except Exception as e:
             failed_operations.append(f"✗ Main file: {str(e)}")
@@ -1657,7 +1937,8 @@ async def confirm_delete_handler(update: Update, context: ContextTypes.DEFAULT_T
         live_file = os.path.join(live_root, filename)
         if os.path.exists(live_file):
             try:
-                os.remove(live_file)
+                remove_file(live_file)
+                render_cache().forget(filename)
                 deleted_files.append("✓ Removed from live.footholics.in")
             except Exception as e:
                 failed_operations.append(f"✗ Live file: {str(e)}")
@@ -1666,36 +1947,35 @@ async def confirm_delete_handler(update: Update, context: ContextTypes.DEFAULT_T
     else:
         failed_operations.append("✗ foot-holics-live folder not found — live page NOT deleted")
 
-    # Remove from events.json
-    if remove_match_from_events_json(filename):
-        deleted_files.append("✓ Removed from events.json")
-    else:
-        failed_operations.append("✗ Could not remove from events.json (may not exist)")
-
-    # Remove from sitemap.xml
-    if remove_from_sitemap(filename):
-        deleted_files.append("✓ Removed from sitemap.xml")
-    else:
-        failed_operations.append("✗ Could not remove from sitemap.xml (may not exist)")
-
-    # Delete generated HTML
+    # events.json, sitemap.xml and generated entries: one transaction,
+    # each file read and written at most once
     gen_file = os.path.join(root_dir, "foot-holics-bot", "generated", "html_files", filename)
-    if os.path.exists(gen_file):
-        try:
-            os.remove(gen_file)
-            deleted_files.append(f"✓ Generated: {filename}")
-        except Exception as e:
-            failed_operations.append(f"✗ Generated file: {str(e)}")
-
-    # Delete JSON entry
     json_filename = filename.replace(".html", ".json")
     json_file = os.path.join(root_dir, "foot-holics-bot", "generated", "json_entries", json_filename)
-    if os.path.exists(json_file):
-        try:
-            os.remove(json_file)
+    try:
+        with site_transaction() as tx:
+            event = find_event_for_file(filename)
+            if event is not None:
+                tx.remove_event(event.slug)
+            tx.remove_sitemap_url(f"https://footholics.in/{filename}")
+            tx.delete_file(gen_file)
+            tx.delete_file(json_file)
+
+        if tx.events_removed:
+            deleted_files.append("✓ Removed from events.json")
+        else:
+            failed_operations.append("✗ Could not remove from events.json (may not exist)")
+        if tx.sitemap_removed:
+            deleted_files.append("✓ Removed from sitemap.xml")
+        else:
+            failed_operations.append("✗ Could not remove from sitemap.xml (may not exist)")
+        if os.path.abspath(gen_file) in tx.deleted:
+            deleted_files.append(f"✓ Generated: {filename}")
+        if os.path.abspath(json_file) in tx.deleted:
             deleted_files.append(f"✓ JSON: {json_filename}")
-        except Exception as e:
-            failed_operations.append(f"✗ JSON file: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error deleting match {filename}: {e}", exc_info=True)
+        failed_operations.append(f"✗ events.json / sitemap / generated files: {str(e)}")
 
     deleted_list = "\n".join(deleted_files) if deleted_files else "Nothing deleted"
     failed_list = "\n\n**Issues:**\n" + "\n".join(failed_operations) if failed_operations else ""
@@ -1742,6 +2022,173 @@ async def confirm_delete_handler(update: Update, context: ContextTypes.DEFAULT_T
     return MAIN_MENU
 
 
+RETENTION_DAY_CHOICES = (7, 14, 30, 90)
+
+
+async def retention_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, action: str) -> int:
+    """🧹 Retention Sweep: pick N days → preview → remove all older matches in one pass.
+
+    action is "retention", "retention_days_<N>" (preview) or "retention_run_<N>".
+    """
+    query = update.callback_query
+    root_dir = get_project_root()
+    live_root = get_live_project_root()
+
+    if action == "retention":
+        keyboard = [[InlineKeyboardButton(f"Older than {n} days", callback_data=f"menu_retention_days_{n}")]
+                    for n in RETENTION_DAY_CHOICES]
+        keyboard.append([InlineKeyboardButton("« Back to Menu", callback_data="menu_back")])
+        await query.edit_message_text(
+            "🧹 **Retention Sweep**\n\n"
+            "Remove every match older than N days from events.json, sitemap.xml, "
+            "the live site and generated files — one pass, one commit per repo.\n\n"
+            "Matches still marked live are kept.",
+            parse_mode="Markdown",
+            reply_markup=InlineKeyboardMarkup(keyboard)
+        )
+        return MAIN_MENU
+
+    days = int(action.rsplit("_", 1)[1])
+    stores = _stores_for(include_archive=True)
+
+    if action.startswith("retention_days_"):
+        expired = retention.expired_events(stores, days)
+        if not expired:
+            await query.edit_message_text(f"✅ No matches older than {days} days.")
+            await show_main_menu(update, context, edit_message=False)
+            return MAIN_MENU
+        preview = "\n".join(f"• `{ev.slug}.html`" for ev in expired[:15])
+        if len(expired) > 15:
+            preview += f"\n\n_...and {len(expired) - 15} more_"
+        keyboard = [[
+            InlineKeyboardButton(f"✅ Remove {len(expired)}", callback_data=f"menu_retention_run_{days}"),
+            InlineKeyboardButton("❌ Cancel", callback_data="menu_back"),
+        ]]
+        await query.edit_message_text(
+            f"⚠️ **{len(expired)} matches older than {days} days**\n\n{preview}\n\n"
+            f"**This cannot be undone!**",
+            parse_mode="Markdown",
+            reply_markup=InlineKeyboardMarkup(keyboard)
+        )
+        return MAIN_MENU
+
+    await query.edit_message_text(f"⏳ Removing matches older than {days} days…")
+    try:
+        expired, tx = await asyncio.to_thread(retention.sweep, stores, root_dir, live_root, days)
+    except Exception as e:
+        logger.error(f"Retention sweep failed: {e}", exc_info=True)
+        await query.edit_message_text(f"❌ Retention sweep failed: {e}")
+        await show_main_menu(update, context, edit_message=False)
+        return MAIN_MENU
+    if tx is None:
+        await query.edit_message_text(f"✅ No matches older than {days} days.")
+        await show_main_menu(update, context, edit_message=False)
+        return MAIN_MENU
+
+    live_pages = [p for p in tx.deleted if live_root and p.startswith(os.path.join(live_root, ""))]
+    render_cache().forget(*(os.path.basename(p) for p in live_pages))
+    live_deleted = len(live_pages)
+    summary = (
+        f"🧹 **Retention Sweep Complete**\n\n"
+        f"✓ {len(tx.events_removed)} events removed\n"
+        f"✓ {len(tx.sitemap_removed)} sitemap URLs removed\n"
+        f"✓ {len(tx.deleted) - live_deleted} files deleted (main site / generated)\n"
+        f"✓ {live_deleted} live pages deleted"
+        + ("" if live_root else "\n✗ foot-holics-live folder not found — live pages NOT deleted")
+    )
+
+    commit_msg = f"Retention: remove {len(expired)} matches older than {days} days"
+    git_user = context.user_data.get('git_username', '')
+    git_token = context.user_data.get('git_token', '')
+    main_ok, main_status = await asyncio.to_thread(git_auto_push, root_dir, commit_msg, git_user, git_token)
+    live_ok, live_status = await asyncio.to_thread(git_auto_push, live_root, commit_msg, git_user, git_token)
+    set_pending_push(context,
+        [(root_dir, commit_msg), (live_root, commit_msg)],
+        [(main_ok, main_status), (live_ok, live_status)]
+    )
+    push_line = push_summary(
+        ("foot-holics", main_ok, main_status),
+        ("foot-holics-live", live_ok, live_status),
+    )
+    try:
+        await query.edit_message_text(f"{summary}\n\n{push_line}", parse_mode="Markdown")
+    except Exception:
+        await query.edit_message_text(f"{summary}\n\n{push_line}".replace("*", "").replace("`", "").replace("_", ""))
+
+    await show_main_menu(update, context, edit_message=False)
+    return MAIN_MENU
+
+
+async def rebuild_live_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, action: str) -> int:
+    """♻️ Rebuild Live Pages: re-render every match's live page in parallel, one commit.
+
+    action is "rebuild_live" (choose), "rebuild_live_run" (stale pages only)
+    or "rebuild_live_force" (every page).
+    """
+    query = update.callback_query
+    live_root = get_live_project_root()
+
+    if action == "rebuild_live":
+        if not live_root:
+            await query.edit_message_text("❌ foot-holics-live folder not found — nothing to rebuild.")
+            await show_main_menu(update, context, edit_message=False)
+            return MAIN_MENU
+        keyboard = [
+            [InlineKeyboardButton("♻️ Stale pages only", callback_data="menu_rebuild_live_run")],
+            [InlineKeyboardButton("🔁 Every page", callback_data="menu_rebuild_live_force")],
+            [InlineKeyboardButton("« Back to Menu", callback_data="menu_back")],
+        ]
+        await query.edit_message_text(
+            "♻️ **Rebuild Live Pages**\n\n"
+            "Re-render the live.footholics.in page of every match from events.json "
+            "and commit the pages that changed in one go.\n\n"
+            "_Stale pages only_ skips pages whose inputs and template are unchanged.",
+            parse_mode="Markdown",
+            reply_markup=InlineKeyboardMarkup(keyboard)
+        )
+        return MAIN_MENU
+
+    await query.edit_message_text("⏳ Rebuilding live pages…")
+    try:
+        result = await asyncio.to_thread(rebuild_live_pages, action == "rebuild_live_force")
+    except Exception as e:
+        logger.error(f"Live page rebuild failed: {e}", exc_info=True)
+        await query.edit_message_text(f"❌ Live page rebuild failed: {e}")
+        await show_main_menu(update, context, edit_message=False)
+        return MAIN_MENU
+    if result is None:
+        await query.edit_message_text("❌ foot-holics-live folder not found — nothing to rebuild.")
+        await show_main_menu(update, context, edit_message=False)
+        return MAIN_MENU
+
+    summary = (
+        f"♻️ **Live Pages Rebuilt**\n\n"
+        f"✓ {result.pages} matches, {result.skipped} already up to date\n"
+        f"✓ {result.rendered} rendered on {result.workers} worker(s)\n"
+        f"✓ {len(result.written)} pages changed, {result.unchanged} identical\n"
+        f"⏱️ {result.seconds:.2f}s — {result.pages_per_sec:,.0f} pages/sec"
+        + (f"\n✗ {len(result.failed)} failed (see bot.log)" if result.failed else "")
+    )
+    if not result.written:
+        await query.edit_message_text(summary, parse_mode="Markdown")
+        await show_main_menu(update, context, edit_message=False)
+        return MAIN_MENU
+
+    commit_msg = f"Rebuild {len(result.written)} live pages"
+    git_user = context.user_data.get('git_username', '')
+    git_token = context.user_data.get('git_token', '')
+    live_ok, live_status = await asyncio.to_thread(git_auto_push, live_root, commit_msg, git_user, git_token)
+    set_pending_push(context, [(live_root, commit_msg)], [(live_ok, live_status)])
+    push_line = push_summary(("foot-holics-live", live_ok, live_status))
+    try:
+        await query.edit_message_text(f"{summary}\n\n{push_line}", parse_mode="Markdown")
+    except Exception:
+        await query.edit_message_text(f"{summary}\n\n{push_line}".replace("*", "").replace("`", "").replace("_", ""))
+
+    await show_main_menu(update, context, edit_message=False)
+    return MAIN_MENU
+
+
 async def update_match_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handle match update selection."""
     query = update.callback_query
@@ -1754,17 +2201,7 @@ async def update_match_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     context.user_data["update_filename"] = filename
 
     # Read current match data from events.json
-    root_dir = get_project_root()
-    events_path = os.path.join(root_dir, "data", "events.json")
-    event = None
-    if os.path.exists(events_path):
-        with open(events_path, "r", encoding="utf-8") as f:
-            events_data = json.load(f)
-        fn_no_ext = filename.replace(".html", "")
-        for e in events_data:
-            if fn_no_ext in e.get("slug", ""):
-                event = e
-                break
+    event = find_event_for_file(filename)
 
     if not event:
         await query.edit_message_text(
@@ -1774,14 +2211,14 @@ async def update_match_handler(update: Update, context: ContextTypes.DEFAULT_TYP
         await show_main_menu(update, context, edit_message=False)
         return MAIN_MENU
 
-    # Load current values from event dict
-    context.user_data["current_title"] = event.get("title", "")
-    context.user_data["current_league"] = event.get("league", "Football")
-    context.user_data["current_league_slug"] = event.get("leagueSlug", "others")
-    context.user_data["current_date"] = event.get("date", "")
-    context.user_data["current_time"] = event.get("time", "")
-    context.user_data["current_stadium"] = event.get("stadium", "")
-    context.user_data["current_preview"] = event.get("excerpt", "")
+    # Load current values from the event
+    context.user_data["current_title"] = event.title or ""
+    context.user_data["current_league"] = event.league or "Football"
+    context.user_data["current_league_slug"] = event.league_slug or "others"
+    context.user_data["current_date"] = event.date or ""
+    context.user_data["current_time"] = event.time or ""
+    context.user_data["current_stadium"] = event.stadium or ""
+    context.user_data["current_preview"] = event.excerpt or ""
 
     # Decode raw stream URLs from broadcast entries into a COMPACT list
     # (no "#" placeholders) so links stay gapless — deleting one renumbers
@@ -1789,8 +2226,8 @@ async def update_match_handler(update: Update, context: ContextTypes.DEFAULT_TYP
     # name/channel/language stored in the broadcast "name" field.
     stream_links = []
     stream_labels = []
-    for bc in event.get("broadcast", [])[:MAX_STREAM_LINKS]:
-        bc_url = bc.get("url", "#")
+    for bc in (event.broadcast or [])[:MAX_STREAM_LINKS]:
+        bc_url = bc.url
         if not bc_url or bc_url == "#":
             continue
         if "player.html?get=" in bc_url:
@@ -1800,7 +2237,7 @@ async def update_match_handler(update: Update, context: ContextTypes.DEFAULT_TYP
             stream_links.append(_dec)
         else:
             stream_links.append(bc_url)
-        _name = bc.get("name", "")
+        _name = bc.name
         stream_labels.append("" if _DEFAULT_STREAM_NAME.match(_name or "") else _name)
     context.user_data["current_stream_links"] = stream_links
     context.user_data["current_stream_labels"] = stream_labels
@@ -2383,99 +2820,44 @@ async def save_match_updates(update: Update, context: ContextTypes.DEFAULT_TYPE)
         #  on the live subdomain, regenerated below via generate_live_html.)
 
         # Update events.json
-        events_path = os.path.join(root_dir, "data", "events.json")
-        if os.path.exists(events_path):
-            with open(events_path, "r", encoding="utf-8") as f:
-                events = json.load(f)
-
-            filename_without_ext = filename.replace(".html", "")
-            for event in events:
-                if filename_without_ext in event.get("slug", ""):
-                    if "current_title" in context.user_data:
-                        event["title"] = context.user_data["current_title"]
-                    if "current_league" in context.user_data:
-                        event["league"] = context.user_data["current_league"]
-                        event["leagueSlug"] = context.user_data.get("current_league_slug", "others")
-                    if "current_stadium" in context.user_data:
-                        event["stadium"] = context.user_data["current_stadium"]
-                    if "current_stream_links" in context.user_data:
-                        # Update all streaming links (wrap m3u8 with proxy);
-                        # custom labels ride along in the broadcast "name" field.
-                        stream_links = context.user_data["current_stream_links"]
-                        stream_labels = context.user_data.get("current_stream_labels", [])
-                        event["broadcast"] = build_broadcast(stream_links, stream_labels)
-                        event["streams"] = len([url for url in stream_links if url and url != "#" and not url.startswith("https://t.me/")])
-                    break
-
-            with open(events_path, "w", encoding="utf-8") as f:
-                json.dump(events, f, indent=2, ensure_ascii=False)
-
-            # Also update the generated JSON entry file if it exists
+        _updated_ev = None
+        event = find_event_for_file(filename)
+        if event is not None:
+            fields = {}
+            if "current_title" in context.user_data:
+                fields["title"] = context.user_data["current_title"]
+            if "current_league" in context.user_data:
+                fields["league"] = context.user_data["current_league"]
+                fields["leagueSlug"] = context.user_data.get("current_league_slug", "others")
+            if "current_stadium" in context.user_data:
+                fields["stadium"] = context.user_data["current_stadium"]
+            if "current_stream_links" in context.user_data:
+                # Update all streaming links (wrap m3u8 with proxy);
+                # custom labels ride along in the broadcast "name" field.
+                stream_links = context.user_data["current_stream_links"]
+                stream_labels = context.user_data.get("current_stream_labels", [])
+                fields["broadcast"] = build_broadcast(stream_links, stream_labels)
+                fields["streams"] = len([url for url in stream_links if url and url != "#" and not url.startswith("https://t.me/")])
+            # All field changes + the generated JSON entry: one transaction,
+            # so events.json is written once however many fields changed
             filename_without_ext = filename.replace(".html", "")
             gen_json_file = os.path.join(root_dir, "foot-holics-bot", "generated", "json_entries", f"{filename_without_ext}.json")
-            if os.path.exists(gen_json_file):
-                # Find the updated event data
-                for event in events:
-                    if filename_without_ext in event.get("slug", ""):
-                        with open(gen_json_file, "w", encoding="utf-8") as f:
-                            json.dump(event, f, indent=2, ensure_ascii=False)
-                        break
+            with site_transaction() as tx:
+                tx.update_event(event.slug, fields)
+                if os.path.exists(gen_json_file):
+                    tx.write_json(gen_json_file, lambda: tx.events_updated.get(event.slug))
+            _updated_ev = tx.events_updated.get(event.slug)
 
         # Regenerate live subdomain page with updated data
         _live_updated = False
         try:
-            import datetime as _dt
-            _fn_no_ext = filename.replace(".html", "")
-            _updated_ev = None
-            for _ev in events:
-                if _fn_no_ext in _ev.get("slug", ""):
-                    _updated_ev = _ev
-                    break
             if _updated_ev:
-                # Decode raw stream URLs + custom labels from broadcast entries
-                _raw_streams = []
-                _raw_labels = []
-                for _bc in _updated_ev.get("broadcast", []):
-                    _bc_url = _bc.get("url", "#")
-                    if not _bc_url or _bc_url == "#":
-                        _raw_streams.append("#")
-                    elif "player.html?get=" in _bc_url:
-                        _dec = decode_player_url(_bc_url)  # recovers URL + DRM key
-                        _raw_streams.append(_dec if _dec else "#")
-                    else:
-                        _raw_streams.append(_bc_url)
-                    _nm = _bc.get("name", "")
-                    _raw_labels.append("" if _DEFAULT_STREAM_NAME.match(_nm or "") else _nm)
+                _live_data = live_page_data(_updated_ev)
                 # If stream links were explicitly updated this session, prefer those
                 if "current_stream_links" in context.user_data:
-                    _raw_streams = list(context.user_data["current_stream_links"])
-                    _raw_labels = list(context.user_data.get("current_stream_labels", []))
-                _date_str = _updated_ev.get("date", "")
-                _time_str = _updated_ev.get("time", "00:00")
-                try:
-                    _dt_obj = _dt.datetime.strptime(f"{_date_str} {_time_str}", "%Y-%m-%d %H:%M")
-                except Exception:
-                    _dt_obj = _dt.datetime.now()
-                _home = _updated_ev.get("homeTeam", "")
-                _away = _updated_ev.get("awayTeam", "")
-                _live_data = {
-                    "datetime_obj": _dt_obj,
-                    "home_team": _home,
-                    "away_team": _away,
-                    "league": _updated_ev.get("league", "Football"),
-                    "league_slug": _updated_ev.get("leagueSlug", "others"),
-                    "date": _date_str,
-                    "time": _time_str,
-                    "stadium": _updated_ev.get("stadium", ""),
-                    "match_name": _updated_ev.get("title", f"{_home} vs {_away}"),
-                    "thumbnail": _updated_ev.get("poster", ""),
-                    "stream_urls": _raw_streams,
-                    "stream_labels": _raw_labels,
-                    "image_file": "og-image.jpg",
-                    "preview": _updated_ev.get("excerpt", ""),
-                }
-                _live_html = generate_live_html(_live_data)
-                _live_updated = copy_html_to_live(filename, _live_html)
+                    _live_data["stream_urls"] = list(context.user_data["current_stream_links"])
+                    _live_data["stream_labels"] = list(context.user_data.get("current_stream_labels", []))
+                _live_updated = write_live_page(filename, _live_data)
         except Exception as _le:
             logger.warning(f"Could not regenerate live page: {_le}")
 
@@ -2813,7 +3195,7 @@ async def poster_image(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
             img_dir = os.path.join(project_root, "assets", "img")
             os.makedirs(img_dir, exist_ok=True)
             save_path = os.path.join(img_dir, image_file)
-            await tg_file.download_to_drive(save_path)
+            await save_telegram_file(tg_file, save_path)
             poster_saved = True
             await update.message.reply_text(
                 f"✅ Poster saved as `assets/img/{image_file}`",
@@ -2854,11 +3236,8 @@ async def poster_image(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         os.makedirs(gen_html, exist_ok=True)
         os.makedirs(gen_json, exist_ok=True)
 
-        with open(os.path.join(gen_html, f"{filename_base}.html"), "w", encoding="utf-8") as f:
-            f.write(live_html_code)
-
-        with open(os.path.join(gen_json, f"{filename_base}.json"), "w", encoding="utf-8") as f:
-            f.write(json_code)
+        atomic_write_text(os.path.join(gen_html, f"{filename_base}.html"), live_html_code)
+        atomic_write_text(os.path.join(gen_json, f"{filename_base}.json"), json_code)
 
         # AUTO-INTEGRATE: Copy files and update index/events
         await update.message.reply_text("⏳ Auto-integrating into your website... Please wait.")
@@ -2875,6 +3254,7 @@ async def poster_image(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
         # 2. Copy live subdomain page (matches live on live.footholics.in only)
         if copy_html_to_live(html_filename, live_html_code):
+            render_cache().store(html_filename, live_page_fingerprint(context.user_data))
             integration_results.append("✅ Live page copied to foot-holics-live/")
         else:
             integration_results.append("⚠️ Could not copy live page (foot-holics-live/ not found)")
@@ -2906,27 +3286,27 @@ def generate_json(data: Dict[str, Any]) -> str:
     home_logo_abs = f"https://footholics.in/{home_logo_rel.lstrip('/')}" if home_logo_rel else ""
     away_logo_abs = f"https://footholics.in/{away_logo_rel.lstrip('/')}" if away_logo_rel else ""
 
-    event_data = {
-        "id": generate_event_id(),
-        "date": data["date"],
-        "time": data["time"],
-        "slug": slug,
-        "title": data["match_name"],
-        "homeTeam": data["home_team"],
-        "awayTeam": data["away_team"],
-        "homeLogo": home_logo_abs,
-        "awayLogo": away_logo_abs,
-        "league": data["league"],
-        "leagueSlug": data["league_slug"],
-        "stadium": data["stadium"],
-        "poster": f"assets/img/{data['image_file']}",
-        "excerpt": excerpt,
-        "status": "upcoming",
-        "broadcast": build_broadcast(data["stream_urls"], data.get("stream_labels")),
-        "streams": len([url for url in data["stream_urls"] if url and url != "#" and not url.startswith("https://t.me/")])
-    }
+    event = Event(
+        id=generate_event_id(),
+        date=data["date"],
+        time=data["time"],
+        slug=slug,
+        title=data["match_name"],
+        home_team=data["home_team"],
+        away_team=data["away_team"],
+        home_logo=home_logo_abs,
+        away_logo=away_logo_abs,
+        league=data["league"],
+        league_slug=data["league_slug"],
+        stadium=data["stadium"],
+        poster=f"assets/img/{data['image_file']}",
+        excerpt=excerpt,
+        status="upcoming",
+        broadcast=build_broadcast(data["stream_urls"], data.get("stream_labels")),
+        streams=len([url for url in data["stream_urls"] if url and url != "#" and not url.startswith("https://t.me/")]),
+    )
 
-    return json.dumps(event_data, indent=2)
+    return json.dumps(event.to_dict(), indent=2)
 
 
 async def send_generated_files(
@@ -3438,7 +3818,7 @@ async def article_cover_image_handler(update: Update, context: ContextTypes.DEFA
             img_dir = os.path.join(root_dir, "assets", "img", "articles")
             os.makedirs(img_dir, exist_ok=True)
             save_path = os.path.join(img_dir, img_filename)
-            await tg_file.download_to_drive(save_path)
+            await save_telegram_file(tg_file, save_path)
 
             cover_image_url = f"https://footholics.in/assets/img/articles/{img_filename}"
             await update.message.reply_text(
@@ -3497,7 +3877,7 @@ async def article_content_handler(update: Update, context: ContextTypes.DEFAULT_
             root_dir = get_project_root()
             img_dir  = os.path.join(root_dir, "assets", "img", "articles")
             os.makedirs(img_dir, exist_ok=True)
-            await tg_file.download_to_drive(os.path.join(img_dir, img_filename))
+            await save_telegram_file(tg_file, os.path.join(img_dir, img_filename))
 
             img_url = f"https://footholics.in/assets/img/articles/{img_filename}"
             caption = (update.message.caption or "").strip()
@@ -3601,8 +3981,7 @@ async def article_confirm_handler(update: Update, context: ContextTypes.DEFAULT_
         articles_dir = os.path.join(root_dir, "articles")
         os.makedirs(articles_dir, exist_ok=True)
         html_path = os.path.join(articles_dir, f"{slug}.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        atomic_write_text(html_path, html_content)
 
         # Save source meta JSON (enables editing later)
         meta_dir = os.path.join(articles_dir, "meta")
@@ -3616,66 +3995,30 @@ async def article_confirm_handler(update: Update, context: ContextTypes.DEFAULT_
             "cover_image": cover_image,
             "date": date_str,
         }
-        with open(os.path.join(meta_dir, f"{slug}.json"), "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
-
-        # Update articles/index.json
-        index_path = os.path.join(articles_dir, "index.json")
-        if os.path.exists(index_path):
-            with open(index_path, "r", encoding="utf-8") as f:
-                articles = json.load(f)
-        else:
-            articles = []
-
-        index_image = cover_image if cover_image else "https://footholics.in/assets/img/og-image.jpg"
-        new_entry = {
-            "slug": slug,
-            "title": title,
-            "excerpt": excerpt,
-            "image": index_image,
-            "date": date_str,
-            "author": "OnixWhite",
-            "category": category,
-            "url": f"/articles/{slug}.html",
-        }
-        articles.insert(0, new_entry)
-        with open(index_path, "w", encoding="utf-8") as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
-
-        # Update sitemap.xml
-        sitemap_path = os.path.join(root_dir, "sitemap.xml")
-        if os.path.exists(sitemap_path):
-            with open(sitemap_path, "r", encoding="utf-8") as f:
-                sitemap = f.read()
-            new_url_entry = (
-                f"    <url>\n"
-                f"        <loc>https://footholics.in/articles/{slug}.html</loc>\n"
-                f"        <lastmod>{date_str}</lastmod>\n"
-                f"        <changefreq>weekly</changefreq>\n"
-                f"        <priority>0.8</priority>\n"
-                f"    </url>\n\n"
-            )
-            # Bump lastmod on homepage and articles listing
-            sitemap = re.sub(
-                r'(<loc>https://footholics\.in/</loc>\s*\n\s*<lastmod>)[^<]+(</lastmod>)',
-                rf'\g<1>{date_str}\g<2>',
-                sitemap
-            )
-            sitemap = re.sub(
-                r'(<loc>https://footholics\.in/articles/index\.html</loc>\s*\n\s*<lastmod>)[^<]+(</lastmod>)',
-                rf'\g<1>{date_str}\g<2>',
-                sitemap
-            )
-            # Insert new article immediately after articles/index.html entry (newest first)
-            sitemap = re.sub(
-                r'(<loc>https://footholics\.in/articles/index\.html</loc>.*?</url>\s*\n)',
-                lambda m: m.group(0) + "\n" + new_url_entry,
-                sitemap,
-                count=1,
-                flags=re.DOTALL
-            )
-            with open(sitemap_path, "w", encoding="utf-8") as f:
-                f.write(sitemap)
+        atomic_write_json(os.path.join(meta_dir, f"{slug}.json"), meta)
+
+        # index.json + sitemap.xml are read-modify-written: hold the shared lock
+        with artifact_lock():
+            # Update articles/index.json
+            index_image = cover_image if cover_image else "https://footholics.in/assets/img/og-image.jpg"
+            new_entry = {
+                "slug": slug,
+                "title": title,
+                "excerpt": excerpt,
+                "image": index_image,
+                "date": date_str,
+                "author": "OnixWhite",
+                "category": category,
+                "url": f"/articles/{slug}.html",
+            }
+            add_article_entry(new_entry)
+
+            # Update sitemap.xml: add the article, bump the homepage and articles listing
+            with site_transaction() as tx:
+                tx.upsert_sitemap_url(f"https://footholics.in/articles/{slug}.html", lastmod=date_str,
+                                      changefreq="weekly", priority="0.8")
+                tx.bump_sitemap_lastmod("https://footholics.in/", date_str)
+                tx.bump_sitemap_lastmod("https://footholics.in/articles/index.html", date_str)
 
         cover_line = f"\n• assets/img/articles/{slug}-cover (uploaded)" if cover_image else ""
         git_user = context.user_data.get('git_username', '')
@@ -3721,16 +4064,13 @@ async def edit_article_start(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     root_dir = get_project_root()
     articles_dir = os.path.join(root_dir, "articles")
-    index_path = os.path.join(articles_dir, "index.json")
 
-    if not os.path.exists(index_path):
+    articles = load_articles_index()
+    if articles is None:
         await query.edit_message_text("❌ No articles found.")
         await show_main_menu(update, context, edit_message=False)
         return MAIN_MENU
 
-    with open(index_path, "r", encoding="utf-8") as f:
-        articles = json.load(f)
-
     meta_dir = os.path.join(articles_dir, "meta")
 
     # Only show articles that have a meta file (bot-published)
@@ -3963,7 +4303,7 @@ async def edit_article_input_handler(update: Update, context: ContextTypes.DEFAU
                 root_dir = get_project_root()
                 img_dir  = os.path.join(root_dir, "assets", "img", "articles")
                 os.makedirs(img_dir, exist_ok=True)
-                await tg_file.download_to_drive(os.path.join(img_dir, fname))
+                await save_telegram_file(tg_file, os.path.join(img_dir, fname))
                 caption  = (update.message.caption or "").strip()
                 new_block = f"![{caption}](https://footholics.in/assets/img/articles/{fname})"
                 await update.message.reply_text(f"✅ Image saved: `assets/img/articles/{fname}`", parse_mode="Markdown")
@@ -4018,7 +4358,7 @@ async def edit_article_input_handler(update: Update, context: ContextTypes.DEFAU
                 root_dir = get_project_root()
                 img_dir = os.path.join(root_dir, "assets", "img", "articles")
                 os.makedirs(img_dir, exist_ok=True)
-                await tg_file.download_to_drive(os.path.join(img_dir, img_filename))
+                await save_telegram_file(tg_file, os.path.join(img_dir, img_filename))
                 new_value = f"https://footholics.in/assets/img/articles/{img_filename}"
                 await update.message.reply_text(f"✅ Image saved as `assets/img/articles/{img_filename}`", parse_mode="Markdown")
             except Exception as e:
@@ -4129,31 +4469,16 @@ async def edit_article_confirm_handler(update: Update, context: ContextTypes.DEF
             date=meta["date"],
             cover_image=meta.get("cover_image"),
         )
-        with open(os.path.join(articles_dir, f"{slug}.html"), "w", encoding="utf-8") as f:
-            f.write(html_content)
+        atomic_write_text(os.path.join(articles_dir, f"{slug}.html"), html_content)
 
         # Save updated meta JSON
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+        atomic_write_json(meta_path, meta)
 
         # Update articles/index.json entry
-        index_path = os.path.join(articles_dir, "index.json")
-        if os.path.exists(index_path):
-            with open(index_path, "r", encoding="utf-8") as f:
-                articles = json.load(f)
-            for entry in articles:
-                if entry["slug"] == slug:
-                    if field == "title":
-                        entry["title"] = new_value
-                    elif field == "excerpt":
-                        entry["excerpt"] = new_value
-                    elif field == "category":
-                        entry["category"] = new_value
-                    elif field == "cover_image":
-                        entry["image"] = new_value if new_value else "https://footholics.in/assets/img/og-image.jpg"
-                    break
-            with open(index_path, "w", encoding="utf-8") as f:
-                json.dump(articles, f, indent=2, ensure_ascii=False)
+        if field in ("title", "excerpt", "category"):
+            update_article_entry(slug, {field: new_value})
+        elif field == "cover_image":
+            update_article_entry(slug, {"image": new_value if new_value else "https://footholics.in/assets/img/og-image.jpg"})
 
         git_user = context.user_data.get('git_username', '')
         git_token = context.user_data.get('git_token', '')
@@ -4188,17 +4513,13 @@ async def edit_article_confirm_handler(update: Update, context: ContextTypes.DEF
 async def delete_article_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Show all published articles for deletion selection."""
     query = update.callback_query
-    root_dir = get_project_root()
-    index_path = os.path.join(root_dir, "articles", "index.json")
 
-    if not os.path.exists(index_path):
+    articles = load_articles_index()
+    if articles is None:
         await query.edit_message_text("❌ No articles found.")
         await show_main_menu(update, context, edit_message=False)
         return MAIN_MENU
 
-    with open(index_path, "r", encoding="utf-8") as f:
-        articles = json.load(f)
-
     if not articles:
         await query.edit_message_text("❌ No articles to delete.")
         await show_main_menu(update, context, edit_message=False)
@@ -4283,40 +4604,25 @@ async def delete_article_confirm_handler(update: Update, context: ContextTypes.D
         # 1. Delete HTML file
         html_path = os.path.join(articles_dir, f"{slug}.html")
         if os.path.exists(html_path):
-            os.remove(html_path)
+            remove_file(html_path)
             removed.append(f"articles/{slug}.html")
 
         # 2. Delete meta JSON
         meta_path = os.path.join(articles_dir, "meta", f"{slug}.json")
         if os.path.exists(meta_path):
-            os.remove(meta_path)
+            remove_file(meta_path)
             removed.append(f"articles/meta/{slug}.json")
 
         # 3. Remove from index.json
-        index_path = os.path.join(articles_dir, "index.json")
-        if os.path.exists(index_path):
-            with open(index_path, "r", encoding="utf-8") as f:
-                articles = json.load(f)
-            articles = [a for a in articles if a["slug"] != slug]
-            with open(index_path, "w", encoding="utf-8") as f:
-                json.dump(articles, f, indent=2, ensure_ascii=False)
-            removed.append("articles/index.json")
-
-        # 4. Remove from sitemap.xml
-        sitemap_path = os.path.join(root_dir, "sitemap.xml")
-        if os.path.exists(sitemap_path):
-            with open(sitemap_path, "r", encoding="utf-8") as f:
-                sitemap = f.read()
-            # Remove the <url> block for this article
-            sitemap = re.sub(
-                r'\n\s*<url>\s*\n\s*<loc>https://footholics\.in/articles/' + re.escape(slug) + r'\.html</loc>.*?</url>',
-                '',
-                sitemap,
-                flags=re.DOTALL
-            )
-            with open(sitemap_path, "w", encoding="utf-8") as f:
-                f.write(sitemap)
-            removed.append("sitemap.xml")
+        with artifact_lock():
+            if remove_article_entry(slug):
+                removed.append("articles/index.json")
+
+            # 4. Remove from sitemap.xml
+            with site_transaction() as tx:
+                tx.remove_sitemap_url(f"https://footholics.in/articles/{slug}.html")
+            if tx.sitemap_removed:
+                removed.append("sitemap.xml")
 
         removed_list = "\n".join(f"• {r}" for r in removed)
         git_user = context.user_data.get('git_username', '')
@@ -4345,6 +4651,126 @@ async def delete_article_confirm_handler(update: Update, context: ContextTypes.D
     return MAIN_MENU
 
 
+async def _compact_events_periodically() -> None:
+    """Background loop: fold the events journal / rotate the archive every few minutes."""
+    while True:
+        await asyncio.sleep(JOURNAL_COMPACT_INTERVAL)
+        try:
+            if await asyncio.to_thread(events_store().compact):
+                logger.info("Compacted event storage (journal folded / matches archived)")
+        except Exception as e:
+            logger.error(f"Event storage compaction failed: {e}", exc_info=True)
+
+
+# ── Match status engine ───────────────────────────────────────────────────────
+
+_STATUS_RANK = {"upcoming": 0, "live": 1, "finished": 2}
+
+
+def kickoff_ist(event):
+    """Kickoff as an aware IST datetime, or None if date/time don't parse."""
+    try:
+        return datetime.strptime(f"{event.date} {event.time}", "%Y-%m-%d %H:%M").replace(tzinfo=IST)
+    except (TypeError, ValueError):
+        return None
+
+
+class StatusSchedule:
+    """Min-heap of pending (when, slug, status) transitions.
+
+    Rebuilt only when the EventStore's contents change (new match, edited
+    kickoff, …); otherwise each tick just pops what is due.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._generation = None
+
+    def sync(self, store) -> None:
+        len(store)                  # reload if events.json changed on disk
+        if store.generation == self._generation:
+            return
+        heap = []
+        for ev in store.all():
+            rank = _STATUS_RANK.get((ev.status or "").lower())
+            kickoff = kickoff_ist(ev)
+            if rank is None or kickoff is None:
+                continue            # hand-set statuses (e.g. "postponed") are left alone
+            if rank < 1:
+                heap.append((kickoff, ev.slug, "live"))
+            if rank < 2:
+                heap.append((kickoff + timedelta(minutes=MATCH_LIVE_MINUTES), ev.slug, "finished"))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._generation = store.generation
+
+    def pop_due(self, now) -> dict:
+        """{slug: status} for every transition due by `now` (a later one wins)."""
+        due = {}
+        while self._heap and self._heap[0][0] <= now:
+            _, slug, status = heapq.heappop(self._heap)
+            due[slug] = status
+        return due
+
+    def invalidate(self) -> None:
+        self._generation = None
+
+
+def apply_due_statuses(schedule: StatusSchedule) -> dict:
+    """Flip every status due now in one events write. Returns {slug: new status}."""
+    store = events_store()
+    schedule.sync(store)
+    due = schedule.pop_due(datetime.now(IST))
+    if not due:
+        return {}
+    changed = {}
+    try:
+        with store.batch():
+            for slug, status in due.items():
+                ev = store.get_by_slug(slug)
+                current = _STATUS_RANK.get(((ev.status if ev else None) or "").lower())
+                if current is None or current >= _STATUS_RANK[status]:
+                    continue        # gone, hand-edited, or already there — never move back
+                store.update(slug, {"status": status})
+                changed[slug] = status
+    except Exception:
+        schedule.invalidate()       # re-derive the popped transitions next tick
+        raise
+    return changed
+
+
+async def update_match_statuses(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """JobQueue tick: apply due status transitions, then make one commit for all of them."""
+    schedule = context.bot_data.setdefault("status_schedule", StatusSchedule())
+    try:
+        changed = await asyncio.to_thread(apply_due_statuses, schedule)
+    except Exception as e:
+        logger.error(f"Match status update failed: {e}", exc_info=True)
+        return
+    if not changed:
+        return
+    summary = ", ".join(f"{slug} → {status}" for slug, status in changed.items())
+    logger.info(f"Match status: {summary}")
+    commit_msg = f"Match status: {summary}" if len(changed) <= 3 else f"Match status: {len(changed)} matches updated"
+    # Never a user's stored token: nobody asked for this push
+    ok, status = await asyncio.to_thread(
+        git_auto_push, get_project_root(), commit_msg, BACKGROUND_GIT_USERNAME, BACKGROUND_GIT_TOKEN)
+    if not ok and not status.startswith("committed locally"):     # local-only is expected without them
+        logger.warning(f"Match status push: {status}")
+
+
+async def _post_init(application: Application) -> None:
+    try:
+        await asyncio.to_thread(rebuild_event_views)
+    except Exception as e:
+        logger.error(f"Rebuilding event views failed: {e}", exc_info=True)
+    await asyncio.to_thread(sync_article_pages)
+    if (EVENTS_JOURNAL or EVENTS_SHARDED) and not storage_db():
+        # Replay anything left over from a crash, then keep compacting on a timer
+        await asyncio.to_thread(events_store().compact)
+        application.bot_data["compact_task"] = asyncio.create_task(_compact_events_periodically())
+
+
 def main() -> None:
     """Start the bot."""
     # Get token from environment
@@ -4354,8 +4780,20 @@ def main() -> None:
         logger.critical("TELEGRAM_BOT_TOKEN not set. Create a .env file with your bot token.")
         return
 
+    if PRECOMPRESS:
+        start_precompressor()
+    if ASSET_MANIFEST:
+        start_asset_manifests()
+
     # Create application
-    application = Application.builder().token(token).build()
+    application = Application.builder().token(token).post_init(_post_init).build()
+
+    if STATUS_ENGINE:
+        if application.job_queue is None:
+            logger.warning('Match status engine needs python-telegram-bot[job-queue] — statuses won\'t update')
+        else:
+            application.job_queue.run_repeating(
+                update_match_statuses, interval=STATUS_TICK_SECONDS, first=5, name="match_status")
 
     # Define conversation handler
     conv_handler = ConversationHandler(
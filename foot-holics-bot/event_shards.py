@@ -0,0 +1,201 @@
+"""
+Month-sharded event storage with an archive tier (EVENTS_SHARDED=1).
+
+events.json keeps every fixture ever added, so every reader pays for the whole
+history. In sharded mode the registry lives in one small file per month, and
+matches that are long over move to an archive tier nobody reads by default:
+
+    data/events/manifest.json           which shards exist, per tier, + counts
+    data/events/2026-06.json            hot matches dated June 2026
+    data/events/archive/2026-03.json    archived matches dated March 2026
+
+A write only rewrites the month shard(s) it touched plus their manifest
+entries: the manifest is re-read under artifact_lock and merged, because the
+hot and the archive view are separate backends that may both write in one
+transaction (retention sweep, SiteTransaction over both). events.json is only
+re-exported when a hot shard changed.
+data/events.json is still exported, holding the hot tier only, because the
+website and api/match-info.js read it.
+
+Readers see the hot tier unless they ask for the archive explicitly
+(ShardedBackend(..., include_archive=True), `--archive` on
+regenerate_index_cards.py, the "include archived" buttons in the bot).
+compact() rotates matches whose date is more than ARCHIVE_AFTER_DAYS in the
+past into the archive — kickoff was days ago, so the match is finished even if
+its status field was never flipped. Live matches are never archived.
+
+Until the first write (or compact()) seeds the shards, the registry is read
+straight from the existing data/events.json.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from event_store import JsonFileBackend, canonical_slug
+from models import IST
+from safe_io import atomic_write_json, remove_file
+
+HOT, ARCHIVE = "hot", "archive"
+UNDATED = "undated"
+
+
+def month_of(event: dict) -> str:
+    """Shard key: "YYYY-MM" from the event date, or "undated"."""
+    date = (event.get("date") or "")[:7]
+    return date if len(date) == 7 and date[4] == "-" else UNDATED
+
+
+class ShardedBackend(JsonFileBackend):
+    """EventStore persistence over data/events/ month shards."""
+
+    def __init__(self, path: str, include_archive: bool = False, archive_after_days: int = 30):
+        super().__init__(path)          # data/events.json — hot-tier export
+        self.dir = os.path.join(os.path.dirname(path), "events")
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.include_archive = include_archive
+        self.archive_after_days = archive_after_days
+        self._placement = {}            # canonical slug -> (tier, month) as last written
+        self._manifest = None
+
+    # ── Files ─────────────────────────────────────────────────────────────
+
+    def shard_path(self, tier: str, month: str) -> str:
+        if tier == ARCHIVE:
+            return os.path.join(self.dir, "archive", f"{month}.json")
+        return os.path.join(self.dir, f"{month}.json")
+
+    def _read_json(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return None
+        return self._read_json(self.manifest_path)
+
+    def seeded(self) -> bool:
+        return os.path.exists(self.manifest_path)
+
+    # ── Backend interface ─────────────────────────────────────────────────
+
+    def exists(self) -> bool:
+        return os.path.exists(self.manifest_path) or super().exists()
+
+    def stamp(self):
+        # Every write rewrites the manifest, so it alone tells us about changes
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return super().stamp()      # not seeded yet: events.json is the data
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load(self) -> list:
+        # No artifact_lock here: EventStore.refresh calls this with the store
+        # lock held, and writers take artifact_lock first (lock order).
+        manifest = self._read_manifest()
+        if manifest is None:
+            # Not seeded yet: events.json is the whole (hot) registry; the
+            # first write or compact() splits it into shards
+            self._manifest = None
+            events = super().load() if super().exists() else []
+            self._placement = {canonical_slug(ev.get("slug", "")): (HOT, month_of(ev)) for ev in events}
+            return events
+        self._manifest = manifest
+        tiers = (HOT, ARCHIVE) if self.include_archive else (HOT,)
+        events = []
+        self._placement = {}
+        for tier in tiers:
+            for month in sorted(manifest.get(tier, {}), reverse=True):
+                path = self.shard_path(tier, month)
+                if not os.path.exists(path):
+                    continue
+                for ev in self._read_json(path):
+                    self._placement[canonical_slug(ev.get("slug", ""))] = (tier, month)
+                    events.append(ev)
+        return events
+
+    def _placement_of(self, event: dict) -> tuple:
+        slug = canonical_slug(event.get("slug", ""))
+        tier = self._placement.get(slug, (HOT, None))[0]
+        return (tier, month_of(event))
+
+    def _write(self, events: list, touched: set, export: bool = True) -> None:
+        """Rewrite the (tier, month) shards in `touched`, then manifest and export.
+
+        Callers hold artifact_lock. The manifest is re-read rather than taken
+        from the last load: another view (hot / archive) may have written since,
+        and only the entries in `touched` are ours to change. The first write
+        seeds every month shard.
+        """
+        self._manifest = self._read_manifest()
+        if self._manifest is None:
+            self._manifest = {"version": 1, "archiveAfterDays": self.archive_after_days,
+                              HOT: {}, ARCHIVE: {}}
+            touched = set(touched) | {self._placement_of(ev) for ev in events}
+        placed = [(self._placement_of(ev), ev) for ev in events]
+        self._placement = {canonical_slug(ev.get("slug", "")): where for where, ev in placed}
+        for tier, month in touched:
+            members = [ev for where, ev in placed if where == (tier, month)]
+            path = self.shard_path(tier, month)
+            if members:
+                atomic_write_json(path, members)
+                self._manifest[tier][month] = len(members)
+            else:
+                remove_file(path)
+                self._manifest[tier].pop(month, None)
+        self._manifest["archiveAfterDays"] = self.archive_after_days
+        atomic_write_json(self.manifest_path, self._manifest)
+        if export and any(tier == HOT for tier, _ in touched):
+            super().save([ev for where, ev in placed if where[0] == HOT])
+
+    def apply(self, events: list, changes: list) -> None:
+        """Rewrite only the shards the changes touched (old and new month)."""
+        touched = set()
+        for op, event, info in changes:
+            if op == "insert":
+                touched.add(self._placement_of(event))
+                continue
+            old_slug = info[0] if op == "update" else event.get("slug", "")
+            old = self._placement.get(canonical_slug(old_slug))
+            if old:
+                touched.add(old)
+            if op == "update":
+                if old:     # keep the tier, follow a date change to its new month
+                    self._placement[canonical_slug(event.get("slug", ""))] = (old[0], month_of(event))
+                touched.add(self._placement_of(event))
+        self._write(events, touched)
+
+    def save(self, events: list) -> None:
+        manifest = self._manifest or self._read_manifest() or {HOT: {}, ARCHIVE: {}}
+        tiers = (HOT, ARCHIVE) if self.include_archive else (HOT,)
+        touched = {(tier, month) for tier in tiers for month in manifest.get(tier, {})}
+        touched |= {self._placement_of(ev) for ev in events}
+        self._write(events, touched)
+
+    def compact(self, events: list) -> bool:
+        """Move hot matches older than the archive window to the archive tier."""
+        cutoff = (datetime.now(IST) - timedelta(days=self.archive_after_days)).strftime("%Y-%m-%d")
+        touched = set()
+        for ev in events:
+            slug = canonical_slug(ev.get("slug", ""))
+            tier, month = self._placement.get(slug, (HOT, month_of(ev)))
+            if (tier == HOT and ev.get("date") and ev["date"] < cutoff
+                    and (ev.get("status") or "").lower() != "live"):
+                self._placement[slug] = (ARCHIVE, month)
+                touched |= {(HOT, month), (ARCHIVE, month)}
+        if not touched:
+            if self.seeded():
+                return False
+            self._write(events, set())      # first compaction seeds the shards
+            return True
+        if not self.include_archive:
+            # The archive shards we append to were never loaded: merge them in
+            for tier, month in touched:
+                path = self.shard_path(ARCHIVE, month)
+                if tier == ARCHIVE and os.path.exists(path):
+                    for ev in self._read_json(path):
+                        self._placement[canonical_slug(ev.get("slug", ""))] = (ARCHIVE, month)
+                        events = events + [ev]
+        self._write(events, touched)
+        return True
@@ -0,0 +1,417 @@
+"""
+Process-wide indexed cache of data/events.json.
+
+Every bot handler used to json.load the whole events.json on each tap. The
+EventStore loads it once, keeps hash indexes by slug and id (plus secondary
+indexes by leagueSlug, date and status) and only re-reads the file when its
+inode / mtime / size change — e.g. after a git pull or a manual edit.
+
+Slugs are canonicalised (see canonical_slug) before they are indexed or
+looked up, so "/2026-06-14-a-vs-b.html" and "2026-06-14-a-vs-b" hit the same
+entry in O(1). A small prefix trie covers the rare cases where a partial slug
+really is all we have, and refuses to guess when the prefix is ambiguous.
+
+Entries are held as slotted models.Event objects, built (and checked for
+missing required fields) once per load rather than on every access.
+
+Persistence is pluggable: JsonFileBackend (the default) rewrites events.json;
+events_journal.JournalBackend appends each mutation to data/events.journal;
+event_shards.ShardedBackend keeps month shards under data/events/;
+sqlite_store.SqliteEventBackend turns each mutation into a row update and
+exports events.json as a derived artifact. Mutations go through the store so
+the cache and the indexes never drift from what is on disk. Each one holds
+safe_io.artifact_lock() across its refresh → modify → write cycle, so a
+concurrent regenerate_index_cards.py run can't interleave with it, and the
+write itself is atomic.
+
+Derived artifacts (event_views.py) subscribe with add_listener(fn): after
+every persisted mutation fn(events, changes) is called with the full event
+list and the change tuples just written, or changes=None when the store can't
+say what changed (first load, a reload from disk, save(), compact()) and the
+listener should rebuild from scratch.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import unicodedata
+
+from models import Event
+from safe_io import artifact_lock, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_slug(value: str) -> str:
+    """Normalise a slug or match filename: Unicode NFC, no leading "/", no ".html".
+
+        "/2026-06-14-australia-vs-türkiye.html" → "2026-06-14-australia-vs-türkiye"
+    """
+    slug = unicodedata.normalize("NFC", (value or "").strip()).lstrip("/")
+    if slug.endswith(".html"):
+        slug = slug[:-len(".html")]
+    return slug
+
+
+def file_slug(value: str):
+    """canonical_slug(value) if it can name a file in one directory, else None
+    (empty, hidden, or containing a path separator — "../x", "a/b")."""
+    slug = canonical_slug(value)
+    if not slug or slug.startswith(".") or "/" in slug or "\\" in slug:
+        return None
+    return slug
+
+
+class SlugTrie:
+    """Character trie over canonical slugs, for prefix lookups only."""
+
+    _END = "\0"
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, slug: str) -> None:
+        node = self._root
+        for ch in slug:
+            node = node.setdefault(ch, {})
+        node[self._END] = slug
+
+    def with_prefix(self, prefix: str, limit: int = 0) -> list:
+        """Slugs starting with `prefix`, in lexical order (at most `limit` if > 0)."""
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self._END in node:
+                found.append(node[self._END])
+                if limit and len(found) >= limit:
+                    break
+            stack.extend(node[k] for k in sorted(node, reverse=True) if k != self._END)
+        return found
+
+
+_NOT_LOADED = object()     # never equal to a backend stamp (which may be None)
+
+
+class JsonFileBackend:
+    """Default persistence: events.json is both the database and the artifact."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def stamp(self):
+        """Cheap change token: (inode, mtime_ns, size), or None if missing."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load(self) -> list:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, events: list) -> None:
+        atomic_write_json(self.path, events)
+
+    def apply(self, events: list, changes: list) -> None:
+        """Persist `changes` (already applied to `events`) in one go.
+
+        Each change is ("insert", event, index), ("update", event,
+        (old_slug, fields)) or ("remove", event, None). A flat JSON file can
+        only be rewritten whole, so this is a single save however many there are.
+        """
+        self.save(events)
+
+
+class EventStore:
+    """In-memory, indexed view of the match registry."""
+
+    def __init__(self, path: str, backend=None):
+        self.path = path
+        self.backend = backend or JsonFileBackend(path)
+        self._lock = threading.RLock()
+        self._stamp = _NOT_LOADED  # backend.stamp() of the data we loaded
+        self._events = []         # list order == file order (newest first)
+        self._by_slug = {}
+        self._by_id = {}
+        self._by_league = {}
+        self._by_date = {}
+        self._by_status = {}
+        self._trie = SlugTrie()
+        self._pending = None      # change list while inside batch()
+        self.generation = 0       # bumped whenever the in-memory events change
+        self._listeners = []
+        self._reloaded = False    # loaded from disk since listeners last heard from us
+
+    # ── Loading ───────────────────────────────────────────────────────────
+
+    def refresh(self) -> bool:
+        """Reload if the backing data changed underneath us. Returns True on reload."""
+        with self._lock:
+            if self._pending is not None:
+                return False      # mid-batch: our in-memory edits are the truth
+            stamp = self.backend.stamp()
+            if stamp == self._stamp:
+                return False
+            self._events = [Event.from_dict(raw, strict=False) for raw in self.backend.load()]
+            self._stamp = stamp
+            self._reloaded = True
+            invalid = sum(1 for ev in self._events if ev.missing_fields())
+            if invalid:
+                logger.warning(f"{invalid} event(s) in {self.path} are missing required fields")
+            self._reindex()
+            return True
+
+    def _reindex(self) -> None:
+        self.generation += 1
+        self._by_slug = {}
+        self._by_id = {}
+        self._by_league = {}
+        self._by_date = {}
+        self._by_status = {}
+        self._trie = SlugTrie()
+        for ev in self._events:
+            self._index(ev)
+
+    def _index(self, ev: dict) -> None:
+        slug = canonical_slug(ev.get("slug", ""))
+        if slug:
+            self._by_slug[slug] = ev
+            self._trie.insert(slug)
+        if ev.get("id"):
+            self._by_id[ev["id"]] = ev
+        self._by_league.setdefault(ev.get("leagueSlug", ""), []).append(ev)
+        self._by_date.setdefault(ev.get("date", ""), []).append(ev)
+        self._by_status.setdefault(ev.get("status", ""), []).append(ev)
+
+    # ── Reads ─────────────────────────────────────────────────────────────
+
+    def exists(self) -> bool:
+        return self.backend.exists()
+
+    def all(self) -> list:
+        """All events in file order (a shallow copy — safe to sort/filter)."""
+        with self._lock:
+            self.refresh()
+            return list(self._events)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._events)
+
+    def get_by_slug(self, slug: str):
+        """Exact lookup; `slug` may be a filename or carry a leading "/"."""
+        with self._lock:
+            self.refresh()
+            return self._by_slug.get(canonical_slug(slug))
+
+    def get_by_id(self, event_id: str):
+        with self._lock:
+            self.refresh()
+            return self._by_id.get(event_id)
+
+    def by_league(self, league_slug: str) -> list:
+        with self._lock:
+            self.refresh()
+            return list(self._by_league.get(league_slug, []))
+
+    def by_date(self, date: str) -> list:
+        with self._lock:
+            self.refresh()
+            return list(self._by_date.get(date, []))
+
+    def by_status(self, status: str) -> list:
+        with self._lock:
+            self.refresh()
+            return list(self._by_status.get(status, []))
+
+    def find_by_prefix(self, prefix: str, limit: int = 0) -> list:
+        """Events whose canonical slug starts with `prefix`."""
+        with self._lock:
+            self.refresh()
+            slugs = self._trie.with_prefix(canonical_slug(prefix), limit)
+            return [self._by_slug[s] for s in slugs]
+
+    def resolve(self, slug_or_filename: str):
+        """Exact slug match, else the single event whose slug starts with it.
+
+        Returns None when nothing matches or when a partial slug is ambiguous
+        (one slug being a prefix of another no longer picks the wrong match).
+        """
+        with self._lock:
+            ev = self.get_by_slug(slug_or_filename)
+            if ev is not None:
+                return ev
+            candidates = self.find_by_prefix(slug_or_filename, limit=2)
+            return candidates[0] if len(candidates) == 1 else None
+
+    def league_counts(self) -> dict:
+        """Number of events per display league name."""
+        with self._lock:
+            self.refresh()
+            counts = {}
+            for group in self._by_league.values():
+                for ev in group:
+                    name = ev.get("league", "Others")
+                    counts[name] = counts.get(name, 0) + 1
+            return counts
+
+    # ── Writes ────────────────────────────────────────────────────────────
+
+    def insert(self, event, index: int = 0) -> None:
+        """Insert a new event (at the top by default) and persist it.
+
+        `event` may be a raw dict; it is validated (EventValidationError) first.
+        """
+        event = Event.from_dict(event)
+        with artifact_lock(), self._lock:
+            self.refresh()
+            self._events.insert(index, event)
+            self._reindex()
+            self._record(("insert", event, index))
+
+    def update(self, slug: str, fields: dict):
+        """Apply `fields` to the event with `slug` and persist. Returns the event or None."""
+        with artifact_lock(), self._lock:
+            self.refresh()
+            ev = self._by_slug.get(canonical_slug(slug))
+            if ev is None:
+                return None
+            old_slug = ev.get("slug", "")
+            ev.update(fields)
+            self._reindex()
+            self._record(("update", ev, (old_slug, fields)))
+            return ev
+
+    def remove(self, slug: str) -> bool:
+        """Remove the event with `slug` and persist. Returns False if it wasn't there."""
+        with artifact_lock(), self._lock:
+            self.refresh()
+            ev = self._by_slug.get(canonical_slug(slug))
+            if ev is None:
+                return False
+            self._events = [e for e in self._events if e is not ev]
+            self._reindex()
+            self._record(("remove", ev, None))
+            return True
+
+    def _record(self, change: tuple) -> None:
+        if self._pending is not None:
+            self._pending.append(change)
+            return
+        self._apply([change])
+        self._stamp = self.backend.stamp()
+        self._notify([change])
+
+    # ── Listeners ─────────────────────────────────────────────────────────
+
+    def add_listener(self, fn) -> None:
+        """Call fn(events, changes) after each persisted mutation (once per fn)."""
+        with self._lock:
+            if fn not in self._listeners:
+                self._listeners.append(fn)
+                self._reloaded = True     # its first call should be a full build
+
+    def _notify(self, changes) -> None:
+        if not self._listeners:
+            return
+        if self._reloaded:
+            changes, self._reloaded = None, False
+        for fn in self._listeners:
+            try:
+                fn(self._events, changes)
+            except Exception as e:
+                logger.error(f"events listener {getattr(fn, '__qualname__', fn)} failed: {e}", exc_info=True)
+                self._reloaded = True     # full rebuild next time
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group inserts / updates / removes into a single backend write.
+
+            with store.batch():
+                store.update(slug, {"title": ...})
+                store.remove(other_slug)
+
+        Nothing is persisted until the block exits; if it raises, the
+        in-memory edits are dropped and the next read reloads from disk.
+        Nested batches join the outermost one.
+        """
+        with artifact_lock(), self._lock:
+            if self._pending is not None:
+                yield self
+                return
+            self.refresh()
+            self._pending = []
+            try:
+                yield self
+            except BaseException:
+                self._pending = None
+                self._stamp = _NOT_LOADED
+                raise
+            changes, self._pending = self._pending, None
+            if changes:
+                self._apply(changes)
+                self._stamp = self.backend.stamp()
+                self._notify(changes)
+
+    def _apply(self, changes: list) -> None:
+        try:
+            self.backend.apply(self._events, changes)
+        except BaseException:
+            self._stamp = _NOT_LOADED       # the backend refused: drop the edits, reload
+            raise
+
+    def save(self) -> None:
+        """Write the whole cached list back and remember the new stamp."""
+        with artifact_lock(), self._lock:
+            self.backend.save(self._events)
+            self._stamp = self.backend.stamp()
+            self._notify(None)
+
+    def compact(self) -> bool:
+        """Backend housekeeping (fold the journal, rotate the archive). False if nothing to do."""
+        compact = getattr(self.backend, "compact", None)
+        if compact is None:
+            return False
+        with artifact_lock(), self._lock:
+            self.refresh()
+            done = compact(self._events)
+            # Compaction may move events out of this view: reload on next read
+            self._stamp = _NOT_LOADED if done else self.backend.stamp()
+            if done and self._listeners:
+                self.refresh()
+                self._notify(None)
+            return done
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_event_store(path: str, backend_factory=None, view: str = "") -> EventStore:
+    """Return the shared EventStore for `path` (one per process and `view`).
+
+    `backend_factory(path)` is only called the first time, to pick persistence.
+    `view` names alternative views of the same data (e.g. "archive").
+    """
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get((path, view))
+        if store is None:
+            backend = backend_factory(path) if backend_factory else None
+            store = _stores[(path, view)] = EventStore(path, backend)
+        return store
@@ -0,0 +1,129 @@
+"""
+Constant-memory helpers for very large events files (regenerate --stream).
+
+regenerate_index_cards.py normally json.loads the whole of events.json, which
+is fine for the live registry but not for multi-hundred-MB archives. These
+helpers let it handle one event at a time:
+
+  iter_json_array(path)
+      incremental parser for a top-level JSON array of objects — reads the
+      file in chunks and yields each element as soon as it is complete.
+
+  write_json_array(out, items)
+      writes items to a text sink in exactly the layout json.dumps(..., indent=2)
+      produces, so a streamed --sort/--fix is byte-identical to a normal one.
+
+  external_sort(items, key, reverse)
+      sorted() for iterables that don't fit in memory: sorts runs of
+      `run_size` items, spills each run to a temp file (JSON lines) and
+      heap-merges the runs. Stable, like sorted().
+"""
+
+import heapq
+import json
+import os
+import tempfile
+
+from safe_io import json_default
+
+_WS = " \t\n\r"
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16):
+    """Yield the elements of the JSON array stored at `path`, one at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf = buf[pos:] + chunk
+            pos = 0
+
+        def next_char():
+            """Skip whitespace; the next significant character ("" at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WS:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos] if pos < len(buf) else ""
+                fill()
+
+        if next_char() != "[":
+            raise ValueError(f"{path}: expected a JSON array")
+        pos += 1
+        if next_char() == "]":
+            return
+        index = 0
+        while True:
+            next_char()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError as e:
+                    if eof:
+                        raise ValueError(f"{path}: element {index}: {e}") from None
+                    fill()      # element not complete yet — read more
+            pos = end
+            yield item
+            index += 1
+            c = next_char()
+            if c == "]":
+                return
+            if c != ",":
+                raise ValueError(f"{path}: expected ',' or ']' after element {index - 1}")
+            pos += 1
+            if pos > chunk_size:    # drop what we've consumed
+                buf, pos = buf[pos:], 0
+
+
+def write_json_array(out, items) -> int:
+    """Write `items` to `out` as json.dumps(list(items), indent=2) would. Returns the count."""
+    count = 0
+    for item in items:
+        body = json.dumps(item, indent=2, ensure_ascii=False, default=json_default)
+        out.write(("[\n" if count == 0 else ",\n") + "  " + body.replace("\n", "\n  "))
+        count += 1
+    out.write("\n]" if count else "[]")
+    return count
+
+
+def external_sort(items, key, reverse: bool = False, run_size: int = 10000):
+    """Yield `items` sorted by `key` (a str/number), holding at most `run_size` in memory."""
+    with tempfile.TemporaryDirectory(prefix="events-sort-") as tmp:
+        runs, run = [], []
+
+        def spill():
+            path = os.path.join(tmp, f"run-{len(runs)}.jsonl")
+            run.sort(key=lambda pair: pair[0], reverse=reverse)
+            with open(path, "w", encoding="utf-8") as f:
+                for pair in run:
+                    f.write(json.dumps(pair, ensure_ascii=False, default=json_default) + "\n")
+            runs.append(path)
+            run.clear()
+
+        for item in items:
+            run.append((key(item), item))
+            if len(run) >= run_size:
+                spill()
+        if not runs:                # everything fit in one run — no temp files
+            run.sort(key=lambda pair: pair[0], reverse=reverse)
+            for _, item in run:
+                yield item
+            return
+        if run:
+            spill()
+
+        files = [open(path, "r", encoding="utf-8") for path in runs]
+        try:
+            readers = [(json.loads(line) for line in f) for f in files]
+            for _, item in heapq.merge(*readers, key=lambda pair: pair[0], reverse=reverse):
+                yield item
+        finally:
+            for f in files:
+                f.close()
@@ -0,0 +1,191 @@
+"""
+Precomputed views of the events registry for the website.
+
+The homepage, match pages and /api functions used to download the whole of
+data/events.json and filter it client-side. The bot now keeps small, already
+sorted slices of it next to the registry:
+
+    data/shards/league/<leagueSlug>.json    one league, newest kickoff first
+    data/shards/day/<YYYY-MM-DD>.json       one IST match day, by kickoff
+    data/shards/live.json                   matches with status "live", by kickoff
+
+    data/events/by-slug/<slug>.json         one match, for lookups by slug
+    data/events/by-id.json                  {event id: slug}
+
+MembershipShards and SlugDocuments are EventStore listeners (see
+EventStore.add_listener). On each mutation MembershipShards works out which
+shards the changed events belonged to before and belong to now, and rewrites
+only those — a shard is untouched unless one of its members joined, left or
+was edited. Shards that end up empty are deleted (live.json is kept, as []).
+SlugDocuments rewrites the documents of the changed matches, deletes those of
+removed (or renamed) ones and rewrites by-id.json only when an id moved.
+"""
+
+import os
+import re
+
+from event_store import canonical_slug
+from safe_io import atomic_write_json, remove_file
+
+_LEAGUE_RE = re.compile(r"[a-z0-9][a-z0-9-]*")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+LIVE = ("live", "")
+
+
+def _kickoff(ev) -> str:
+    return f"{ev.date or ''} {ev.time or ''}"
+
+
+def changed_slugs(changes: list) -> set:
+    """Canonical slugs an EventStore change list touched (old and new slug)."""
+    slugs = set()
+    for op, ev, info in changes:
+        slugs.add(canonical_slug(ev.get("slug", "")))
+        if op == "update":
+            slugs.add(canonical_slug(info[0]))
+    slugs.discard("")
+    return slugs
+
+
+class MembershipShards:
+    """data/shards/: per-league, per-day and live slices of the events list."""
+
+    def __init__(self, data_dir: str):
+        self.dir = os.path.join(data_dir, "shards")
+        self._keys_of = {}          # canonical slug -> shard keys it was last written to
+
+    @staticmethod
+    def keys_for(ev) -> set:
+        keys = set()
+        league = ev.league_slug or ""
+        if _LEAGUE_RE.fullmatch(league):
+            keys.add(("league", league))
+        if _DATE_RE.fullmatch(ev.date or ""):
+            keys.add(("day", ev.date))
+        if (ev.status or "").lower() == "live":
+            keys.add(LIVE)
+        return keys
+
+    def path(self, key: tuple) -> str:
+        kind, name = key
+        if key == LIVE:
+            return os.path.join(self.dir, "live.json")
+        return os.path.join(self.dir, kind, f"{name}.json")
+
+    @staticmethod
+    def _sorted(key: tuple, members: list) -> list:
+        # League shards read like events.json (newest first); days and live run by kickoff
+        return sorted(members, key=_kickoff, reverse=key[0] == "league")
+
+    def _write(self, key: tuple, members: list) -> None:
+        if members or key == LIVE:
+            atomic_write_json(self.path(key), self._sorted(key, members))
+        else:
+            remove_file(self.path(key))
+
+    def __call__(self, events: list, changes) -> None:
+        if changes is None:
+            self.rebuild(events)
+        else:
+            self.apply(events, changes)
+
+    def rebuild(self, events: list) -> None:
+        """Write every shard and delete shard files nothing belongs to any more."""
+        members, keys_of = {LIVE: []}, {}
+        for ev in events:
+            keys = self.keys_for(ev)
+            keys_of[canonical_slug(ev.slug or "")] = keys
+            for key in keys:
+                members.setdefault(key, []).append(ev)
+        for key, evs in members.items():
+            self._write(key, evs)
+        for kind in ("league", "day"):
+            folder = os.path.join(self.dir, kind)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(".json") and (kind, name[:-5]) not in members:
+                    remove_file(os.path.join(folder, name))
+        self._keys_of = keys_of
+
+    def apply(self, events: list, changes: list) -> None:
+        """Rewrite only the shards the changed events left, joined or sit in."""
+        slugs = changed_slugs(changes)
+        dirty = set()
+        for slug in slugs:
+            dirty |= self._keys_of.pop(slug, set())
+        current = [ev for ev in events if canonical_slug(ev.slug or "") in slugs]
+        for ev in current:
+            keys = self.keys_for(ev)
+            self._keys_of[canonical_slug(ev.slug or "")] = keys
+            dirty |= keys
+        if not dirty:
+            return
+        members = {key: [] for key in dirty}
+        for ev in events:
+            for key in self.keys_for(ev) & dirty:
+                members[key].append(ev)
+        for key, evs in members.items():
+            self._write(key, evs)
+
+
+class SlugDocuments:
+    """data/events/by-slug/<slug>.json per match, plus data/events/by-id.json."""
+
+    def __init__(self, data_dir: str):
+        self.dir = os.path.join(data_dir, "events", "by-slug")
+        self.id_map_path = os.path.join(data_dir, "events", "by-id.json")
+        self._ids = None            # id -> canonical slug as last written
+
+    def path(self, slug: str):
+        """Document path for a canonical slug, or None if it can't be a filename."""
+        if not slug or slug.startswith(".") or "/" in slug or "\\" in slug:
+            return None
+        return os.path.join(self.dir, f"{slug}.json")
+
+    @staticmethod
+    def _id_map(events: list) -> dict:
+        return {ev.id: canonical_slug(ev.slug or "") for ev in events if ev.id and ev.slug}
+
+    def _write_id_map(self, ids: dict) -> None:
+        if ids != self._ids:
+            atomic_write_json(self.id_map_path, dict(sorted(ids.items())))
+            self._ids = ids
+
+    def __call__(self, events: list, changes) -> None:
+        if changes is None:
+            self.rebuild(events)
+        else:
+            self.apply(events, changes)
+
+    def rebuild(self, events: list) -> None:
+        """Write every document, delete orphans, rewrite the id map."""
+        wanted = set()
+        for ev in events:
+            path = self.path(canonical_slug(ev.slug or ""))
+            if path:
+                atomic_write_json(path, ev)
+                wanted.add(os.path.basename(path))
+        if os.path.isdir(self.dir):
+            for name in os.listdir(self.dir):
+                if name.endswith(".json") and name not in wanted:
+                    remove_file(os.path.join(self.dir, name))
+        self._ids = None
+        self._write_id_map(self._id_map(events))
+
+    def apply(self, events: list, changes: list) -> None:
+        slugs = changed_slugs(changes)
+        current = {canonical_slug(ev.slug or ""): ev for ev in events
+                   if canonical_slug(ev.slug or "") in slugs}
+        for slug in slugs:
+            path = self.path(slug)
+            if path is None:
+                continue
+            if slug in current:
+                atomic_write_json(path, current[slug])
+            else:
+                remove_file(path)
+        if self._ids is None or any(op != "update" or "id" in info[1] or info[0] != ev.get("slug")
+                                    for op, ev, info in changes):
+            self._write_id_map(self._id_map(events))
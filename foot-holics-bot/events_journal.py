@@ -0,0 +1,144 @@
+"""
+Append-only mutation journal for data/events.json (EVENTS_JOURNAL=1).
+
+Inserting one match at the top of events.json, or changing one field on it,
+used to rewrite the whole file. In journal mode every mutation instead appends
+one JSON line to data/events.journal:
+
+    {"op": "add",       "index": 0,      "event": {...}}
+    {"op": "set",       "slug": "...",   "fields": {"title": "..."}}
+    {"op": "broadcast", "slug": "...",   "broadcast": [...]}
+    {"op": "delete",    "slug": "..."}
+
+so the cost of an edit is proportional to the edit. Readers (the EventStore)
+see events.json with the journal replayed on top. compact() folds the journal
+into events.json (one atomic write) and removes it; the bot does that on a
+timer and always before git_auto_push, so the site never sees a stale file.
+
+Each line is fsync'ed before the mutation returns, so the journal also works
+as a recovery log: a crash between compactions loses nothing, and a torn last
+line (crash mid-append) is skipped on replay.
+"""
+
+import json
+import logging
+import os
+
+from event_store import JsonFileBackend, canonical_slug
+from safe_io import artifact_lock, json_default
+
+logger = logging.getLogger(__name__)
+
+
+def default_journal_path(events_path: str) -> str:
+    return os.path.join(os.path.dirname(events_path), "events.journal")
+
+
+def read_journal(journal_path: str) -> list:
+    """Parsed journal records, oldest first. Unreadable lines are skipped."""
+    if not os.path.exists(journal_path):
+        return []
+    records = []
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"events.journal line {lineno} is corrupt — skipped")
+    return records
+
+
+def replay(events: list, records: list) -> list:
+    """Apply journal records to `events` in order (in place) and return it."""
+    for rec in records:
+        op = rec.get("op")
+        if op == "add":
+            events.insert(rec.get("index", 0), rec["event"])
+            continue
+        slug = canonical_slug(rec.get("slug", ""))
+        pos = next((i for i, ev in enumerate(events)
+                    if canonical_slug(ev.get("slug", "")) == slug), None)
+        if pos is None:
+            logger.warning(f"events.journal: '{op}' for unknown slug {slug} — skipped")
+        elif op == "set":
+            events[pos].update(rec.get("fields", {}))
+        elif op == "broadcast":
+            events[pos]["broadcast"] = rec.get("broadcast", [])
+        elif op == "delete":
+            del events[pos]
+    return events
+
+
+class JournalBackend(JsonFileBackend):
+    """events.json as a base snapshot plus data/events.journal on top."""
+
+    def __init__(self, path: str, journal_path: str = None):
+        super().__init__(path)
+        self.journal_path = journal_path or default_journal_path(path)
+
+    def stamp(self):
+        try:
+            st = os.stat(self.journal_path)
+            journal = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            journal = None
+        return (super().stamp(), journal)
+
+    def exists(self) -> bool:
+        return super().exists() or os.path.exists(self.journal_path)
+
+    def load(self) -> list:
+        return replay(super().load(), read_journal(self.journal_path))
+
+    @staticmethod
+    def _records(change: tuple) -> list:
+        op, event, info = change
+        if op == "insert":
+            return [{"op": "add", "index": info, "event": event}]
+        if op == "remove":
+            return [{"op": "delete", "slug": event.get("slug", "")}]
+        old_slug, fields = info
+        fields = dict(fields)
+        records = []
+        if "broadcast" in fields:
+            records.append({"op": "broadcast", "slug": old_slug, "broadcast": fields.pop("broadcast")})
+        if fields:
+            records.append({"op": "set", "slug": old_slug, "fields": fields})
+        return records
+
+    def apply(self, events: list, changes: list) -> None:
+        """Append one line per change (a single write + fsync for the batch)."""
+        lines = "".join(
+            json.dumps(rec, ensure_ascii=False, default=json_default) + "\n"
+            for change in changes for rec in self._records(change)
+        )
+        if not lines:
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save(self, events: list) -> None:
+        super().save(events)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def compact(self, events: list) -> bool:
+        """Write `events` (journal already folded in) and drop the journal."""
+        if not os.path.exists(self.journal_path):
+            return False
+        self.save(events)
+        return True
+
+
+def compact_journal(events_path: str, journal_path: str = None) -> bool:
+    """Fold a journal into events.json without a running bot (e.g. from a CLI)."""
+    backend = JournalBackend(events_path, journal_path)
+    if not os.path.exists(backend.journal_path):
+        return False        # nothing to fold — don't load events.json for nothing
+    with artifact_lock():
+        return backend.compact(backend.load())
@@ -0,0 +1,195 @@
+"""
+RSS and JSON feeds of the latest articles and fixtures.
+
+Feed readers and aggregators had nothing to poll but articles/index.html. The
+bot now keeps, in the site root:
+
+    feeds/articles.xml      RSS 2.0, newest articles first
+    feeds/matches.xml       RSS 2.0, fixtures by kickoff, latest first
+    feed.json               JSON Feed 1.1, both merged by date
+
+each bounded to the latest `limit` items (FEED_ITEMS). Feeds is an EventStore
+listener (see EventStore.add_listener) for the matches and is handed the
+articles index via sync_articles() after every publish / edit / delete.
+
+Every item keeps its rendered <item> fragment. A mutation re-renders only the
+items that are new or whose fields changed — normally the one at the top — and
+splices the cached fragments of the others back in; items pushed past the
+limit simply fall off. A feed whose window didn't change is not rewritten at
+all, and the channel date is the newest item's (not "now"), so an unchanged
+feed stays byte-identical and pollers get 304s.
+"""
+
+import heapq
+import json
+import os
+from datetime import datetime
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+from article_pages import newest_first
+from models import IST
+from safe_io import atomic_write_text
+SITE_URL = "https://footholics.in"
+SITE_TITLE = "Foot Holics"
+DEFAULT_LIMIT = 50
+
+
+def _absolute(url: str) -> str:
+    if not url:
+        return ""
+    if url.startswith(("http://", "https://")):
+        return url
+    return f"{SITE_URL}/{url.lstrip('/')}"
+
+
+def _published(date: str, time: str = "") -> datetime:
+    """IST date ("YYYY-MM-DD") and optional "HH:MM" → aware datetime (epoch if unparseable)."""
+    try:
+        return datetime.strptime(f"{date} {time or '00:00'}", "%Y-%m-%d %H:%M").replace(tzinfo=IST)
+    except (TypeError, ValueError):
+        return datetime.fromtimestamp(0, IST)
+
+
+def article_item(entry: dict) -> dict:
+    url = _absolute(entry.get("url") or f"/articles/{entry.get('slug')}.html")
+    return {
+        "id": url,
+        "url": url,
+        "title": entry.get("title") or entry.get("slug") or "",
+        "summary": entry.get("excerpt") or "",
+        "image": _absolute(entry.get("image") or ""),
+        "published": _published(entry.get("date")),
+        "tags": [entry["category"]] if entry.get("category") else [],
+        "author": entry.get("author") or "",
+    }
+
+
+def match_item(ev) -> dict:
+    url = _absolute(f"{ev.get('slug')}.html")
+    kickoff = " ".join(x for x in (ev.get("date"), ev.get("time")) if x)
+    return {
+        "id": url,
+        "url": url,
+        "title": ev.get("title") or ev.get("slug") or "",
+        "summary": ev.get("excerpt") or f"{ev.get('league') or ''} · {kickoff} IST".strip(" ·"),
+        "image": _absolute(ev.get("poster") or ""),
+        "published": _published(ev.get("date"), ev.get("time")),
+        "tags": [ev["league"]] if ev.get("league") else [],
+        "author": "",
+    }
+
+
+def rss_fragment(item: dict) -> str:
+    lines = [
+        "    <item>",
+        f"      <title>{escape(item['title'])}</title>",
+        f"      <link>{escape(item['url'])}</link>",
+        f'      <guid isPermaLink="true">{escape(item["id"])}</guid>',
+        f"      <pubDate>{format_datetime(item['published'])}</pubDate>",
+    ]
+    lines += [f"      <category>{escape(tag)}</category>" for tag in item["tags"]]
+    if item["summary"]:
+        lines.append(f"      <description>{escape(item['summary'])}</description>")
+    if item["image"]:
+        lines.append(f'      <enclosure url="{escape(item["image"])}" length="0" type="image/jpeg"/>')
+    lines.append("    </item>")
+    return "\n".join(lines) + "\n"
+
+
+def json_item(item: dict) -> dict:
+    out = {"id": item["id"], "url": item["url"], "title": item["title"]}
+    if item["summary"]:
+        out["summary"] = item["summary"]
+    if item["image"]:
+        out["image"] = item["image"]
+    out["date_published"] = item["published"].isoformat()
+    if item["tags"]:
+        out["tags"] = item["tags"]
+    if item["author"]:
+        out["authors"] = [{"name": item["author"]}]
+    return out
+
+
+class RssFeed:
+    """One bounded RSS 2.0 file whose <item>s are cached between writes."""
+
+    def __init__(self, path: str, title: str, description: str, feed_url: str):
+        self.path = path
+        self.title = title
+        self.description = description
+        self.feed_url = feed_url
+        self.items = None           # window as last written
+        self._fragments = {}        # item id -> (item, rendered <item>)
+
+    def update(self, items: list) -> bool:
+        """Make the feed show `items` (already ordered and bounded). False if it already did."""
+        if items == self.items:
+            return False
+        fragments, body = {}, []
+        for item in items:
+            cached = self._fragments.get(item["id"])
+            if cached is None or cached[0] != item:
+                cached = (item, rss_fragment(item))
+            fragments[item["id"]] = cached
+            body.append(cached[1])
+        self._fragments = fragments
+        self.items = items
+        updated = format_datetime(items[0]["published"] if items else datetime.fromtimestamp(0, IST))
+        head = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n'
+            "  <channel>\n"
+            f"    <title>{escape(self.title)}</title>\n"
+            f"    <link>{SITE_URL}/</link>\n"
+            f'    <atom:link href="{escape(self.feed_url)}" rel="self" type="application/rss+xml"/>\n'
+            f"    <description>{escape(self.description)}</description>\n"
+            "    <language>en</language>\n"
+            f"    <lastBuildDate>{updated}</lastBuildDate>\n"
+        )
+        atomic_write_text(self.path, head + "".join(body) + "  </channel>\n</rss>\n")
+        return True
+
+
+class Feeds:
+    """feeds/articles.xml, feeds/matches.xml and feed.json for one site root."""
+
+    def __init__(self, root_dir: str, limit: int = DEFAULT_LIMIT):
+        self.limit = max(1, limit)
+        self.articles = RssFeed(os.path.join(root_dir, "feeds", "articles.xml"),
+                                f"{SITE_TITLE} — Articles", "Football news, previews and match reports",
+                                f"{SITE_URL}/feeds/articles.xml")
+        self.matches = RssFeed(os.path.join(root_dir, "feeds", "matches.xml"),
+                               f"{SITE_TITLE} — Matches", "Upcoming and recent fixtures",
+                               f"{SITE_URL}/feeds/matches.xml")
+        self.json_path = os.path.join(root_dir, "feed.json")
+
+    def __call__(self, events: list, changes) -> None:
+        # Cheap either way: only the top `limit` by kickoff are compared / rendered
+        self.sync_matches(events)
+
+    def sync_matches(self, events: list) -> None:
+        items = heapq.nlargest(self.limit, (match_item(ev) for ev in events if ev.get("slug")),
+                               key=lambda i: i["published"])
+        if self.matches.update(items):
+            self._write_json()
+
+    def sync_articles(self, articles: list) -> None:
+        items = [article_item(a) for a in newest_first(articles)[:self.limit] if a.get("slug")]
+        if self.articles.update(items):
+            self._write_json()
+
+    def _write_json(self) -> None:
+        if self.articles.items is None or self.matches.items is None:
+            return                  # written once both halves are known
+        merged = sorted(self.articles.items + self.matches.items,
+                        key=lambda i: i["published"], reverse=True)[:self.limit]
+        feed = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": SITE_TITLE,
+            "home_page_url": f"{SITE_URL}/",
+            "feed_url": f"{SITE_URL}/feed.json",
+            "language": "en",
+            "items": [json_item(i) for i in merged],
+        }
+        atomic_write_text(self.json_path, json.dumps(feed, ensure_ascii=False, indent=2) + "\n")
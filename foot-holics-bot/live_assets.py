@@ -0,0 +1,116 @@
+"""
+Content-hashed URLs for the static files the live pages link.
+
+Live pages referenced assets/css/live.css, assets/js/live-match.js and
+/assets/js/live-core.js by their plain names, so those could only be served
+must-revalidate. LiveAssets publishes a copy of each under a name carrying a
+prefix of its SHA-256 — live.3f2a9c1d0b.css next to live.css — and hands the
+renderer that URL instead:
+
+  * asset_manifest.py serves hashed names `immutable` for a year, which a
+    `?v=` query string could not get (vercel.json header rules match paths), so
+    repeat visitors never re-request them;
+  * editing live.css (or the bot updating its lp-* block) yields a new name,
+    and the render cache fingerprint includes the URLs, so the next rebuild
+    picks it up;
+  * older copies stay while a live page still links them; prune() deletes
+    the rest (after a full rebuild and before each push of the live repo).
+
+Digests come from safe_io.file_digest, which only re-hashes a file when its
+mtime or size changed, so resolving the URLs per page is a few stat() calls.
+A file that doesn't exist keeps its plain URL.
+"""
+
+import os
+import re
+import threading
+
+from safe_io import atomic_write_bytes, file_digest, remove_file
+
+HASH_CHARS = 10                 # asset_manifest.HASHED_NAME wants 8-64 hex digits
+
+# Template slot -> the asset's URL as the page links it (relative or root-relative)
+LIVE_ASSETS = {
+    "LIVE_CSS_URL": "assets/css/live.css",
+    "LIVE_MATCH_JS_URL": "assets/js/live-match.js",
+    "LIVE_CORE_JS_URL": "/assets/js/live-core.js",
+}
+
+
+def hashed_name(path: str, digest_hex: str) -> str:
+    """"assets/css/live.css" + digest → "assets/css/live.<digest prefix>.css"."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{digest_hex[:HASH_CHARS]}{ext}"
+
+
+class LiveAssets:
+    """Hashed copies of LIVE_ASSETS in one live site root."""
+
+    def __init__(self, root_dir: str):
+        self.root = os.path.abspath(root_dir)
+        self._lock = threading.Lock()
+        self._published = set()     # hashed paths known to be on disk
+
+    def url(self, link: str) -> str:
+        rel = link.lstrip("/")
+        source = os.path.join(self.root, *rel.split("/"))
+        info = file_digest(source)
+        if info is None:
+            return link
+        hashed = hashed_name(rel, info[0].hex())
+        path = os.path.join(self.root, *hashed.split("/"))
+        with self._lock:
+            if path not in self._published:
+                with open(source, "rb") as f:
+                    data = f.read()
+                # Re-check: the source may have changed since it was hashed
+                if file_digest(source) == info:
+                    atomic_write_bytes(path, data)
+                    self._published.add(path)
+                else:
+                    return link
+        return ("/" if link.startswith("/") else "") + hashed
+
+    def urls(self) -> dict:
+        """{slot: URL} for every entry of LIVE_ASSETS."""
+        return {slot: self.url(link) for slot, link in LIVE_ASSETS.items()}
+
+    def prune(self) -> list:
+        """Delete hashed copies that are neither current nor linked by a live page.
+
+        Pages are only read when there is an outdated copy at all, which is
+        rare (an asset was edited since the last prune). Returns the removed paths.
+        """
+        current = {os.path.join(self.root, *url.lstrip("/").split("/")) for url in self.urls().values()}
+        outdated = {}               # file name -> path
+        for link in LIVE_ASSETS.values():
+            rel = link.lstrip("/")
+            folder = os.path.join(self.root, *os.path.dirname(rel).split("/"))
+            stem, ext = os.path.splitext(os.path.basename(rel))
+            copy = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_CHARS}}}{re.escape(ext)}")
+            try:
+                names = os.listdir(folder)
+            except FileNotFoundError:
+                continue
+            for name in names:
+                path = os.path.join(folder, name)
+                if copy.fullmatch(name) and path not in current:
+                    outdated[name] = path
+        if not outdated:
+            return []
+        linked = set()
+        find = re.compile("|".join(re.escape(name) for name in outdated))
+        for name in os.listdir(self.root):
+            if name.endswith(".html"):
+                try:
+                    with open(os.path.join(self.root, name), "r", encoding="utf-8", errors="replace") as f:
+                        linked.update(find.findall(f.read()))
+                except FileNotFoundError:
+                    continue
+        removed = []
+        with self._lock:
+            for name, path in outdated.items():
+                if name not in linked and remove_file(path):
+                    self._published.discard(path)
+                    removed.append(path)
+        return removed
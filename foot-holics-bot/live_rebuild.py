@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Rebuild every live stream-links page in foot-holics-live/ in one pass.
+
+After a template or broadcaster-table change every page on the live site is
+stale, and re-saving matches one at a time through the bot doesn't scale.
+rebuild() takes (file name, generate_live_html input) for every match, drops
+the pages the render cache says are current, renders the rest across a
+ProcessPoolExecutor and writes only pages whose bytes changed (safe_io), so
+the one commit that follows carries exactly the pages that differ.
+
+Rendering is CPU-bound Python, hence processes rather than threads. Workers
+are spawned, never forked (the bot is multi-threaded), and each imports bot.py
+once — about a second of start-up — so batches smaller than
+PARALLEL_MIN_PAGES are rendered in-process instead.
+
+Usage (the bot's ♻️ Rebuild Live Pages button runs the same rebuild):
+    python live_rebuild.py                  # re-render stale pages only
+    python live_rebuild.py --force          # every page
+    python live_rebuild.py --workers 4 --commit
+"""
+
+import argparse
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from safe_io import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_MIN_PAGES = 500
+
+
+class RebuildResult:
+    """What a rebuild() did, for the CLI and the bot's summary message."""
+
+    def __init__(self):
+        self.pages = 0              # matches considered
+        self.skipped = 0            # render cache hits
+        self.rendered = 0
+        self.written = []           # paths whose bytes changed
+        self.failed = []            # (file name, error)
+        self.workers = 1
+        self.seconds = 0.0
+
+    @property
+    def unchanged(self) -> int:
+        return self.rendered - len(self.written)
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.rendered / self.seconds if self.seconds else 0.0
+
+
+def _render_safely(render, data: dict) -> tuple:
+    """(result, None) or (None, error) — one bad match must not sink the batch."""
+    try:
+        return render(data), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def rebuild(jobs: list, live_root: str, render, fingerprint, cache=None,
+            force: bool = False, workers: int = None) -> RebuildResult:
+    """Render and write `jobs` [(file name, data)] into `live_root`.
+
+    `render` must be a module-level function (it is pickled to the workers);
+    `fingerprint(data)` keys the render `cache`, which is skipped with `force`.
+    """
+    start = time.perf_counter()
+    result = RebuildResult()
+    result.pages = len(jobs)
+    todo = []
+    for filename, data in jobs:
+        digest, error = _render_safely(fingerprint, data)
+        if error:
+            logger.warning(f"Live page {filename} not rebuilt: {error}")
+            result.failed.append((filename, error))
+            continue
+        if not force and cache is not None and cache.fresh(filename, digest, os.path.join(live_root, filename)):
+            result.skipped += 1
+        else:
+            todo.append((filename, data, digest))
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    task = functools.partial(_render_safely, render)
+    datas = [data for _, data, _ in todo]
+    pool = None
+    if workers > 1 and len(todo) >= PARALLEL_MIN_PAGES:
+        result.workers = workers
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        pages = pool.map(task, datas, chunksize=max(1, len(datas) // (workers * 4)))
+    else:
+        pages = map(task, datas)
+
+    digests = {}
+    try:
+        # Results arrive in order, so writing overlaps with the workers still rendering
+        for (filename, _, digest), (page, error) in zip(todo, pages):
+            if error:
+                logger.warning(f"Live page {filename} not rebuilt: {error}")
+                result.failed.append((filename, error))
+                continue
+            result.rendered += 1
+            path = os.path.join(live_root, filename)
+            if atomic_write_text(path, page):
+                result.written.append(path)
+            digests[filename] = digest
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None and digests:
+            cache.store_many(digests)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="re-render every page, ignoring the render cache")
+    parser.add_argument("--workers", type=int, metavar="N", help="render processes (default: CPU count)")
+    parser.add_argument("--commit", action="store_true", help="one local git commit in foot-holics-live/")
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be >= 1")
+
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "rebuild")     # bot.py only needs it to run the bot
+    import bot
+    from retention import commit_paths
+    from safe_io import pop_changed
+
+    live_root = bot.get_live_project_root()
+    if not live_root:
+        print("❌ foot-holics-live/ folder not found")
+        return 1
+    if bot.PRECOMPRESS:
+        bot.start_precompressor()
+    if bot.ASSET_MANIFEST:
+        bot.start_asset_manifests()
+
+    result = bot.rebuild_live_pages(force=args.force, workers=args.workers)
+    bot.settle_generated_files(live_root)
+    print(f"♻️  {result.pages} matches · {result.skipped} up to date · "
+          f"{result.rendered} rendered on {result.workers} worker(s)")
+    print(f"   ✏️  {len(result.written)} pages changed, {result.unchanged} identical")
+    for filename, error in result.failed:
+        print(f"   ❌ {filename}: {error}")
+    print(f"   ⏱️  {result.seconds:.2f}s total · {result.pages_per_sec:,.0f} pages/sec")
+
+    changed = pop_changed(live_root)
+    if args.commit and changed:
+        ok, status = commit_paths(live_root, changed, f"Rebuild {len(result.written)} live pages")
+        print(f"   {'✅' if ok else '❌'} {os.path.basename(live_root)}: {status}")
+        if not ok:
+            return 1
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+Precompiled templates for the live stream-links pages (foot-holics-live/).
+
+generate_live_html used to rebuild a ~300-line f-string on every call — the
+static head, stylesheet links, widget markup and inline script included — and
+grew the stream buttons with `+=`. The page is now split, once at import, into
+its static segments and typed slots:
+
+    {{NAME}}        text: HTML-escaped (quotes too, so safe in attributes)
+    {{NAME|raw}}    trusted markup built by the bot (stream buttons, broadcast rows)
+    {{NAME|js}}     inside a single-quoted JavaScript string literal
+
+Template.render(values) appends each static segment and escaped slot value to
+a list and joins it once; every slot must be supplied. `python
+bench_live_html.py` measures pages/sec and bytes/page for a 15-link match.
+
+The sources are minified before they are split (minify.py: comments,
+indentation and script layout go; text and attributes stay), and presentation
+lives in the lp-* classes of LIVE_CSS rather than in repeated style=""
+attributes. Only display:none toggles that the page scripts flip stay inline.
+"""
+
+import html
+import json
+import re
+
+from minify import minify_html
+
+_SLOT_RE = re.compile(r"\{\{([A-Z0-9_]+)(?:\|(raw|js))?\}\}")
+
+
+def escape_text(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def escape_js(value) -> str:
+    # JSON string escaping, plus the quote of the surrounding literal and "</script"
+    return json.dumps(str(value), ensure_ascii=False)[1:-1].replace("'", "\\'").replace("<", "\\u003c")
+
+
+ESCAPERS = {"text": escape_text, "raw": str, "js": escape_js}
+
+
+class Template:
+    """Static segments and typed slots of one page, split once."""
+
+    __slots__ = ("statics", "slots")
+
+    def __init__(self, source: str):
+        self.statics = []           # len(slots) + 1 literal segments
+        self.slots = []             # (name, escape function)
+        pos = 0
+        for m in _SLOT_RE.finditer(source):
+            self.statics.append(source[pos:m.start()])
+            self.slots.append((m.group(1), ESCAPERS[m.group(2) or "text"]))
+            pos = m.end()
+        self.statics.append(source[pos:])
+
+    @property
+    def names(self) -> set:
+        return {name for name, _ in self.slots}
+
+    def render(self, values: dict) -> str:
+        statics = self.statics
+        parts = [statics[0]]
+        for i, (name, escape) in enumerate(self.slots, 1):
+            parts.append(escape(values[name]))
+            parts.append(statics[i])
+        return "".join(parts)
+
+
+STREAM_BUTTON_SOURCE = """
+            <a href="{{URL}}" class="stream-link-btn">
+                <div class="stream-play-icon">
+                    <i class="fa-solid fa-play"></i>
+                </div>
+                <div class="stream-link-info">
+                    <span class="stream-link-label">Link {{NUMBER}}</span>
+                    <span class="stream-link-sub">{{SUB}}</span>
+                </div>
+                <span class="stream-quality-badge">{{QUALITY}}</span>
+            </a>"""
+
+
+LIVE_PAGE_SOURCE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="preconnect" href="https://footholics.in">
+    <link rel="preconnect" href="https://footholics.in" crossorigin>
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>{{POSTER_HINT|raw}}
+    <meta name="monetag" content="4d7372eaeef870ded80928fe202a33e8">
+    <script src="https://quge5.com/88/tag.min.js" data-zone="248733" async data-cfasync="false" onerror="window.__fhAdScriptFailed=1"></script>
+    <script src="{{LIVE_CORE_JS_URL}}" defer></script>
+    <meta name="robots" content="noindex, nofollow">
+    <meta name="description" content="Watch {{HOME_TEAM}} vs {{AWAY_TEAM}} live — {{LEAGUE}} on {{DATE_LONG}}. Multiple stream links available.">
+    <meta property="og:title" content="{{MATCH_NAME}} — Watch Live Stream">
+    <meta property="og:description" content="Watch {{MATCH_NAME}} live online. {{LEAGUE}} — {{DATE_LONG}}.">
+    <meta property="og:type" content="website">
+    <meta property="og:image" content="{{POSTER_URL}}">
+    <meta name="twitter:card" content="summary_large_image">
+    <title>{{MATCH_NAME}} Live Stream — {{LEAGUE}} | Foot Holics</title>
+    <link rel="canonical" href="https://live.footholics.in/{{SLUG}}">
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css" integrity="sha512-DTOQO9RWCH3ppGqcWaEA1BIZOC6xxalwEsw9c2QQeAIftl+Vegovlnee1c9QX4TctnWMn13TZye+giMm8e2LwA==" crossorigin="anonymous" referrerpolicy="no-referrer" />
+    <link rel="stylesheet" href="{{LIVE_CSS_URL}}">
+    <link rel="icon" type="image/png" href="https://footholics.in/assets/img/logos/site/logo.png">
+    <script src="{{LIVE_MATCH_JS_URL}}" defer></script>
+</head>
+<body>
+    <header class="live-header">
+        <div class="container">
+            <div class="live-header-inner">
+                <a href="https://footholics.in" class="live-logo">
+                    <img src="https://footholics.in/assets/img/logos/site/logo.png" alt="Foot Holics" onerror="this.style.display=\'none\'">
+                    Foot Holics
+                </a>
+                <a href="/detail?slug={{SLUG}}" class="back-link">
+                    <i class="fa-solid fa-arrow-left lp-back-icon"></i>
+                    Match Preview
+                </a>
+            </div>
+        </div>
+    </header>
+
+    <div class="container">
+        <div class="match-hero">
+            <div class="lp-hero-tags">
+                <span class="live-badge-pill" id="liveBadge" style="display:none;">
+                    <span class="live-dot"></span>
+                    LIVE NOW
+                </span>
+                <span class="league-tag">{{LEAGUE}}</span>
+            </div>
+            <div class="teams-row">
+                <div class="team-block">
+                    <img src="{{HOME_LOGO}}" alt="{{HOME_TEAM}}" onerror="this.outerHTML=\'<div class=&quot;team-logo-placeholder&quot;>⚽</div>\'">
+                    <span class="team-name-text">{{HOME_TEAM}}</span>
+                </div>
+                <div class="vs-text">vs</div>
+                <div class="team-block">
+                    <img src="{{AWAY_LOGO}}" alt="{{AWAY_TEAM}}" onerror="this.outerHTML=\'<div class=&quot;team-logo-placeholder&quot;>⚽</div>\'">
+                    <span class="team-name-text">{{AWAY_TEAM}}</span>
+                </div>
+            </div>
+            <div class="match-meta-row">
+                <span><i class="fa-regular fa-calendar lp-accent"></i> {{DATE_LONG}}</span>
+                <span><i class="fa-regular fa-clock lp-accent"></i> {{TIME}} IST</span>
+                <span><i class="fa-solid fa-location-dot lp-accent"></i> {{STADIUM}}</span>
+            </div>
+        </div>
+
+        <!-- ── LIVE SCORE WIDGET ──────────────────────────────────────────── -->
+        <div id="liveScoreWidget" class="lp-score" style="display:none;">
+            <div id="liveScoreStatus" class="lp-score-status"></div>
+            <div id="liveScoreValue" class="lp-score-value"></div>
+        </div>
+
+        <!-- ── MATCH DATA WIDGET (Timeline + Tabs) ───────────────────────── -->
+        <div id="matchDataSection" class="lp-match-data" style="display:none;">
+            <div id="mdTimeline" class="md-timeline" style="display:none;">
+                <div class="tl-header">Match Timeline</div>
+                <div class="tl-track">
+                    <div class="tl-line"></div>
+                    <div class="tl-ht" style="left:50%"></div>
+                </div>
+                <div class="tl-minute-labels"><span>0'</span><span>45'</span><span>90'</span></div>
+            </div>
+            <div class="md-panel">
+                <div class="md-tabs">
+                    <button class="md-tab active" onclick="mdTab(this,'mdStats')">Stats</button>
+                    <button class="md-tab" onclick="mdTab(this,'mdLineups')">Lineups</button>
+                    <button class="md-tab" onclick="mdTab(this,'mdFormation')">Formation</button>
+                    <button class="md-tab" onclick="mdTab(this,'mdCommentary')">Commentary</button>
+                </div>
+                <div id="mdStats" class="md-pane"></div>
+                <div id="mdLineups" class="md-pane" style="display:none;"></div>
+                <div id="mdFormation" class="md-pane" style="display:none;"></div>
+                <div id="mdCommentary" class="md-pane" style="display:none;"></div>
+            </div>
+        </div>
+
+        <p class="stream-section-title">Watch {{HOME_TEAM}} vs {{AWAY_TEAM}} Live</p>
+
+        <div class="stream-links-list">
+{{STREAM_LINKS|raw}}
+        </div>
+
+        <p class="stream-note">
+            <i class="fa-solid fa-circle-info lp-accent"></i>
+            If one stream is down, try the next link. Streams go live ~15 minutes before kickoff.
+        </p>
+
+        <div class="community-row lp-community">
+            <a href="https://t.me/+XyKdBR9chQpjM2I9" target="_blank" rel="noopener noreferrer" class="community-btn btn-telegram">
+                <i class="fa-brands fa-telegram"></i> Join Telegram for Updates
+            </a>
+            <a href="https://chat.whatsapp.com/KG7DBpC0BKv6bFtlzfOr2T" target="_blank" rel="noopener noreferrer" class="community-btn btn-whatsapp">
+                <i class="fa-brands fa-whatsapp"></i> WhatsApp Channel
+            </a>
+        </div>
+
+        <!-- ── MATCH INFO SECTION ────────────────────────────────────────── -->
+        <div class="lp-card lp-info">
+            <h2>Match Information</h2>
+            <div class="lp-info-grid">
+                <div><span>Competition</span><strong>{{LEAGUE}}</strong></div>
+                <div><span>Kickoff (IST)</span><strong>{{TIME}} IST</strong></div>
+                <div><span>Date</span><strong>{{DATE_LONG}}</strong></div>
+                <div><span>Venue</span><strong>{{STADIUM}}</strong></div>
+            </div>
+        </div>
+
+        <!-- ── OFFICIAL BROADCAST ────────────────────────────────────────── -->
+        <div class="lp-card">
+            <h2>Official Broadcast</h2>
+            <table class="lp-table">
+                <thead><tr>
+                    <th>Region</th>
+                    <th>Channel / Platform</th>
+                </tr></thead>
+                <tbody>{{BROADCAST_ROWS|raw}}</tbody>
+            </table>
+        </div>
+
+        <!-- ── MATCH PREVIEW ─────────────────────────────────────────────── -->
+        <div class="lp-card lp-preview">
+            <h2>Match Preview</h2>
+            <p class="lp-preview-text">{{PREVIEW}}</p>
+            <p class="lp-preview-more"><a href="/detail?slug={{SLUG}}">Full preview &amp; analysis &rarr;</a></p>
+        </div>
+
+        <div class="live-disclaimer">
+            <strong>Disclaimer:</strong> Foot Holics does not host any streaming content. All links point to third-party sources found publicly on the internet. We have no control over the availability or content of these streams. For takedown requests contact <a href="mailto:footholicsin@gmail.com" class="lp-accent">footholicsin@gmail.com</a>.
+        </div>
+    </div>
+
+    <footer class="live-footer">
+        <div class="container">
+            <nav class="footer-nav">
+                <a href="https://footholics.in">Home</a>
+                <a href="https://footholics.in/news.html">News</a>
+                <a href="https://footholics.in/fixtures.html">Fixtures</a>
+                <a href="https://footholics.in/standings.html">Standings</a>
+                <a href="https://footholics.in/contact.html">Contact</a>
+            </nav>
+            <p>&copy; 2026 Foot Holics. All rights reserved.</p>
+        </div>
+    </footer>
+
+    <div id="cookieBar" class="cookie-bar" style="display:none;">
+        <span>This site uses cookies. <a href="https://footholics.in/privacy.html" class="lp-accent">Privacy Policy</a></span>
+        <button onclick="document.getElementById(\'cookieBar\').style.display=\'none\';localStorage.setItem(\'lhCookieOk\',\'1\');">OK</button>
+    </div>
+
+    <script>
+    (function () {
+        // ── Live badge ───────────────────────────────────────────────────
+        var kickoffIST = new Date('{{DATE|js}}T{{TIME_24H|js}}:00+05:30');
+        function checkLive() {
+            var now = new Date();
+            var diff = (now - kickoffIST) / 60000;
+            var badge = document.getElementById('liveBadge');
+            if (!badge) return;
+            if (diff >= -15 && diff <= 120) badge.style.display = 'inline-flex';
+            else badge.style.display = 'none';
+        }
+        checkLive();
+        setInterval(checkLive, 60000);
+
+        // ── Live score widget ────────────────────────────────────────────
+        var scoreSlug = window.location.pathname.replace(/^\//, '').replace(/\/$/, '');
+        if (scoreSlug) {
+            function fetchScore() {
+                fetch('https://footholics.in/api/match-info?slug=' + encodeURIComponent(scoreSlug))
+                    .then(function(r) { return r.ok ? r.json() : null; })
+                    .then(function(info) {
+                        if (!info || !info.fixtureId) return null;
+                        return fetch('https://footholics.in/api/match-live?id=' + info.fixtureId)
+                            .then(function(r) { return r.ok ? r.json() : null; });
+                    })
+                    .then(function(d) {
+                        if (!d || !d.fixture) return;
+                        var gs = d.fixture.goals;
+                        var fs = d.fixture.fixture.status;
+                        renderMatchData(d);
+                        if (fs.short === 'NS' || fs.short === 'TBD') return;
+                        var widget = document.getElementById('liveScoreWidget');
+                        var statusEl = document.getElementById('liveScoreStatus');
+                        var scoreEl = document.getElementById('liveScoreValue');
+                        if (!widget) return;
+                        widget.style.display = 'block';
+                        scoreEl.textContent = (gs.home !== null ? gs.home : 0) + ' \u2013 ' + (gs.away !== null ? gs.away : 0);
+                        if (fs.short === 'FT' || fs.short === 'AET' || fs.short === 'PEN') {
+                            statusEl.innerHTML = '<span class="lp-status-ft">Full Time</span>';
+                        } else if (fs.short === 'HT') {
+                            statusEl.innerHTML = '<span class="lp-status-ht">Half Time</span>';
+                        } else {
+                            var min = fs.elapsed ? fs.elapsed + "\'" : '';
+                            statusEl.innerHTML = '<span class="lp-status-live"><span class="lp-live-dot"></span>LIVE ' + min + '</span>';
+                        }
+                    })
+                    .catch(function() {});
+            }
+            fetchScore();
+            setInterval(fetchScore, 10 * 60 * 1000); // refresh every 10 min
+        }
+
+        if (!localStorage.getItem('lhCookieOk')) {
+            document.getElementById('cookieBar').style.display = 'flex';
+        }
+    })();
+    </script>
+</body>
+</html>"""
+
+# Minified once here, so pages cost nothing extra to slim down (minify.py)
+STREAM_BUTTON = Template(minify_html(STREAM_BUTTON_SOURCE))
+LIVE_PAGE = Template(minify_html(LIVE_PAGE_SOURCE))
+
+
+# The lp-* classes the pages above use instead of inline styles. They live in
+# foot-holics-live/assets/css/live.css between these markers, kept there by the
+# bot (with_live_css); edit them here, not in live.css.
+LIVE_CSS_BEGIN = "/* ── live page classes: generated by foot-holics-bot (live_template.py) ── */"
+LIVE_CSS_END = "/* ── end of generated live page classes ── */"
+LIVE_CSS = """\
+.lp-back-icon{font-size:.75rem}
+.lp-hero-tags{display:flex;justify-content:center;gap:.75rem;margin-bottom:1rem;flex-wrap:wrap}
+.lp-accent{color:var(--accent)}
+.lp-score{background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1rem 1.5rem;margin-bottom:1.25rem;text-align:center}
+.lp-score-status{font-size:.72rem;font-weight:700;text-transform:uppercase;letter-spacing:1px;margin-bottom:.5rem}
+.lp-score-value{font-size:2.2rem;font-weight:700;letter-spacing:4px;line-height:1}
+.lp-status-ft{color:var(--muted)}
+.lp-status-ht{color:var(--accent)}
+.lp-status-live{display:inline-flex;align-items:center;gap:5px;color:#f87171}
+.lp-live-dot{width:7px;height:7px;background:#f87171;border-radius:50%;display:inline-block;animation:live-pulse 1.3s ease-in-out infinite}
+.lp-match-data{margin-bottom:1.25rem}
+.lp-community{margin-top:1.5rem}
+.lp-card{background:var(--panel);border:1px solid var(--glass-border);border-radius:var(--radius-sm);padding:1.25rem;margin-bottom:1.5rem}
+.lp-card h2{color:var(--accent);font-size:1rem;margin-bottom:.9rem}
+.lp-info{margin-top:1.5rem}
+.lp-info-grid{display:grid;grid-template-columns:1fr 1fr;gap:.65rem 1.25rem;font-size:.84rem}
+.lp-info-grid span{color:var(--muted);display:block;margin-bottom:.15rem}
+.lp-info-grid strong{color:var(--text)}
+.lp-table{width:100%;border-collapse:collapse;font-size:.82rem}
+.lp-table tr{border-bottom:1px solid var(--glass-border)}
+.lp-table th{text-align:left;padding:.35rem 0;color:var(--muted);font-weight:600}
+.lp-table td{padding:.4rem 0;color:var(--text)}
+.lp-table td+td{color:var(--muted)}
+.lp-preview h2{margin-bottom:.75rem}
+.lp-preview-text{color:var(--muted);font-size:.86rem;line-height:1.7}
+.lp-preview-more{margin-top:.75rem}
+.lp-preview-more a{color:var(--accent);font-size:.84rem;font-weight:600}
+"""
+
+
+def with_live_css(stylesheet: str) -> str:
+    """`stylesheet` (live.css) with the generated block replaced, or appended if missing."""
+    block = f"{LIVE_CSS_BEGIN}\n{LIVE_CSS}{LIVE_CSS_END}\n"
+    start = stylesheet.find(LIVE_CSS_BEGIN)
+    end = stylesheet.find(LIVE_CSS_END, start)
+    if start != -1 and end != -1:
+        return stylesheet[:start] + block + stylesheet[end + len(LIVE_CSS_END):].lstrip("\n")
+    if stylesheet and not stylesheet.endswith("\n"):
+        stylesheet += "\n"
+    return stylesheet + ("\n" if stylesheet else "") + block
@@ -0,0 +1,144 @@
+"""
+Content-preserving HTML / JavaScript minification for generated pages.
+
+Most of a live page's bytes were indentation, comments and the inline script's
+layout. minify_html() removes exactly that and nothing a visitor can see:
+
+    comments            dropped (conditional <!--[if ...]> ones kept)
+    text whitespace     each run of HTML whitespace becomes one space, or one
+                        newline if it contained one (so pages still diff by line)
+    tags                kept byte for byte — attribute values are never touched
+    <script>            inline code goes through minify_js()
+    <pre>, <textarea>,
+    <style>             kept byte for byte
+
+minify_js() drops comments (except /*! ... */) and collapses whitespace the
+same way, outside string, template and regular-expression literals. Newlines
+are kept, so automatic semicolon insertion can't change what the code means.
+
+Both are meant to run once over a template's source (live_template.py), not
+per page; slot markers like {{NAME}} pass through as ordinary text.
+"""
+
+import re
+
+_HTML_SPACE = re.compile(r"[ \t\n\r\f]+")
+# A tag, honouring quoted attribute values (which may contain "<" and ">")
+_TAG = r"""<[!/]?[A-Za-z](?:"[^"]*"|'[^']*'|[^'">])*>"""
+_HTML_TOKEN = re.compile(
+    r"(?P<comment><!--(?!\[if).*?-->)"
+    r"|(?P<raw>(?P<open><(?P<name>script|style|pre|textarea)\b(?:\"[^\"]*\"|'[^']*'|[^'\">])*>)"
+    r"(?P<body>.*?)(?P<close></(?P=name)\s*>))"
+    rf"|(?P<tag>{_TAG})",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# After one of these (or at the start) a "/" opens a regex literal, not a division
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw")
+
+
+def _space(run: str) -> str:
+    return "\n" if "\n" in run else " "
+
+
+def minify_html(source: str) -> str:
+    out, text, pos = [], [], 0
+
+    def flush_text():
+        # Text either side of a dropped comment collapses as one run
+        out.append(_HTML_SPACE.sub(lambda s: _space(s.group()), "".join(text)))
+        text.clear()
+
+    for m in _HTML_TOKEN.finditer(source):
+        text.append(source[pos:m.start()])
+        pos = m.end()
+        if m.group("comment"):
+            continue
+        flush_text()
+        if m.group("raw"):
+            body = m.group("body")
+            if m.group("name").lower() == "script" and body.strip():
+                body = "\n" + minify_js(body) + "\n"
+            out.append(m.group("open") + body + m.group("close"))
+        else:
+            out.append(m.group())
+    text.append(source[pos:])
+    flush_text()
+    return "".join(out).strip() + "\n"
+
+
+def _last_word(out: list) -> str:
+    text = "".join(out[-4:]).rstrip(" \n")
+    m = re.search(r"[A-Za-z_$][\w$]*$", text)
+    return m.group() if m else ""
+
+
+def minify_js(source: str) -> str:
+    out = []
+    i, n = 0, len(source)
+
+    def last() -> str:
+        for chunk in reversed(out):
+            stripped = chunk.rstrip(" \n")
+            if stripped:
+                return stripped[-1]
+        return ""
+
+    while i < n:
+        c = source[i]
+        if c in " \t\r\n\f":
+            j = i
+            while j < n and source[j] in " \t\r\n\f":
+                j += 1
+            ws = _space(source[i:j])
+            if ws == "\n":
+                while out and out[-1] == " ":
+                    out.pop()
+                if out and out[-1] != "\n":
+                    out.append("\n")
+            elif out and out[-1] not in (" ", "\n"):
+                out.append(" ")
+            i = j
+        elif source.startswith("//", i):
+            j = source.find("\n", i)
+            i = n if j == -1 else j
+        elif source.startswith("/*", i):
+            j = source.find("*/", i + 2)
+            j = n if j == -1 else j + 2
+            if source.startswith("/*!", i):
+                out.append(source[i:j])
+            i = j
+        elif c in "'\"`":
+            j = i + 1
+            while j < n and source[j] != c:
+                j += 2 if source[j] == "\\" else 1
+            out.append(source[i:j + 1])
+            i = j + 1
+        elif c == "/" and (last() in _REGEX_AFTER or last() == "" or _last_word(out) in _REGEX_KEYWORDS):
+            j, in_class = i + 1, False
+            while j < n and source[j] != "\n":
+                if source[j] == "\\":
+                    j += 2
+                    continue
+                if source[j] == "[":
+                    in_class = True
+                elif source[j] == "]":
+                    in_class = False
+                elif source[j] == "/" and not in_class:
+                    break
+                j += 1
+            j += 1
+            while j < n and source[j].isalpha():
+                j += 1          # flags
+            out.append(source[i:j])
+            i = j
+        else:
+            j = i + 1
+            while j < n and source[j] not in " \t\r\n\f'\"`/":
+                j += 1
+            out.append(source[i:j])
+            i = j
+    while out and out[-1] in (" ", "\n"):
+        out.pop()
+    return "".join(out)
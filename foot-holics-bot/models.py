@@ -0,0 +1,240 @@
+"""
+Typed, slotted model of an events.json entry.
+
+Events used to be plain dicts with camelCase keys ("homeTeam", "leagueSlug",
+"broadcast") looked up by string all over the bot. Event and Broadcast give
+them attributes, validate once when an entry is loaded (required fields,
+broadcast shape, numeric "streams"), and use __slots__ so the thousands of
+events the EventStore keeps resident cost a fraction of a dict each.
+
+    ev = Event.from_dict(raw)            # EventValidationError if invalid
+    ev.home_team, ev.league_slug, ev.broadcast[0].url
+    ev.to_dict()                         # the entry as loaded, plus any edits
+
+Event also answers ev["slug"], ev.get("status") and ev.update({...}) with the
+JSON key names, so storage code that works on raw entries handles both.
+safe_io.json_default serialises Event/Broadcast objects directly.
+
+A loaded event remembers its entry's key order, keys that were explicitly
+null, and the original spelling of values validation normalised ("streams":
+"3", broadcast entries with extra keys); to_dict() writes those back as long as
+the value wasn't changed, so a load → save round trip leaves the file alone.
+"""
+
+from datetime import timedelta, timezone
+
+# Match dates and times are India Standard Time (UTC+5:30)
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# (JSON key, attribute) in events.json order — see bot.generate_json
+FIELDS = (
+    ("id", "id"),
+    ("date", "date"),
+    ("time", "time"),
+    ("slug", "slug"),
+    ("title", "title"),
+    ("homeTeam", "home_team"),
+    ("awayTeam", "away_team"),
+    ("homeLogo", "home_logo"),
+    ("awayLogo", "away_logo"),
+    ("league", "league"),
+    ("leagueSlug", "league_slug"),
+    ("stadium", "stadium"),
+    ("poster", "poster"),
+    ("excerpt", "excerpt"),
+    ("status", "status"),
+    ("broadcast", "broadcast"),
+    ("streams", "streams"),
+)
+_ATTR = dict(FIELDS)
+
+REQUIRED_FIELDS = (
+    "id", "date", "time", "slug", "title",
+    "homeTeam", "awayTeam", "league", "leagueSlug",
+    "stadium", "poster", "excerpt", "status", "streams",
+)
+
+
+class EventValidationError(ValueError):
+    """An events.json entry is missing required fields or has malformed ones."""
+
+    def __init__(self, slug: str, missing: list = None, invalid: list = None):
+        self.slug = slug
+        self.missing = list(missing or [])
+        self.invalid = list(invalid or [])
+        problems = []
+        if self.missing:
+            problems.append(f"missing {self.missing}")
+        if self.invalid:
+            problems.append(f"invalid {self.invalid}")
+        super().__init__(f"{slug}: {', '.join(problems)}")
+
+
+class Broadcast:
+    """One stream slot: display name + (player-wrapped) URL, "#" when empty."""
+
+    __slots__ = ("name", "url")
+
+    def __init__(self, name: str = "", url: str = "#"):
+        self.name = name
+        self.url = url
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict):
+            raise TypeError(f"broadcast entry must be an object, got {type(data).__name__}")
+        return cls(data.get("name") or "", data.get("url") or "#")
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "url": self.url}
+
+    # Dict-style access for code written against the raw JSON
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def __eq__(self, other):
+        return isinstance(other, Broadcast) and (self.name, self.url) == (other.name, other.url)
+
+    def __repr__(self):
+        return f"Broadcast({self.name!r}, {self.url!r})"
+
+
+def _broadcast_list(value) -> list:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise TypeError("broadcast must be a list")
+    return [Broadcast.from_dict(b) for b in value]
+
+
+def _json_value(key: str, value):
+    if key == "broadcast" and isinstance(value, list):
+        return [b.to_dict() if isinstance(b, Broadcast) else b for b in value]
+    return value
+
+
+_KEY_ORDERS = {}
+
+
+class Event:
+    """One match. Absent optional fields are None; unknown keys go to `extra`."""
+
+    __slots__ = tuple(attr for _, attr in FIELDS) + ("extra", "_keys", "_raw")
+
+    def __init__(self, **attrs):
+        for _, attr in FIELDS:
+            setattr(self, attr, attrs.pop(attr, None))
+        self.extra = attrs.pop("extra", None) or None
+        self._keys = ()             # key order of the entry this was loaded from
+        self._raw = None            # JSON key -> (value as loaded, normalised value)
+        if attrs:
+            raise TypeError(f"unknown Event attributes: {sorted(attrs)}")
+        if self.broadcast is not None:
+            self.broadcast = _broadcast_list(self.broadcast)
+
+    @classmethod
+    def from_dict(cls, data: dict, strict: bool = True) -> "Event":
+        """Build an Event from an events.json entry.
+
+        strict=True raises EventValidationError for missing required fields or
+        malformed ones; strict=False keeps what it can (for reading old files).
+        """
+        if isinstance(data, cls):
+            return data
+        slug = data.get("slug") or "<no slug>"
+        ev = cls.__new__(cls)
+        ev.extra = {k: v for k, v in data.items() if k not in _ATTR} or None
+        keys = tuple(data)
+        ev._keys = _KEY_ORDERS.setdefault(keys, keys)      # shared between events
+        ev._raw = None
+        invalid = []
+        for key, attr in FIELDS:
+            value = raw = data.get(key)
+            if key == "broadcast" and value is not None:
+                try:
+                    value = _broadcast_list(value)
+                except TypeError:
+                    invalid.append(key)         # kept as-is when not strict
+            elif key == "streams" and value is not None and not isinstance(value, int):
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    invalid.append(key)
+            if value is not raw:
+                normalised = _json_value(key, value)
+                if normalised != raw:
+                    ev._raw = ev._raw or {}
+                    ev._raw[key] = (raw, normalised)
+            setattr(ev, attr, value)
+        if strict:
+            missing = [k for k in REQUIRED_FIELDS if data.get(k) is None]
+            if missing or invalid:
+                raise EventValidationError(slug, missing, invalid)
+        return ev
+
+    def missing_fields(self) -> list:
+        return [k for k in REQUIRED_FIELDS if getattr(self, _ATTR[k]) is None]
+
+    def to_dict(self) -> dict:
+        """The events.json entry: keys in the order loaded (new ones after, known
+        keys in canonical order), unchanged values as they were spelled."""
+        values = {key: _json_value(key, getattr(self, attr)) for key, attr in FIELDS}
+        if self.extra:
+            values.update(self.extra)
+        raw = self._raw or {}
+        out = {}
+        for key in self._keys:
+            if key in values:
+                value = values[key]
+                if key in raw and raw[key][1] == value:
+                    value = raw[key][0]
+                out[key] = value                # explicit nulls stay
+        for key, value in values.items():
+            if key not in out and value is not None:
+                out[key] = value
+        return out
+
+    # ── Dict-style access by JSON key ─────────────────────────────────────
+
+    def __getitem__(self, key):
+        attr = _ATTR.get(key)
+        if attr is None:
+            if self.extra and key in self.extra:
+                return self.extra[key]
+            raise KeyError(key)
+        value = getattr(self, attr)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def update(self, fields: dict) -> None:
+        """Apply JSON-keyed changes (broadcast entries may be dicts or Broadcasts)."""
+        for key, value in fields.items():
+            attr = _ATTR.get(key)
+            if attr is None:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+            elif key == "broadcast":
+                self.broadcast = _broadcast_list(value)
+            else:
+                setattr(self, attr, value)
+
+    def __repr__(self):
+        return f"Event({self.slug!r})"
@@ -0,0 +1,161 @@
+"""
+Precompressed .gz / .br siblings for published text artifacts.
+
+Live pages, article pages, events.json, articles/index.json, sitemap.xml and
+the derived JSON shards were only ever written uncompressed, so the origin
+compressed them again on every request. The Precompressor subscribes to
+safe_io (add_write_listener) and, whenever one of those files really changed,
+writes `<file>.gz` (gzip -9) and `<file>.br` (brotli quality 11) next to it —
+byte-for-byte reproducible, so unchanged input never produces a new sibling.
+Removing a file removes its siblings.
+
+Files rewritten or deleted while no Precompressor was listening (the
+maintenance CLIs before they started one, git pulls, hand edits) are caught by
+reconcile(), which the bot queues at start-up: it walks the roots, recompresses
+every source newer than its siblings and removes siblings whose source is gone.
+Only files that already have siblings are looked at, so hand-written pages
+never gain any.
+
+Compression runs on a single worker thread so bot handlers never wait for it;
+flush() blocks until the queue is drained (git_auto_push calls it so a commit
+carries the siblings of what it publishes).
+
+Brotli needs the optional `Brotli` package; without it only .gz is written (and
+stale .br siblings are removed rather than left to serve old bytes).
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from safe_io import atomic_write_bytes, remove_file
+from sitemap import options_from_env as sitemap_options
+
+try:
+    import brotli
+except ImportError:         # optional — .gz only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE = (".html", ".json", ".xml", ".js", ".css", ".txt", ".svg")
+SUFFIXES = (".gz", ".br")
+
+
+def site_excludes(roots: list, bot_dir: str) -> list:
+    """What a Precompressor over site `roots` must leave alone: the bot's own
+    folder, and sitemaps/ when SITEMAP_GZIP makes its children .xml.gz files
+    themselves (they'd look like siblings of a missing .xml)."""
+    exclude = [bot_dir]
+    if sitemap_options()[1]:
+        exclude += [os.path.join(r, "sitemaps") for r in roots if r]
+    return exclude
+
+
+class Precompressor:
+    """safe_io write listener that keeps .gz/.br siblings of files under `roots`."""
+
+    def __init__(self, roots: list, exclude: list = ()):
+        self.roots = [os.path.join(os.path.abspath(r), "") for r in roots if r]
+        self.exclude = [os.path.join(os.path.abspath(r), "") for r in exclude if r]
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="precompress")
+        self._lock = threading.Lock()
+        self._queued = set()
+        self._futures = set()
+        self._digests = {}          # source path -> sha256 its siblings were built from
+
+    def wants(self, path: str) -> bool:
+        return (path.endswith(COMPRESSIBLE)
+                and any(path.startswith(r) for r in self.roots)
+                and not any(path.startswith(x) for x in self.exclude))
+
+    def reconcile(self) -> None:
+        """Queue a scan that brings existing siblings in line with their sources."""
+        with self._lock:
+            future = self._executor.submit(self._scan)
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def __call__(self, path: str, removed: bool) -> None:
+        if not self.wants(path):
+            return
+        with self._lock:
+            if path in self._queued:
+                return              # the queued job will read the newest content
+            self._queued.add(path)
+            future = self._executor.submit(self._process, path)
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _process(self, path: str) -> None:
+        with self._lock:
+            self._queued.discard(path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            self._digests.pop(path, None)
+            for suffix in SUFFIXES:
+                remove_file(path + suffix)
+            return
+        try:
+            digest = hashlib.sha256(data).digest()
+            if self._digests.get(path) == digest and os.path.exists(path + ".gz"):
+                return
+            siblings = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                siblings[".br"] = brotli.compress(data, quality=11)
+            else:
+                remove_file(path + ".br")
+            for suffix, blob in siblings.items():
+                if not atomic_write_bytes(path + suffix, blob):
+                    os.utime(path + suffix)     # same bytes: mark it current for _scan()
+            self._digests[path] = digest
+        except Exception as e:
+            logger.error(f"Precompressing {path} failed: {e}", exc_info=True)
+
+    def _scan(self) -> None:
+        stale = orphans = 0
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"
+                               and not any(os.path.join(dirpath, d, "").startswith(x) for x in self.exclude)]
+                names = set(filenames)
+                for name in filenames:
+                    if not name.endswith(SUFFIXES):
+                        continue
+                    source = os.path.join(dirpath, name[:-3])
+                    if not self.wants(source):
+                        continue
+                    sibling = os.path.join(dirpath, name)
+                    if name[:-3] not in names:
+                        remove_file(sibling)
+                        orphans += 1
+                        continue
+                    try:
+                        if os.stat(source).st_mtime_ns <= os.stat(sibling).st_mtime_ns:
+                            continue
+                    except FileNotFoundError:
+                        continue    # removed meanwhile; its listener call handles it
+                    self(source, False)
+                    stale += 1
+        if stale or orphans:
+            logger.info(f"Precompressed siblings: {stale} stale refreshed, {orphans} orphans removed")
+
+    def flush(self, timeout: float = None) -> None:
+        """Wait for every queued compression to finish."""
+        while True:
+            with self._lock:
+                pending = set(self._futures)
+            if not pending:
+                return
+            wait(pending, timeout=timeout)
+            if timeout is not None:
+                return
@@ -8,24 +8,56 @@ longer injected into index.html, so the old index.html regeneration logic
 has been replaced with this JSON maintenance tool.
 
 Operations available:
-  --validate   Check all entries for required fields (default)
+  --validate   Check all entries against models.Event (default)
   --sort       Re-sort entries by date descending and write back
   --report     Print a summary of all events
-  --fix        Remove entries that are missing required fields
+  --fix        Remove entries that are missing (or have malformed) required fields
+
+--sort and --fix hold the same write lock as the bot (safe_io.artifact_lock)
+and replace events.json atomically, so they can run while the bot is up.
+With STORAGE_BACKEND=sqlite they read and write the bot's database instead,
+and events.json is re-exported from it. A pending data/events.journal
+(EVENTS_JOURNAL=1) is folded into events.json first.
+
+With EVENTS_SHARDED=1 only the hot month shards are processed; add --archive
+to include data/events/archive/ as well.
+
+--stream processes events.json (or the file given with --file) one event at a
+time instead of loading it whole: validation errors and report lines are
+printed as entries are read, --fix/--sort output is written incrementally, and
+--sort uses an external merge sort on date. Memory stays bounded however large
+the file is, e.g. for old archive dumps:
+
+    python regenerate_index_cards.py --stream --file events-2024.json --fix --sort
+
+--prune-days N is the retention sweep (see retention.py): every match dated
+more than N days ago is removed from the events registry (archive included),
+sitemap.xml, the site root, foot-holics-live/ and generated/ in one pass.
+--dry-run lists what would go; --commit makes one local commit per repo.
+
+With PRECOMPRESS=1 every mode that writes or deletes files also refreshes their
+.gz/.br siblings (precompress.py), as the bot does, before exiting or committing.
 """
 
-import json
+import atexit
+import contextlib
 import os
 import re
 import sys
 import argparse
 from datetime import datetime
 
-REQUIRED_FIELDS = [
-    "id", "date", "time", "slug", "title",
-    "homeTeam", "awayTeam", "league", "leagueSlug",
-    "stadium", "poster", "excerpt", "status", "streams",
-]
+from dotenv import load_dotenv
+
+from event_shards import ShardedBackend
+from event_store import EventStore, JsonFileBackend
+from event_stream import external_sort, iter_json_array, write_json_array
+from events_journal import compact_journal
+from models import Event, EventValidationError
+from precompress import Precompressor, site_excludes
+from retention import commit_paths, sweep
+from safe_io import add_write_listener, artifact_lock, atomic_writer, pop_changed
+from sqlite_store import SqliteEventBackend, database_from_env
 
 
 def get_project_root():
@@ -33,34 +65,96 @@ def get_project_root():
     return os.path.dirname(bot_dir)
 
 
-def load_events(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def find_live_root(root_dir):
+    """foot-holics-live/ (Docker mount or sibling checkout), or "" — as in bot.py."""
+    for candidate in ("/foot-holics-live",
+                      os.path.join(os.path.dirname(root_dir), "foot-holics-live")):
+        if os.path.isdir(candidate):
+            return candidate
+    return ""
+
+
+def env_flag(name):
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
+
+
+_precompressor = None
+
+
+def start_precompressor(root_dir, live_root):
+    """Keep .gz/.br siblings of what this run writes or deletes (PRECOMPRESS=1)."""
+    global _precompressor
+    roots = [root_dir, live_root]
+    bot_dir = os.path.dirname(os.path.abspath(__file__))
+    _precompressor = Precompressor(roots, exclude=site_excludes(roots, bot_dir))
+    add_write_listener(_precompressor)
+    atexit.register(_precompressor.flush)
+
+
+def open_backend(path, include_archive=False):
+    """Same storage the bot is configured for (see bot.py _event_backend)."""
+    db = database_from_env(get_project_root())
+    if db is not None:
+        return SqliteEventBackend(db)     # saves re-export events.json
+    if env_flag("EVENTS_SHARDED"):
+        return ShardedBackend(path, include_archive, int(os.getenv("ARCHIVE_AFTER_DAYS", "30") or 30))
+    return JsonFileBackend(path)
+
+
+def load_events(backend):
+    return backend.load()
 
 
-def save_events(path, events):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(events, f, indent=2, ensure_ascii=False)
+def save_events(backend, path, events):
+    backend.save(events)
+    changed = pop_changed(get_project_root())
+    if not changed:
+        print(f"✅ {path} already up to date — nothing written")
+        return
     print(f"✅ Saved {len(events)} events to {path}")
+    for changed_path in changed:
+        print(f"   ✎ {os.path.relpath(changed_path, get_project_root())}")
+
+
+def event_problems(ev):
+    """Missing / malformed required fields of one entry ([] if models.Event accepts it)."""
+    try:
+        Event.from_dict(ev)
+    except EventValidationError as e:
+        return e.missing + [f"{k} (malformed)" for k in e.invalid]
+    return []
 
 
 def validate_events(events):
+    """(index, slug, problems) for every entry models.Event rejects."""
     errors = []
     for i, ev in enumerate(events):
-        missing = [k for k in REQUIRED_FIELDS if k not in ev or ev[k] is None]
-        if missing:
-            errors.append((i, ev.get("slug", f"<entry {i}>"), missing))
+        problems = event_problems(ev)
+        if problems:
+            errors.append((i, ev.get("slug", f"<entry {i}>"), problems))
     return errors
 
 
+def date_key(ev):
+    """Normalised "YYYY-MM-DD" (or "" for a missing/bad date) — orders like the date."""
+    try:
+        return datetime.strptime(ev.get("date", "1970-01-01"), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return ""
+
+
 def sort_events(events):
-    def sort_key(ev):
-        try:
-            return datetime.strptime(ev.get("date", "1970-01-01"), "%Y-%m-%d")
-        except ValueError:
-            return datetime.min
+    return sorted(events, key=date_key, reverse=True)
+
 
-    return sorted(events, key=sort_key, reverse=True)
+def report_line(ev):
+    status_icon = {"live": "🔴", "upcoming": "🟡", "finished": "⚪"}.get(
+        (ev.get("status") or "").lower(), "❓"
+    )
+    return (
+        f"  {status_icon}  [{ev.get('date','')}] {ev.get('title','(no title)')}"
+        f"  ({ev.get('league','')})"
+    )
 
 
 def print_report(events):
@@ -68,55 +162,176 @@ def print_report(events):
     print(f"  events.json — {len(events)} entries")
     print(f"{'='*60}")
     for ev in events:
-        status_icon = {"live": "🔴", "upcoming": "🟡", "finished": "⚪"}.get(
-            ev.get("status", "").lower(), "❓"
-        )
-        print(
-            f"  {status_icon}  [{ev.get('date','')}] {ev.get('title','(no title)')}"
-            f"  ({ev.get('league','')})"
-        )
+        print(report_line(ev))
     print()
 
 
+def run_streaming(path, args):
+    """Single pass over `path` in bounded memory. Returns the number of invalid entries."""
+    stats = {"read": 0, "invalid": 0}
+
+    def entries():
+        for i, ev in enumerate(iter_json_array(path)):
+            stats["read"] += 1
+            if args.report:
+                print(report_line(ev))
+            problems = event_problems(ev)
+            if problems:
+                stats["invalid"] += 1
+                print(f"   ⚠️  [{i}] {ev.get('slug', f'<entry {i}>')}: missing {problems}")
+                if args.fix:
+                    continue
+            yield ev
+
+    if args.report:
+        print(f"\n{'='*60}\n  {os.path.basename(path)}\n{'='*60}")
+
+    if args.fix or args.sort:
+        events = entries()
+        if args.sort:
+            events = external_sort(events, key=date_key, reverse=True)
+        with atomic_writer(path) as out:
+            written = write_json_array(out, events)
+        if args.fix and stats["invalid"]:
+            print(f"🗑️  Removed {stats['invalid']} invalid entries")
+        if args.sort:
+            print("📅 Sorted by date descending")
+        if out.changed:
+            print(f"✅ Saved {written} events to {path}")
+        else:
+            print(f"✅ {path} already up to date — nothing written")
+    else:
+        for _ in entries():
+            pass
+
+    print(f"📂 Streamed {stats['read']} events from {path}")
+    if stats["invalid"]:
+        print(f"⚠️  {stats['invalid']} entries have missing or malformed required fields")
+    else:
+        print(f"✅ All {stats['read']} entries pass validation")
+    return stats["invalid"]
+
+
+def run_prune(root_dir, events_path, args):
+    """Retention sweep. Returns the process exit code."""
+    backend = open_backend(events_path, include_archive=True)
+    if type(backend) is JsonFileBackend and compact_journal(events_path):
+        print("🧾 Folded pending events.journal into events.json")
+    live_root = args.live_root or find_live_root(root_dir)
+    if not live_root:
+        print("⚠️  foot-holics-live/ not found — live pages won't be removed (use --live-root)")
+
+    expired, tx = sweep([EventStore(events_path, backend)], root_dir, live_root,
+                        args.prune_days, dry_run=args.dry_run)
+    if not expired:
+        print(f"✅ No matches older than {args.prune_days} days")
+        return 0
+    verb = "Would remove" if args.dry_run else "Removed"
+    print(f"🧹 {verb} {len(expired)} matches older than {args.prune_days} days:")
+    for ev in expired:
+        print(f"   [{ev.date}] {ev.slug}")
+    if tx is None:
+        return 0
+    print(f"   events: {len(tx.events_removed)}, sitemap URLs: {len(tx.sitemap_removed)}, "
+          f"files deleted: {len(tx.deleted)}")
+
+    if _precompressor is not None:
+        _precompressor.flush()      # siblings go into the same commit
+    changed = {repo: pop_changed(repo) for repo in (root_dir, live_root) if repo}
+    if not args.commit:
+        return 0
+    message = f"Retention: remove {len(expired)} matches older than {args.prune_days} days"
+    failed = False
+    for repo, paths in changed.items():
+        ok, status = commit_paths(repo, paths, message)
+        print(f"   {'✅' if ok else '❌'} {os.path.basename(repo)}: {status}")
+        failed |= not ok
+    return 1 if failed else 0
+
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--validate", action="store_true", help="Validate all entries (default behaviour)")
     parser.add_argument("--sort",     action="store_true", help="Re-sort entries by date descending and save")
     parser.add_argument("--report",   action="store_true", help="Print a summary of all events")
     parser.add_argument("--fix",      action="store_true", help="Remove entries with missing required fields and save")
+    parser.add_argument("--archive",  action="store_true", help="Include archived month shards (EVENTS_SHARDED)")
+    parser.add_argument("--stream",   action="store_true", help="Process one event at a time in bounded memory")
+    parser.add_argument("--file",     help="With --stream: events file to process (default data/events.json)")
+    parser.add_argument("--prune-days", type=int, metavar="N", help="Retention sweep: remove matches older than N days")
+    parser.add_argument("--dry-run",  action="store_true", help="With --prune-days: only list what would be removed")
+    parser.add_argument("--commit",   action="store_true", help="With --prune-days: one local git commit per repo")
+    parser.add_argument("--live-root", help="With --prune-days: foot-holics-live/ checkout (default: auto-detect)")
     args = parser.parse_args()
 
+    load_dotenv()
     root_dir    = get_project_root()
     events_path = os.path.join(root_dir, "data", "events.json")
+    if args.file and not args.stream:
+        parser.error("--file requires --stream")
+    if (args.dry_run or args.commit or args.live_root) and args.prune_days is None:
+        parser.error("--dry-run / --commit / --live-root require --prune-days")
+    if env_flag("PRECOMPRESS") and not args.dry_run:
+        start_precompressor(root_dir, args.live_root or find_live_root(root_dir))
 
-    if not os.path.exists(events_path):
+    if args.prune_days is not None:
+        if args.prune_days < 0:
+            parser.error("--prune-days must be >= 0")
+        sys.exit(run_prune(root_dir, events_path, args))
+
+    if args.stream:
+        path = os.path.abspath(args.file) if args.file else events_path
+        if not args.file:
+            if database_from_env(root_dir) is not None or env_flag("EVENTS_SHARDED"):
+                parser.error("--stream works on a plain JSON file; with STORAGE_BACKEND=sqlite "
+                             "or EVENTS_SHARDED=1 pass --file explicitly")
+            if compact_journal(events_path):
+                print("🧾 Folded pending events.journal into events.json")
+        if not os.path.exists(path):
+            print(f"❌ {path} not found")
+            sys.exit(1)
+        with artifact_lock() if (args.sort or args.fix) else contextlib.nullcontext():
+            invalid = run_streaming(path, args)
+        if invalid and not any([args.report, args.sort, args.fix]):
+            sys.exit(1)
+        return
+
+    backend     = open_backend(events_path, args.archive)
+
+    if type(backend) is JsonFileBackend and compact_journal(events_path):
+        print("🧾 Folded pending events.journal into events.json")
+
+    if not backend.exists():
         print(f"❌ events.json not found at {events_path}")
         sys.exit(1)
 
-    events = load_events(events_path)
-    print(f"📂 Loaded {len(events)} events from {events_path}")
+    # A mutating run keeps the lock from load to save so the bot can't slip a
+    # write in between (which this run would then silently overwrite).
+    with artifact_lock() if (args.sort or args.fix) else contextlib.nullcontext():
+        events = load_events(backend)
+        print(f"📂 Loaded {len(events)} events from {events_path}")
 
-    if args.report:
-        print_report(events)
+        if args.report:
+            print_report(events)
 
-    errors = validate_events(events)
-    if errors:
-        print(f"\n⚠️  {len(errors)} entries have missing required fields:")
-        for idx, slug, missing in errors:
-            print(f"   [{idx}] {slug}: missing {missing}")
-    else:
-        print(f"✅ All {len(events)} entries pass validation")
-
-    if args.fix and errors:
-        bad_indices = {i for i, _, _ in errors}
-        events = [ev for i, ev in enumerate(events) if i not in bad_indices]
-        print(f"🗑️  Removed {len(bad_indices)} invalid entries")
-        save_events(events_path, events)
-
-    if args.sort:
-        sorted_events = sort_events(events)
-        save_events(events_path, sorted_events)
-        print("📅 Sorted by date descending")
+        errors = validate_events(events)
+        if errors:
+            print(f"\n⚠️  {len(errors)} entries have missing or malformed required fields:")
+            for idx, slug, problems in errors:
+                print(f"   [{idx}] {slug}: missing {problems}")
+        else:
+            print(f"✅ All {len(events)} entries pass validation")
+
+        if args.fix and errors:
+            bad_indices = {i for i, _, _ in errors}
+            events = [ev for i, ev in enumerate(events) if i not in bad_indices]
+            print(f"🗑️  Removed {len(bad_indices)} invalid entries")
+            save_events(backend, events_path, events)
+
+        if args.sort:
+            sorted_events = sort_events(events)
+            save_events(backend, events_path, sorted_events)
+            print("📅 Sorted by date descending")
 
     if not any([args.report, args.sort, args.fix]):
         # Default: just validate (already done above)
@@ -0,0 +1,95 @@
+"""
+Render cache for the live stream-links pages.
+
+Saving a match through the update flow always re-rendered its live page and
+rewrote it in foot-holics-live/, even when nothing the page shows had changed.
+RenderCache remembers, per page file, a fingerprint of the inputs it was
+rendered from — a SHA-256 over the canonical JSON of the match fields
+generate_live_html consumes, plus a renderer version (template, broadcaster
+table, slot-building code, asset URLs, team logo folders). When the fingerprint
+matches and the page is still on disk the caller skips both rendering and
+writing.
+
+The map is kept in foot-holics-bot/.render-cache.json (never pushed), so a
+restarted bot doesn't re-render everything:
+
+    {"version": 1, "pages": {"<file>.html": "<sha256 hex>"}}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from safe_io import atomic_write_json, json_default
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of JSON-serialisable `parts` (key order doesn't matter)."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=json_default)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """{page file: fingerprint of its inputs}, persisted to `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pages = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable render cache {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != VERSION:
+            return {}
+        return dict(data.get("pages") or {})
+
+    def fresh(self, key: str, digest: str, output_path: str) -> bool:
+        """Was `output_path` rendered from inputs with this fingerprint (and is it still there)?"""
+        with self._lock:
+            if self._pages.get(key) != digest:
+                return False
+        return os.path.exists(output_path)
+
+    def store(self, key: str, digest: str) -> None:
+        with self._lock:
+            if self._pages.get(key) == digest:
+                return
+            self._pages[key] = digest
+            pages = dict(sorted(self._pages.items()))
+        self._save(pages)
+
+    def store_many(self, digests: dict) -> None:
+        """store() for a whole batch {key: digest}, persisted once."""
+        with self._lock:
+            if all(self._pages.get(k) == d for k, d in digests.items()):
+                return
+            self._pages.update(digests)
+            pages = dict(sorted(self._pages.items()))
+        self._save(pages)
+
+    def forget(self, *keys: str) -> None:
+        """Drop the entries of deleted pages, persisted once."""
+        with self._lock:
+            if not [self._pages.pop(key) for key in keys if key in self._pages]:
+                return
+            pages = dict(sorted(self._pages.items()))
+        self._save(pages)
+
+    def _save(self, pages: dict) -> None:
+        try:
+            atomic_write_json(self.path, {"version": VERSION, "pages": pages})
+        except OSError as e:
+            logger.warning(f"Could not persist render cache {self.path}: {e}")
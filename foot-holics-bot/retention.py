@@ -0,0 +1,125 @@
+"""
+Retention sweep: remove every match older than N days in one pass.
+
+Deleting old fixtures one at a time (🗑️ Delete Match) rewrites events.json,
+re-scans sitemap.xml, deletes a handful of files and pushes both repos — per
+match. sweep() selects all matches whose date is more than `days` before today
+(IST) and removes, in a single SiteTransaction:
+
+  * their events entries (hot and, with EVENTS_SHARDED, archived)
+  * their sitemap.xml URLs
+  * <slug>.html in the site root and in foot-holics-live/
+  * generated/html_files/<slug>.html and generated/json_entries/<slug>.json
+
+so every artifact is written at most once and the caller makes one commit per
+repo. Matches whose status is still "live" are never swept.
+
+Used by the bot's "🧹 Retention Sweep" menu and by
+`regenerate_index_cards.py --prune-days N`.
+"""
+
+import os
+import subprocess
+from datetime import datetime, timedelta
+
+from event_store import canonical_slug, file_slug
+from models import IST
+from site_transaction import SiteTransaction
+
+SITE_URL = "https://footholics.in"
+
+
+def cutoff_date(days: int, now: datetime = None) -> str:
+    """"YYYY-MM-DD": matches dated before this are older than `days` days."""
+    now = now or datetime.now(IST)
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def expired_events(stores: list, days: int, now: datetime = None) -> list:
+    """Events (across all `stores`, each once) dated more than `days` days ago."""
+    cutoff = cutoff_date(days, now)
+    seen, expired = set(), []
+    for store in stores:
+        for ev in store.all():
+            slug = canonical_slug(ev.slug or "")
+            if (not slug or slug in seen or not ev.date or ev.date >= cutoff
+                    or (ev.status or "").lower() == "live"):
+                continue
+            seen.add(slug)
+            expired.append(ev)
+    return sorted(expired, key=lambda ev: ev.date)
+
+
+def match_paths(root_dir: str, live_root: str, slug: str) -> list:
+    """Every file a match owns, in the main repo and (if present) foot-holics-live.
+
+    Empty for a slug that can't be a file name ("../x", "a/b"): it owns no files,
+    and joining it would point outside the repo.
+    """
+    slug = file_slug(slug)
+    if slug is None:
+        return []
+    bot_dir = os.path.join(root_dir, "foot-holics-bot", "generated")
+    paths = [
+        os.path.join(root_dir, f"{slug}.html"),
+        os.path.join(bot_dir, "html_files", f"{slug}.html"),
+        os.path.join(bot_dir, "json_entries", f"{slug}.json"),
+    ]
+    if live_root:
+        paths.append(os.path.join(live_root, f"{slug}.html"))
+    return paths
+
+
+def sweep(stores: list, root_dir: str, live_root: str, days: int, dry_run: bool = False):
+    """Remove matches older than `days` from every artifact.
+
+    Returns (expired events, committed SiteTransaction — None on a dry run or
+    when nothing is old enough).
+    """
+    expired = expired_events(stores, days)
+    if dry_run or not expired:
+        return expired, None
+    with SiteTransaction(stores, root_dir) as tx:
+        for ev in expired:
+            tx.remove_event(ev.slug)
+            tx.remove_sitemap_url(f"{SITE_URL}/{canonical_slug(ev.slug)}.html")
+            for path in match_paths(root_dir, live_root, ev.slug):
+                tx.delete_file(path)
+    return expired, tx
+
+
+def commit_paths(repo_path: str, paths: list, message: str) -> tuple:
+    """Stage exactly `paths` (written or deleted) in repo_path and make one local commit.
+
+    Returns (success, status) like bot.git_auto_push. Pushing is left to the bot.
+    """
+    root = os.path.join(os.path.abspath(repo_path), "")
+    rel = [os.path.relpath(p, root) for p in paths if os.path.abspath(p).startswith(root)]
+    if not rel:
+        return True, "nothing to commit"
+    git = ["git", "-c", f"safe.directory={repo_path}", "-C", repo_path]
+    try:
+        # Deleted paths can only be staged if git tracked them
+        r = subprocess.run(git + ["ls-files", "-z", "--"] + rel, capture_output=True, text=True, timeout=30)
+        if r.returncode != 0:
+            return False, f"not a git repository: {r.stderr.strip()[:200]}"
+        tracked = set(r.stdout.split("\0"))
+        stage = [p for p in rel if p in tracked or os.path.exists(os.path.join(root, p))]
+        if not stage:
+            return True, "nothing to commit"
+        r = subprocess.run(git + ["add", "-A", "--"] + stage, capture_output=True, text=True, timeout=30)
+        if r.returncode != 0:
+            return False, f"git add failed: {r.stderr.strip()}"
+        # Same fallback identity as the bot when none is configured (e.g. Docker)
+        r = subprocess.run(git + ["config", "user.email"], capture_output=True, text=True, timeout=10)
+        identity = [] if r.stdout.strip() else [
+            "-c", "user.name=footholics-bot", "-c", "user.email=bot@users.noreply.github.com"]
+        r = subprocess.run(git[:-2] + identity + git[-2:] + ["commit", "-m", message, "--"] + stage,
+                           capture_output=True, text=True, timeout=30)
+        if r.returncode != 0:
+            if "nothing to commit" in r.stdout + r.stderr or "no changes added" in r.stdout + r.stderr:
+                return True, "nothing to commit"
+            return False, f"git commit failed: {r.stderr.strip()}"
+        return True, "committed"
+    except subprocess.TimeoutExpired:
+        return False, "timed out"
@@ -0,0 +1,301 @@
+"""
+Crash-safe file writes and a cross-process lock for the site's artifacts.
+
+events.json, articles/index.json, articles/meta/*.json and sitemap.xml used to
+be rewritten in place with open(..., "w"): a crash, or regenerate_index_cards.py
+running at the same moment as the bot, could leave a truncated file behind.
+
+  atomic_write_text / atomic_write_json
+      write to a temp file in the same directory, fsync it, then os.replace()
+      it over the target — readers see either the old or the new file, never
+      half of one.
+
+  atomic_writer(path)
+      the same, for output produced piece by piece (streamed maintenance runs)
+      that should never be held in memory whole.
+
+  artifact_lock()
+      advisory lock on foot-holics-bot/.write.lock shared by bot.py and
+      regenerate_index_cards.py. Hold it around any read-modify-write of a
+      shared artifact. Re-entrant within a thread, so helpers that take it can
+      call each other freely.
+
+Writes are skipped when the bytes on disk are already identical (compared by
+SHA-256, with digests cached per path and revalidated by mtime/size), so
+unchanged files keep their mtime and `git add .` has nothing to do. Every
+write/remove that did change something is recorded; pop_changed(root) hands
+those paths to the push step, which can skip git entirely when it is empty.
+add_write_listener(fn) additionally calls fn(path, removed) for each of them
+(used by precompress.py and asset_manifest.py); listeners must be quick and
+must not raise. file_digest(path) returns a file's SHA-256 from that cache.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl            # Linux / macOS / Docker
+except ImportError:         # pragma: no cover — Windows
+    fcntl = None
+try:
+    import msvcrt           # Windows
+except ImportError:
+    msvcrt = None
+
+LOCK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".write.lock")
+
+_thread_lock = threading.RLock()
+_local = threading.local()
+_lock_fd = None
+
+_digests = {}               # abs path -> (st_mtime_ns, st_size, sha256) of what's on disk
+_changed = set()            # abs paths written / removed since the last pop_changed()
+_state_lock = threading.Lock()
+_write_listeners = []
+
+
+def _os_lock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+
+def _os_unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def artifact_lock():
+    """Exclusive lock shared by every process that writes site artifacts."""
+    global _lock_fd
+    with _thread_lock:                      # serialise threads in this process
+        depth = getattr(_local, "depth", 0)
+        if depth == 0:
+            _lock_fd = os.open(LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _os_lock(_lock_fd)
+            except Exception:
+                os.close(_lock_fd)
+                _lock_fd = None
+                raise
+        _local.depth = depth + 1
+        try:
+            yield
+        finally:
+            _local.depth -= 1
+            if _local.depth == 0:
+                try:
+                    _os_unlock(_lock_fd)
+                finally:
+                    os.close(_lock_fd)
+                    _lock_fd = None
+
+
+def _fsync_dir(directory: str) -> None:
+    """Persist the rename itself (POSIX only; a no-op where unsupported)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _on_disk_digest(path: str, size: int):
+    """SHA-256 of the current file if it is `size` bytes long, else None (differs)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if st.st_size != size:
+        return None
+    with _state_lock:
+        cached = _digests.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.digest()
+    with _state_lock:
+        _digests[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def file_digest(path: str):
+    """(sha256, size, mtime_ns) of the file at `path`, or None if it doesn't exist.
+
+    Reuses the digest cached by the last write while mtime and size still match.
+    """
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    digest = _on_disk_digest(path, st.st_size)
+    if digest is None:
+        return None
+    return digest, st.st_size, st.st_mtime_ns
+
+
+def atomic_write_bytes(path: str, data: bytes) -> bool:
+    """Replace `path` with `data` atomically (temp file + fsync + os.replace).
+
+    Returns False — without touching the file — if it already holds `data`.
+    """
+    path = os.path.abspath(path)
+    digest = hashlib.sha256(data).digest()
+    if _on_disk_digest(path, len(data)) == digest:
+        return False
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    _fsync_dir(directory)
+    st = os.stat(path)
+    _record_change(path, (st.st_mtime_ns, st.st_size, digest))
+    return True
+
+
+class _HashingWriter:
+    """Text sink for atomic_writer(): encodes, hashes and counts as it writes."""
+
+    def __init__(self, f, encoding: str):
+        self._f = f
+        self._encoding = encoding
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.changed = None         # set on exit: did the file on disk change?
+
+    def write(self, text: str) -> None:
+        data = text.encode(self._encoding)
+        self._hash.update(data)
+        self.size += len(data)
+        self._f.write(data)
+
+    def digest(self) -> bytes:
+        return self._hash.digest()
+
+
+@contextlib.contextmanager
+def atomic_writer(path: str, encoding: str = "utf-8"):
+    """Stream text into a temp file that replaces `path` atomically on success.
+
+    Like atomic_write_text, the target is left untouched when the streamed
+    content turns out to be identical. If the block raises, nothing is replaced.
+    """
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=1 << 20) as f:
+            writer = _HashingWriter(f, encoding)
+            yield writer
+            f.flush()
+            os.fsync(f.fileno())
+        digest = writer.digest()
+        if _on_disk_digest(path, writer.size) == digest:
+            os.remove(tmp)
+            writer.changed = False
+            return
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    _fsync_dir(directory)
+    st = os.stat(path)
+    _record_change(path, (st.st_mtime_ns, st.st_size, digest))
+    writer.changed = True
+
+
+def remove_file(path: str) -> bool:
+    """os.remove() that records the change. False if the file wasn't there."""
+    path = os.path.abspath(path)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    _record_change(path, None)
+    return True
+
+
+def _record_change(path: str, digest_entry) -> None:
+    """Remember a real write (digest_entry = (mtime_ns, size, sha256)) or removal (None)."""
+    with _state_lock:
+        if digest_entry is None:
+            _digests.pop(path, None)
+        else:
+            _digests[path] = digest_entry
+        _changed.add(path)
+    for fn in list(_write_listeners):
+        fn(path, digest_entry is None)
+
+
+def add_write_listener(fn) -> None:
+    """Call fn(path, removed) after every write/remove that changed a file."""
+    if fn not in _write_listeners:
+        _write_listeners.append(fn)
+
+
+def pop_changed(root: str = None) -> list:
+    """Paths changed (under `root`, if given) since the last call, and forget them."""
+    root = os.path.join(os.path.abspath(root), "") if root else ""
+    with _state_lock:
+        hits = sorted(p for p in _changed if p.startswith(root))
+        _changed.difference_update(hits)
+    return hits
+
+
+def atomic_write_text(path: str, text: str, encoding: str = "utf-8") -> bool:
+    return atomic_write_bytes(path, text.encode(encoding))
+
+
+def json_default(obj):
+    """json.dumps hook: serialise model objects (models.Event / Broadcast) via to_dict()."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def atomic_write_json(path: str, obj, indent: int = 2, ensure_ascii: bool = False) -> bool:
+    """Atomic json.dump with the repo's usual formatting (indent=2, UTF-8)."""
+    return atomic_write_text(path, json.dumps(obj, indent=indent, ensure_ascii=ensure_ascii, default=json_default))
@@ -0,0 +1,208 @@
+"""
+Inverted search index over matches and articles: data/search-index.json.
+
+Site search used to download events.json and the articles index and scan every
+title in the browser. The bot now keeps a small prebuilt index instead:
+
+    {
+      "version": 1,
+      "docs":  [[kind, title, meta, url], ...],     kind "e" (match) / "a" (article),
+                                                    url site-absolute; a freed slot is null
+      "terms": {token: [id, gap, gap, ...], ...}    ids ascending, delta-encoded
+    }
+
+Matches are indexed on title, homeTeam, awayTeam, league, stadium and date;
+articles on title, excerpt, category and date. A date is indexed as its digits
+and month name ("2026-06-14" → 2026, 06, 14, june). Tokens are lower-cased,
+accent-folded runs of letters/digits; one-character tokens and a few stop words
+are dropped. A query is a lookup per token (a binary search of the sorted term
+list for the one being typed) and an intersection of the decoded posting lists.
+
+SearchIndex is an EventStore listener (see EventStore.add_listener) and is
+told about the articles index via sync_articles(). Only documents that changed
+are re-tokenized, and only the posting lists of their tokens re-encoded; ids
+are stable, and freed ones are reused. The file is written once both matches
+and articles are known.
+"""
+
+import heapq
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime
+
+from event_store import canonical_slug
+from event_views import changed_slugs
+from safe_io import atomic_write_text
+
+EVENT_FIELDS = ("title", "homeTeam", "awayTeam", "league", "stadium", "date")
+ARTICLE_FIELDS = ("title", "excerpt", "category", "date")
+
+STOPWORDS = frozenset(("the", "and", "vs", "of", "in", "at", "to", "for", "on", "an", "is", "a"))
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+SITE_URL = "https://footholics.in"
+
+
+def tokenize(text: str) -> set:
+    """"Atlético vs Real Madrid" → {"atletico", "real", "madrid"}."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return {t for t in _TOKEN_RE.findall(text) if len(t) > 1 and t not in STOPWORDS}
+
+
+def delta_encode(ids) -> list:
+    out, prev = [], 0
+    for i in sorted(ids):
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def delta_decode(gaps: list) -> list:
+    out, total = [], 0
+    for gap in gaps:
+        total += gap
+        out.append(total)
+    return out
+
+
+def _field_text(entry, field: str) -> str:
+    value = str(entry.get(field) or "")
+    if field == "date":
+        try:
+            value += datetime.strptime(value, "%Y-%m-%d").strftime(" %B")
+        except ValueError:
+            pass
+    return value
+
+
+def _event_doc(ev):
+    slug = canonical_slug(ev.get("slug") or "")
+    meta = " · ".join(x for x in (ev.get("league"), ev.get("date")) if x)
+    row = ["e", ev.get("title") or slug, meta, f"/{slug}.html"]
+    return row, " ".join(_field_text(ev, f) for f in EVENT_FIELDS)
+
+
+def _article_doc(entry: dict):
+    url = entry.get("url") or f"/articles/{entry.get('slug')}.html"
+    if url.startswith(SITE_URL):
+        url = url[len(SITE_URL):]
+    meta = " · ".join(x for x in (entry.get("category"), entry.get("date")) if x)
+    row = ["a", entry.get("title") or entry.get("slug"), meta, url]
+    return row, " ".join(_field_text(entry, f) for f in ARTICLE_FIELDS)
+
+
+class SearchIndex:
+    """data/search-index.json for one data directory."""
+
+    def __init__(self, data_dir: str):
+        self.path = os.path.join(data_dir, "search-index.json")
+        self._ids = {}              # (kind, key) -> doc id
+        self._docs = []             # doc id -> row, or None when freed
+        self._free = []             # heap of freed ids
+        self._tokens = {}           # doc id -> tokens it is posted under
+        self._postings = {}         # token -> set of doc ids
+        self._encoded = {}          # token -> delta-encoded list (cache)
+        self._articles = None       # slug -> entry as last indexed
+        self._events_known = False
+
+    # ── documents ────────────────────────────────────────────────────────────
+
+    def _put(self, key: tuple, row: list, text: str) -> None:
+        doc_id = self._ids.get(key)
+        if doc_id is None:
+            doc_id = heapq.heappop(self._free) if self._free else len(self._docs)
+            if doc_id == len(self._docs):
+                self._docs.append(None)
+            self._ids[key] = doc_id
+        tokens = tokenize(text)
+        old = self._tokens.get(doc_id, set())
+        for token in old - tokens:
+            self._unpost(token, doc_id)
+        for token in tokens - old:
+            self._postings.setdefault(token, set()).add(doc_id)
+            self._encoded.pop(token, None)
+        self._docs[doc_id] = row
+        self._tokens[doc_id] = tokens
+
+    def _drop(self, key: tuple) -> None:
+        doc_id = self._ids.pop(key, None)
+        if doc_id is None:
+            return
+        for token in self._tokens.pop(doc_id, ()):
+            self._unpost(token, doc_id)
+        self._docs[doc_id] = None
+        heapq.heappush(self._free, doc_id)
+
+    def _unpost(self, token: str, doc_id: int) -> None:
+        ids = self._postings[token]
+        ids.discard(doc_id)
+        if not ids:
+            del self._postings[token]
+        self._encoded.pop(token, None)
+
+    # ── sources ──────────────────────────────────────────────────────────────
+
+    def __call__(self, events: list, changes) -> None:
+        if changes is None:
+            self.rebuild_events(events)
+        else:
+            self.apply(events, changes)
+
+    def rebuild_events(self, events: list) -> None:
+        """Re-index every match (and forget ones no longer listed)."""
+        seen = set()
+        for ev in events:
+            slug = canonical_slug(ev.slug or "")
+            if slug:
+                seen.add(("e", slug))
+                self._put(("e", slug), *_event_doc(ev))
+        for key in [k for k in self._ids if k[0] == "e" and k not in seen]:
+            self._drop(key)
+        self._events_known = True
+        self.write()
+
+    def apply(self, events: list, changes: list) -> None:
+        """Re-index only the matches an EventStore change list touched."""
+        slugs = changed_slugs(changes)
+        current = {canonical_slug(ev.slug or ""): ev for ev in events
+                   if canonical_slug(ev.slug or "") in slugs}
+        for slug in slugs:
+            if slug in current:
+                self._put(("e", slug), *_event_doc(current[slug]))
+            else:
+                self._drop(("e", slug))
+        self.write()
+
+    def sync_articles(self, articles: list) -> None:
+        """Bring the article documents in line with articles/index.json."""
+        entries = {a["slug"]: a for a in articles if a.get("slug")}
+        old = self._articles or {}
+        for slug in set(old) - set(entries):
+            self._drop(("a", slug))
+        for slug, entry in entries.items():
+            if old.get(slug) != entry:
+                self._put(("a", slug), *_article_doc(entry))
+        # Copies, so later in-place edits of the callers' dicts still show up as changes
+        self._articles = {slug: dict(entry) for slug, entry in entries.items()}
+        self.write()
+
+    # ── output ───────────────────────────────────────────────────────────────
+
+    def write(self) -> bool:
+        """Write the index once both sources are known. True if the file changed."""
+        if not self._events_known or self._articles is None:
+            return False
+        terms = {}
+        for token in sorted(self._postings):
+            encoded = self._encoded.get(token)
+            if encoded is None:
+                encoded = self._encoded[token] = delta_encode(self._postings[token])
+            terms[token] = encoded
+        docs = list(self._docs)
+        while docs and docs[-1] is None:
+            docs.pop()
+        payload = {"version": 1, "docs": docs, "terms": terms}
+        return atomic_write_text(self.path, json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
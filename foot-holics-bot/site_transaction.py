@@ -0,0 +1,164 @@
+"""
+One-shot transactions over the site's match artifacts.
+
+Editing or deleting a match touches several files: the events registry,
+sitemap.xml and the bot's generated/ entries. Done step by step, each helper
+re-read, re-parsed and re-wrote its own file, and a multi-field edit paid that
+cost once per field. A SiteTransaction queues the mutations and applies them
+on commit, under a single safe_io.artifact_lock():
+
+    with SiteTransaction(stores, root_dir) as tx:
+        tx.update_event(slug, {"title": ..., "stadium": ...})
+        tx.remove_sitemap_url("https://footholics.in/x.html")
+        tx.bump_sitemap_lastmod("https://footholics.in/", "2026-06-09")
+        tx.write_json(generated_path, lambda: tx.events_updated.get(slug))
+
+  * all event mutations run in one EventStore.batch() → one backend write
+  * sitemap URLs are upserted / removed / bumped in the shared parsed
+    Sitemap (sitemap.py) and saved once, if anything changed
+  * every other file is written (atomically) or deleted at most once —
+    the last write queued for a path wins; a write whose bytes match the file
+    on disk is skipped (safe_io) and not reported in `written`
+
+`stores` is a list of EventStores tried in order (hot view first, then the
+archive view), so a mutation lands wherever the event actually lives. After
+commit, events_updated / events_removed / sitemap_removed / sitemap_written /
+written / deleted say what actually happened. If the block raises, nothing is committed.
+"""
+
+import contextlib
+import os
+
+from safe_io import artifact_lock, atomic_write_json, atomic_write_text, remove_file
+from sitemap import forget_sitemap, get_sitemap
+
+
+class SiteTransaction:
+    """Queued mutations to events / sitemap.xml / files, applied once on commit."""
+
+    def __init__(self, stores: list, root_dir: str):
+        self.stores = list(stores)
+        self.root_dir = root_dir
+        self.sitemap_path = os.path.join(root_dir, "sitemap.xml")
+        self._event_ops = []
+        self._sitemap_ops = []
+        self._files = {}            # abs path -> (kind, content or callable)
+        self.committed = False
+        # Results, filled in by commit()
+        self.events_inserted = []
+        self.events_updated = {}    # slug -> updated event
+        self.events_removed = []
+        self.sitemap_removed = []
+        self.sitemap_written = []
+        self.written = []
+        self.deleted = []
+
+    # ── Queueing ──────────────────────────────────────────────────────────
+
+    def insert_event(self, event, index: int = 0) -> None:
+        self._event_ops.append(("insert", event, index))
+
+    def update_event(self, slug: str, fields: dict) -> None:
+        self._event_ops.append(("update", slug, fields))
+
+    def remove_event(self, slug: str) -> None:
+        self._event_ops.append(("remove", slug, None))
+
+    def remove_sitemap_url(self, loc: str) -> None:
+        self._sitemap_ops.append(("remove", loc, None))
+
+    def upsert_sitemap_url(self, loc: str, **fields) -> None:
+        """Add `loc` to the sitemap or update it (lastmod / changefreq / priority)."""
+        self._sitemap_ops.append(("upsert", loc, fields))
+
+    def bump_sitemap_lastmod(self, loc: str, lastmod: str) -> None:
+        """Set the lastmod of `loc` if it is in the sitemap."""
+        self._sitemap_ops.append(("bump", loc, lastmod))
+
+    def write_text(self, path: str, text) -> None:
+        """Queue a text write; `text` may be a callable run at commit (None = skip)."""
+        self._files[os.path.abspath(path)] = ("text", text)
+
+    def write_json(self, path: str, obj) -> None:
+        """Queue a JSON write; `obj` may be a callable run at commit (None = skip)."""
+        self._files[os.path.abspath(path)] = ("json", obj)
+
+    def delete_file(self, path: str) -> None:
+        self._files[os.path.abspath(path)] = ("delete", None)
+
+    # ── Commit ────────────────────────────────────────────────────────────
+
+    def commit(self) -> None:
+        if self.committed:
+            return
+        with artifact_lock():
+            self._commit_events()
+            self._commit_sitemap()
+            self._commit_files()
+        self.committed = True
+
+    def _commit_events(self) -> None:
+        if not self._event_ops:
+            return
+        with contextlib.ExitStack() as batches:
+            for store in self.stores:
+                batches.enter_context(store.batch())
+            for op, target, arg in self._event_ops:
+                if op == "insert":
+                    self.stores[0].insert(target, arg)
+                    self.events_inserted.append(target)
+                elif op == "update":
+                    for store in self.stores:
+                        ev = store.update(target, arg)
+                        if ev is not None:
+                            self.events_updated[target] = ev
+                            break
+                elif op == "remove":
+                    if any(store.remove(target) for store in self.stores):
+                        self.events_removed.append(target)
+
+    def _commit_sitemap(self) -> None:
+        if not self._sitemap_ops or not os.path.exists(self.sitemap_path):
+            return
+        sitemap = get_sitemap(self.root_dir)
+        try:
+            changed = False
+            for op, loc, arg in self._sitemap_ops:
+                if op == "remove":
+                    if sitemap.remove(loc):
+                        self.sitemap_removed.append(loc)
+                        changed = True
+                elif op == "upsert":
+                    changed |= sitemap.upsert(loc, **arg)
+                elif op == "bump":
+                    changed |= sitemap.bump_lastmod(loc, arg)
+            if changed:
+                self.sitemap_written = sitemap.save()
+        except BaseException:
+            forget_sitemap(self.root_dir)   # don't keep half-applied edits around
+            raise
+
+    def _commit_files(self) -> None:
+        for path, (kind, content) in self._files.items():
+            if kind == "delete":
+                if remove_file(path):
+                    self.deleted.append(path)
+                continue
+            if callable(content):
+                content = content()
+            if content is None:
+                continue
+            if kind == "json":
+                changed = atomic_write_json(path, content)
+            else:
+                changed = atomic_write_text(path, content)
+            if changed:
+                self.written.append(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
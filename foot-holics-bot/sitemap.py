@@ -0,0 +1,385 @@
+"""
+sitemap.xml as a data structure instead of a text file patched with regexes.
+
+Adding or deleting an article or match used to re.sub() DOTALL patterns over
+the whole of sitemap.xml — O(file) per edit, and one reformatted block away
+from silently matching nothing. Sitemap parses the file once into an ordered
+{loc: SitemapEntry} map; upsert / remove / bump_lastmod are dict operations,
+and save() serialises it deterministically:
+
+    static pages     in map order (the order they appear in the file)
+    articles         /articles/<slug>.html, newest lastmod first
+    matches          /<YYYY-MM-DD-...>.html, newest lastmod first
+
+A plain sitemap.xml that was loaded from disk is edited in place instead: the
+hand-written order, section comments and spacing stay, unchanged <url> blocks
+keep their bytes, removed ones drop out (with a section comment they leave
+empty), and new URLs go in next to their kind
+(articles and matches before the first one of their kind, pages after the last
+page, or a new labelled section at the end). Saving an unchanged file leaves it
+byte-for-byte alone.
+
+Up to `split_at` URLs everything goes into sitemap.xml as one <urlset>. Past
+that, sitemap.xml becomes a <sitemapindex> of per-type children
+sitemaps/{static,articles,matches}.xml (`-2`, `-3`, ... past 50 000 URLs each),
+gzipped as .xml.gz when `gzip_children` is set; it turns back into a plain
+<urlset> if the count drops again. Only the files of types that changed are
+re-serialised, and unchanged bytes are never rewritten (safe_io).
+
+get_sitemap(root_dir) returns the shared instance, re-parsed only when a file
+it was loaded from changed on disk, with split_at / gzip_children taken from
+SITEMAP_SPLIT_AT (default 1000) and SITEMAP_GZIP. Callers hold safe_io.artifact_lock()
+around read-modify-write (SiteTransaction does).
+"""
+
+import gzip
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, unescape
+
+from safe_io import atomic_write_bytes, atomic_write_text, remove_file
+
+SITE_URL = "https://footholics.in"
+NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+KINDS = ("static", "articles", "matches")
+LABELS = {"static": "Pages", "articles": "Articles", "matches": "Matches"}
+DEFAULT_SPLIT_AT = 1000
+MAX_URLS_PER_FILE = 50000
+
+_MATCH_RE = re.compile(r"/\d{4}-\d{2}-\d{2}-[^/]+\.html")
+_CHILD_RE = re.compile(r"(static|articles|matches)(?:-\d+)?\.xml(?:\.gz)?$")
+_URL_BLOCK_RE = re.compile(r"[ \t]*<url>.*?</url>[ \t]*\n?", re.S)
+_LOC_RE = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.S)
+# A section comment with nothing left under it (another comment or the end follows)
+_EMPTY_SECTION_RE = re.compile(r"[ \t]*<!--[^\n]*-->[ \t]*\n(?:[ \t]*\n)*(?=[ \t]*(?:<!--|</urlset>))")
+
+URLSET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<urlset xmlns="{NS}"\n'
+    '        xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+    f'        xsi:schemaLocation="{NS}\n'
+    f'        {NS}/sitemap.xsd">\n'
+)
+INDEX_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    f'<sitemapindex xmlns="{NS}">\n'
+)
+
+
+def url_kind(loc: str) -> str:
+    """"static", "articles" or "matches" — which child sitemap `loc` belongs to."""
+    path = loc[len(SITE_URL):] if loc.startswith(SITE_URL) else loc
+    if path.startswith("/articles/") and path != "/articles/index.html":
+        return "articles"
+    if _MATCH_RE.fullmatch(path):
+        return "matches"
+    return "static"
+
+
+class SitemapEntry:
+    __slots__ = ("loc", "lastmod", "changefreq", "priority")
+
+    def __init__(self, loc: str, lastmod: str = "", changefreq: str = "", priority: str = ""):
+        self.loc = loc
+        self.lastmod = lastmod or ""
+        self.changefreq = changefreq or ""
+        self.priority = priority or ""
+
+    def xml(self) -> str:
+        lines = ["    <url>", f"        <loc>{escape(self.loc)}</loc>"]
+        for tag in ("lastmod", "changefreq", "priority"):
+            value = getattr(self, tag)
+            if value:
+                lines.append(f"        <{tag}>{escape(value)}</{tag}>")
+        lines.append("    </url>")
+        return "\n".join(lines) + "\n"
+
+
+def _stamp(path: str):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_xml(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".gz"):
+        data = gzip.decompress(data)
+    return ET.fromstring(data)
+
+
+def _fields(entry) -> tuple:
+    return entry.lastmod, entry.changefreq, entry.priority
+
+
+class Sitemap:
+    """Ordered loc → SitemapEntry map for one site, serialised to sitemap.xml (+ children)."""
+
+    def __init__(self, root_dir: str, split_at: int = DEFAULT_SPLIT_AT, gzip_children: bool = False):
+        self.root_dir = root_dir
+        self.path = os.path.join(root_dir, "sitemap.xml")
+        self.child_dir = os.path.join(root_dir, "sitemaps")
+        self.split_at = max(1, split_at)
+        self.gzip_children = gzip_children
+        self.entries = {}           # loc -> SitemapEntry, in file order
+        self._dirty = set(KINDS)    # kinds whose output must be re-serialised
+        self._stamps = {}           # path loaded -> (mtime_ns, size)
+        self._split = False         # is sitemap.xml currently an index?
+        self._layout = None         # plain sitemap.xml as text / (loc, raw <url>, fields) pieces
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    # ── loading ──────────────────────────────────────────────────────────────
+
+    def load(self) -> "Sitemap":
+        self.entries = {}
+        self._stamps = {}
+        self._split = False
+        self._layout = None
+        if self.exists():
+            self._stamps[self.path] = _stamp(self.path)
+            root = _read_xml(self.path)
+            if root.tag == f"{{{NS}}}sitemapindex":
+                self._split = True
+                for loc in root.iter(f"{{{NS}}}loc"):
+                    child = self._local_path((loc.text or "").strip())
+                    if child and os.path.exists(child):
+                        self._stamps[child] = _stamp(child)
+                        self._add_urls(_read_xml(child))
+            else:
+                self._add_urls(root)
+                with open(self.path, encoding="utf-8") as f:
+                    self._layout = self._parse_layout(f.read())
+        self._dirty = set(KINDS)
+        return self
+
+    def _add_urls(self, root) -> None:
+        for url in root.iter(f"{{{NS}}}url"):
+            fields = {child.tag.split("}")[-1]: (child.text or "").strip() for child in url}
+            if fields.get("loc"):
+                self.entries[fields["loc"]] = SitemapEntry(
+                    fields["loc"], fields.get("lastmod"), fields.get("changefreq"), fields.get("priority"))
+
+    def _parse_layout(self, text: str):
+        """Split a plain sitemap.xml into the text between <url> blocks and the
+        blocks themselves, each with the fields it was loaded with."""
+        layout, pos = [], 0
+        for m in _URL_BLOCK_RE.finditer(text):
+            loc = _LOC_RE.search(m.group())
+            entry = self.entries.get(unescape(loc.group(1))) if loc else None
+            if entry is None:
+                continue                # no <loc>: left in the surrounding text
+            layout.append(text[pos:m.start()])
+            layout.append((entry.loc, m.group(), _fields(entry)))
+            pos = m.end()
+        layout.append(text[pos:])
+        return layout if len(layout) > 1 else None
+
+    def _local_path(self, loc: str):
+        if not loc.startswith(SITE_URL + "/"):
+            return None
+        rel = loc[len(SITE_URL) + 1:]
+        if ".." in rel.split("/"):
+            return None
+        return os.path.join(self.root_dir, *rel.split("/"))
+
+    def stale(self) -> bool:
+        """Did any file this was loaded from change (or sitemap.xml appear) since?"""
+        if not self._stamps:
+            return self.exists()
+        return any(_stamp(path) != stamp for path, stamp in self._stamps.items())
+
+    # ── mutations ────────────────────────────────────────────────────────────
+
+    def __contains__(self, loc: str) -> bool:
+        return loc in self.entries
+
+    def get(self, loc: str):
+        return self.entries.get(loc)
+
+    def upsert(self, loc: str, lastmod: str = None, changefreq: str = None, priority: str = None) -> bool:
+        """Add `loc`, or update the fields given. True if anything changed."""
+        entry = self.entries.get(loc)
+        if entry is None:
+            self.entries[loc] = SitemapEntry(loc, lastmod, changefreq, priority)
+        else:
+            new = (lastmod if lastmod is not None else entry.lastmod,
+                   changefreq if changefreq is not None else entry.changefreq,
+                   priority if priority is not None else entry.priority)
+            if new == (entry.lastmod, entry.changefreq, entry.priority):
+                return False
+            entry.lastmod, entry.changefreq, entry.priority = new
+        self._dirty.add(url_kind(loc))
+        return True
+
+    def remove(self, loc: str) -> bool:
+        if self.entries.pop(loc, None) is None:
+            return False
+        self._dirty.add(url_kind(loc))
+        return True
+
+    def bump_lastmod(self, loc: str, lastmod: str) -> bool:
+        """Set the lastmod of an existing `loc` (never adds it). True if it changed."""
+        return loc in self.entries and self.upsert(loc, lastmod=lastmod)
+
+    # ── output ───────────────────────────────────────────────────────────────
+
+    def by_kind(self) -> dict:
+        groups = {kind: [] for kind in KINDS}
+        for entry in self.entries.values():
+            groups[url_kind(entry.loc)].append(entry)
+        for kind in ("articles", "matches"):
+            # Stable: same-day URLs keep their file order
+            groups[kind].sort(key=lambda e: e.lastmod, reverse=True)
+        return groups
+
+    @staticmethod
+    def urlset(entries: list, label: str = "") -> str:
+        comment = f"    <!-- {label} -->\n" if label else ""
+        return URLSET_HEAD + "\n" + comment + "\n".join(e.xml() for e in entries) + "\n</urlset>\n"
+
+    def _render_layout(self):
+        """sitemap.xml edited in place (see module docstring); None when nothing
+        of the loaded file is left to anchor on."""
+        layout = self._layout
+        placed = {tok[0] for tok in layout if isinstance(tok, tuple)}
+        present = [tok[0] for tok in layout if isinstance(tok, tuple) and tok[0] in self.entries]
+        if not present:
+            return None
+        new = {kind: [] for kind in KINDS}
+        for entry in self.entries.values():
+            if entry.loc not in placed:
+                new[url_kind(entry.loc)].append(entry)
+        for kind in ("articles", "matches"):
+            new[kind].sort(key=lambda e: e.lastmod, reverse=True)
+        before, after = {}, {}
+        for loc in present:
+            kind = url_kind(loc)
+            if kind == "static":
+                after[kind] = loc
+            else:
+                before.setdefault(kind, loc)
+        anchored = set(before) | set(after)
+        out, seen, drop_gap, dropped = [], set(), False, False
+        for i, tok in enumerate(layout):
+            if isinstance(tok, str):
+                if drop_gap and not tok.strip():
+                    drop_gap = False
+                    continue            # the blank line after a removed block
+                drop_gap = False
+                if i == len(layout) - 1:
+                    for kind in KINDS:
+                        if new[kind] and kind not in anchored:
+                            out.append(f"\n    <!-- {LABELS[kind]} -->\n" + "\n".join(e.xml() for e in new[kind]))
+                out.append(tok)
+                continue
+            loc, raw, loaded = tok
+            entry = self.entries.get(loc)
+            if entry is None or loc in seen:
+                drop_gap = dropped = True
+                continue
+            seen.add(loc)
+            kind = url_kind(loc)
+            if before.get(kind) == loc:
+                out.extend(e.xml() + "\n" for e in new[kind])
+            out.append(raw if _fields(entry) == loaded else entry.xml())
+            if after.get(kind) == loc:
+                out.extend("\n" + e.xml() for e in new[kind])
+        text = "".join(out)
+        return _EMPTY_SECTION_RE.sub("", text) if dropped else text
+
+    def child_name(self, kind: str, part: int) -> str:
+        name = kind if part == 1 else f"{kind}-{part}"
+        return f"{name}.xml.gz" if self.gzip_children else f"{name}.xml"
+
+    def save(self) -> list:
+        """Write sitemap.xml (and children when split). Returns the paths that changed."""
+        groups = self.by_kind()
+        split = len(self.entries) > self.split_at
+        written = []
+        if not split:
+            if self._dirty or self._split:
+                text = self._render_layout() if self._layout and not self._split else None
+                if text is None:
+                    sections = [f"    <!-- {LABELS[kind]} -->\n" + "\n".join(e.xml() for e in groups[kind])
+                                for kind in KINDS if groups[kind]]
+                    text = URLSET_HEAD + "\n" + "\n".join(sections) + "\n</urlset>\n"
+                if atomic_write_text(self.path, text):
+                    written.append(self.path)
+                self._layout = self._parse_layout(text)
+            wanted = set()
+        else:
+            index, wanted = [], set()
+            for kind in KINDS:
+                entries = groups[kind]
+                for part, start in enumerate(range(0, len(entries), MAX_URLS_PER_FILE), 1):
+                    chunk = entries[start:start + MAX_URLS_PER_FILE]
+                    name = self.child_name(kind, part)
+                    path = os.path.join(self.child_dir, name)
+                    wanted.add(name)
+                    index.append((f"{SITE_URL}/sitemaps/{name}", max(e.lastmod for e in chunk)))
+                    if kind in self._dirty or not self._split or not os.path.exists(path):
+                        text = self.urlset(chunk, LABELS[kind])
+                        changed = (atomic_write_bytes(path, gzip.compress(text.encode("utf-8"), 9, mtime=0))
+                                   if self.gzip_children else atomic_write_text(path, text))
+                        if changed:
+                            written.append(path)
+            lines = [INDEX_HEAD]
+            for loc, lastmod in index:
+                lines.append(f"    <sitemap>\n        <loc>{escape(loc)}</loc>\n")
+                if lastmod:
+                    lines.append(f"        <lastmod>{escape(lastmod)}</lastmod>\n")
+                lines.append("    </sitemap>\n")
+            lines.append("</sitemapindex>\n")
+            if atomic_write_text(self.path, "".join(lines)):
+                written.append(self.path)
+            self._layout = None
+        # Children that no longer exist (or everything, after un-splitting)
+        if os.path.isdir(self.child_dir):
+            for name in os.listdir(self.child_dir):
+                if _CHILD_RE.fullmatch(name) and name not in wanted:
+                    path = os.path.join(self.child_dir, name)
+                    if remove_file(path):
+                        written.append(path)
+        self._split = split
+        self._dirty = set()
+        self._stamps = {p: _stamp(p) for p in [self.path] + [os.path.join(self.child_dir, n) for n in wanted]}
+        return written
+
+
+_sitemaps = {}
+_sitemaps_lock = threading.Lock()
+
+
+def options_from_env() -> tuple:
+    """(split_at, gzip_children) from SITEMAP_SPLIT_AT / SITEMAP_GZIP."""
+    split_at = int(os.getenv("SITEMAP_SPLIT_AT", str(DEFAULT_SPLIT_AT)) or DEFAULT_SPLIT_AT)
+    gzip_children = os.getenv("SITEMAP_GZIP", "").strip().lower() in ("1", "true", "yes")
+    return split_at, gzip_children
+
+
+def get_sitemap(root_dir: str) -> Sitemap:
+    """Shared Sitemap for `root_dir`, (re)parsed only when its files changed on disk."""
+    root_dir = os.path.abspath(root_dir)
+    split_at, gzip_children = options_from_env()
+    with _sitemaps_lock:
+        sitemap = _sitemaps.get(root_dir)
+        if sitemap is None:
+            sitemap = _sitemaps[root_dir] = Sitemap(root_dir, split_at, gzip_children).load()
+        else:
+            sitemap.split_at, sitemap.gzip_children = max(1, split_at), gzip_children
+            if sitemap.stale():
+                sitemap.load()
+        return sitemap
+
+
+def forget_sitemap(root_dir: str) -> None:
+    """Drop the shared instance (e.g. after a failed edit left it half-applied)."""
+    with _sitemaps_lock:
+        _sitemaps.pop(os.path.abspath(root_dir), None)
@@ -0,0 +1,336 @@
+"""
+Optional SQLite backend for the match registry and the articles index.
+
+With STORAGE_BACKEND=sqlite the bot keeps events and articles in a WAL-mode
+SQLite database (SQLITE_PATH, default foot-holics-bot/footholics.db) instead of
+rewriting the whole JSON file on every edit. Each mutation becomes a single-row
+INSERT / UPDATE / DELETE; slug, date, league and status are real indexed
+columns, so lookups don't need a scan.
+
+data/events.json and articles/index.json stay exactly as the site expects
+them — they become derived artifacts, exported in one pass (atomically, under
+safe_io.artifact_lock) after each committed transaction that touched them.
+The database is the source of truth in this mode: hand edits to the JSON
+files are overwritten on the next export.
+
+On first use an empty database is seeded from the existing JSON files. Entries
+without a slug or with a slug already used are refused (ValueError naming
+them) rather than collapsed into one row — fix the JSON and restart.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+
+from safe_io import artifact_lock, atomic_write_json, json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    slug        TEXT PRIMARY KEY,
+    id          TEXT,
+    date        TEXT,
+    league_slug TEXT,
+    status      TEXT,
+    position    REAL NOT NULL,
+    doc         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_id     ON events(id);
+CREATE INDEX IF NOT EXISTS events_date   ON events(date);
+CREATE INDEX IF NOT EXISTS events_league ON events(league_slug);
+CREATE INDEX IF NOT EXISTS events_status ON events(status);
+CREATE INDEX IF NOT EXISTS events_pos    ON events(position);
+
+CREATE TABLE IF NOT EXISTS articles (
+    slug        TEXT PRIMARY KEY,
+    date        TEXT,
+    category    TEXT,
+    position    REAL NOT NULL,
+    doc         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_date     ON articles(date);
+CREATE INDEX IF NOT EXISTS articles_category ON articles(category);
+CREATE INDEX IF NOT EXISTS articles_pos      ON articles(position);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "footholics.db")
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, default=json_default)
+
+
+def _slug_error(what: str, problems: list) -> ValueError:
+    return ValueError(f"{what}: {len(problems)} entries can't be stored by slug — "
+                      + "; ".join(problems[:10]) + ("; ..." if len(problems) > 10 else ""))
+
+
+def _check_slugs(rows: list, what: str) -> None:
+    """Refuse rows the slug PRIMARY KEY would silently collapse (empty or repeated slugs)."""
+    seen, problems = set(), []
+    for i, row in enumerate(rows):
+        slug = row.get("slug") or ""
+        if not slug:
+            problems.append(f"[{i}] has no slug")
+        elif slug in seen:
+            problems.append(f"[{i}] repeats slug {slug!r}")
+        seen.add(slug)
+    if problems:
+        raise _slug_error(what, problems)
+
+
+class SqliteDatabase:
+    """One connection per process, serialised by a lock (the bot is a single process)."""
+
+    def __init__(self, db_path: str, root_dir: str):
+        self.db_path = db_path
+        self.events_path = os.path.join(root_dir, "data", "events.json")
+        self.articles_path = os.path.join(root_dir, "articles", "index.json")
+        self._lock = threading.RLock()
+        self._dirty = set()         # tables touched by the open transaction
+        self._commits = 0           # our own commits (data_version ignores them)
+        self._depth = 0             # nested transaction() calls join the outer one
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._seed()
+
+    # ── Transactions / export ─────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE … COMMIT, then export every touched JSON artifact once.
+
+        Nested calls run inside the outermost transaction.
+        """
+        with artifact_lock(), self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self._conn
+                finally:
+                    self._depth -= 1
+                return
+            self._dirty = set()
+            self._depth = 1
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._dirty = set()
+                raise
+            finally:
+                self._depth = 0
+            self._conn.execute("COMMIT")
+            self._commits += 1
+            dirty, self._dirty = self._dirty, set()
+            if "events" in dirty:
+                atomic_write_json(self.events_path, self.events())
+            if "articles" in dirty:
+                atomic_write_json(self.articles_path, self.articles())
+
+    def stamp(self):
+        """Changes whenever any connection (ours or another process) commits."""
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return (version, self._commits)
+
+    def _seed(self) -> None:
+        with self._lock:
+            seeded = {row[0] for row in self._conn.execute("SELECT key FROM meta")}
+            if "events_seeded" not in seeded:
+                with self.transaction():
+                    if os.path.exists(self.events_path):
+                        with open(self.events_path, "r", encoding="utf-8") as f:
+                            self._replace_events(json.load(f))
+                    self._conn.execute("INSERT INTO meta VALUES ('events_seeded', '1')")
+                    self._dirty.discard("events")   # JSON already matches
+            if "articles_seeded" not in seeded:
+                with self.transaction():
+                    if os.path.exists(self.articles_path):
+                        with open(self.articles_path, "r", encoding="utf-8") as f:
+                            self._replace_articles(json.load(f))
+                    self._conn.execute("INSERT INTO meta VALUES ('articles_seeded', '1')")
+                    self._dirty.discard("articles")
+
+    # ── Events ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _event_columns(ev: dict) -> tuple:
+        return (ev.get("id"), ev.get("date"), ev.get("leagueSlug"), ev.get("status"))
+
+    def _position_for(self, table: str, index: int) -> float:
+        """A position that sorts the new row at list `index` (0 == top)."""
+        if index <= 0:
+            top = self._conn.execute(f"SELECT MIN(position) FROM {table}").fetchone()[0]
+            return 0.0 if top is None else top - 1.0
+        rows = [r[0] for r in self._conn.execute(
+            f"SELECT position FROM {table} ORDER BY position LIMIT 2 OFFSET ?", (index - 1,))]
+        if not rows:
+            bottom = self._conn.execute(f"SELECT MAX(position) FROM {table}").fetchone()[0]
+            return 0.0 if bottom is None else bottom + 1.0
+        if len(rows) == 1:
+            return rows[0] + 1.0
+        return (rows[0] + rows[1]) / 2.0
+
+    def events(self) -> list:
+        with self._lock:
+            return [json.loads(doc) for (doc,) in
+                    self._conn.execute("SELECT doc FROM events ORDER BY position")]
+
+    def insert_event(self, ev: dict, index: int = 0) -> None:
+        """Add one event; ValueError (as when seeding) if its slug is empty or taken."""
+        slug = ev.get("slug") or ""
+        _check_slugs([ev], "events")
+        with self.transaction() as conn:
+            pos = self._position_for("events", index)
+            try:
+                conn.execute(
+                    "INSERT INTO events (slug, id, date, league_slug, status, position, doc) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (slug, *self._event_columns(ev), pos, _dumps(ev)),
+                )
+            except sqlite3.IntegrityError:
+                raise _slug_error("events", [f"[0] repeats slug {slug!r}"]) from None
+            self._dirty.add("events")
+
+    def update_event(self, old_slug: str, ev: dict) -> None:
+        slug = ev.get("slug") or ""
+        with self.transaction() as conn:
+            try:
+                conn.execute(
+                    "UPDATE events SET slug = ?, id = ?, date = ?, league_slug = ?, status = ?, doc = ? "
+                    "WHERE slug = ?",
+                    (slug, *self._event_columns(ev), _dumps(ev), old_slug),
+                )
+            except sqlite3.IntegrityError:     # renamed onto another event's slug
+                raise _slug_error("events", [f"[0] repeats slug {slug!r}"]) from None
+            self._dirty.add("events")
+
+    def delete_event(self, slug: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM events WHERE slug = ?", (slug,))
+            self._dirty.add("events")
+
+    def replace_events(self, events: list) -> None:
+        """Replace the whole registry (bulk sort / fix)."""
+        with self.transaction():
+            self._replace_events(events)
+
+    def _replace_events(self, events: list) -> None:
+        _check_slugs(events, "events")
+        self._conn.execute("DELETE FROM events")
+        self._conn.executemany(
+            "INSERT INTO events (slug, id, date, league_slug, status, position, doc) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(ev.get("slug", ""), *self._event_columns(ev), float(i), _dumps(ev))
+             for i, ev in enumerate(events)],
+        )
+        self._dirty.add("events")
+
+    # ── Articles ──────────────────────────────────────────────────────────
+
+    def articles(self) -> list:
+        with self._lock:
+            return [json.loads(doc) for (doc,) in
+                    self._conn.execute("SELECT doc FROM articles ORDER BY position")]
+
+    def get_article(self, slug: str):
+        with self._lock:
+            row = self._conn.execute("SELECT doc FROM articles WHERE slug = ?", (slug,)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def insert_article(self, entry: dict, index: int = 0) -> None:
+        with self.transaction() as conn:
+            pos = self._position_for("articles", index)
+            conn.execute(
+                "INSERT OR REPLACE INTO articles (slug, date, category, position, doc) VALUES (?, ?, ?, ?, ?)",
+                (entry["slug"], entry.get("date"), entry.get("category"), pos, _dumps(entry)),
+            )
+            self._dirty.add("articles")
+
+    def update_article(self, slug: str, fields: dict):
+        """Apply `fields` to the article with `slug`. Returns the entry or None."""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT doc FROM articles WHERE slug = ?", (slug,)).fetchone()
+            if row is None:
+                return None
+            entry = json.loads(row[0])
+            entry.update(fields)
+            conn.execute(
+                "UPDATE articles SET date = ?, category = ?, doc = ? WHERE slug = ?",
+                (entry.get("date"), entry.get("category"), _dumps(entry), slug),
+            )
+            self._dirty.add("articles")
+            return entry
+
+    def delete_article(self, slug: str) -> bool:
+        with self.transaction() as conn:
+            cur = conn.execute("DELETE FROM articles WHERE slug = ?", (slug,))
+            if cur.rowcount:
+                self._dirty.add("articles")
+            return cur.rowcount > 0
+
+    def _replace_articles(self, articles: list) -> None:
+        _check_slugs(articles, "articles")
+        self._conn.execute("DELETE FROM articles")
+        self._conn.executemany(
+            "INSERT INTO articles (slug, date, category, position, doc) VALUES (?, ?, ?, ?, ?)",
+            [(a.get("slug", ""), a.get("date"), a.get("category"), float(i), _dumps(a))
+             for i, a in enumerate(articles)],
+        )
+        self._dirty.add("articles")
+
+
+class SqliteEventBackend:
+    """EventStore persistence that turns each mutation into one row write."""
+
+    def __init__(self, db: SqliteDatabase):
+        self.db = db
+
+    def exists(self) -> bool:
+        return True
+
+    def stamp(self):
+        return self.db.stamp()
+
+    def load(self) -> list:
+        return self.db.events()
+
+    def save(self, events: list) -> None:
+        self.db.replace_events(events)
+
+    def apply(self, events: list, changes: list) -> None:
+        """All changes in one SQLite transaction → one events.json export."""
+        with self.db.transaction():
+            for op, event, info in changes:
+                if op == "insert":
+                    self.db.insert_event(event, info)
+                elif op == "update":
+                    self.db.update_event(info[0], event)
+                elif op == "remove":
+                    self.db.delete_event(event.get("slug", ""))
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def database_from_env(root_dir: str):
+    """The shared SqliteDatabase when STORAGE_BACKEND=sqlite, else None (JSON files)."""
+    if os.getenv("STORAGE_BACKEND", "json").strip().lower() != "sqlite":
+        return None
+    db_path = os.path.abspath(os.getenv("SQLITE_PATH") or DEFAULT_DB_PATH)
+    with _databases_lock:
+        db = _databases.get(db_path)
+        if db is None:
+            db = _databases[db_path] = SqliteDatabase(db_path, root_dir)
+        return db